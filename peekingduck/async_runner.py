@@ -0,0 +1,192 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Runs a pipeline from an asyncio event loop.
+"""
+
+import asyncio
+import logging
+import sys
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+from peekingduck.runner import Runner
+
+#: Item to put into ``frame_queue`` to end the pipeline
+END_OF_STREAM = None
+
+
+class AsyncRunner(Runner):
+    """Runs a pipeline as a coroutine so that a single event loop can manage
+    several pipelines.
+
+    The nodes of every frame run one after another like in the sequential
+    :py:class:`Runner <peekingduck.runner.Runner>`, but each blocking
+    ``run()`` call is offloaded to ``executor`` while the event loop stays
+    free to serve other tasks. By default, the loop's default executor is
+    used, so that pipelines share its worker threads instead of each holding
+    a thread of their own.
+
+    Frames are read by the first node of the pipeline, e.g.,
+    ``input.visual``, unless a ``frame_queue`` is provided. In that case the
+    nodes must not include a source node: every item taken from the queue
+    becomes the data pool of a new frame. An item is either an image, which
+    is stored under ``img``, or a dictionary of data pool entries containing
+    at least ``img``. Putting :data:`END_OF_STREAM` into the queue ends the
+    pipeline.
+
+    >>> runner = AsyncRunner(nodes=[yolo_node, bbox_node], frame_queue=queue)
+    >>> async for data in runner.results():
+    ...     print(data["bboxes"])
+
+    Args:
+        pipeline_path (:obj:`pathlib.Path` | :obj:`None`): Path to
+            *pipeline_config.yml*, see :py:class:`Runner <peekingduck.runner.Runner>`.
+        config_updates_cli (:obj:`str` | :obj:`None`): Configuration changes
+            passed as part of the CLI command.
+        custom_nodes_parent_subdir (:obj:`str` | :obj:`None`): Relative path to
+            a folder which contains custom nodes.
+        num_iter (:obj:`int` | :obj:`None`): Stop pipeline after running this
+            number of iterations.
+        nodes (:obj:`List[AbstractNode]` | :obj:`None`): If a list of nodes is
+            provided, initialize by the node stack directly. Required when
+            ``frame_queue`` is provided.
+        frame_queue (:obj:`asyncio.Queue` | :obj:`None`): If provided, frames
+            are taken from this queue instead of a source node.
+        executor (:obj:`concurrent.futures.Executor` | :obj:`None`): Executor
+            which runs the nodes. Defaults to the default executor of the
+            event loop.
+        release_keys (:obj:`bool`): See :py:class:`Runner <peekingduck.runner.Runner>`.
+        profile (:obj:`bool`): See :py:class:`Runner <peekingduck.runner.Runner>`.
+        profile_path (:obj:`pathlib.Path` | :obj:`None`): See
+            :py:class:`Runner <peekingduck.runner.Runner>`.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        pipeline_path: Path = None,
+        config_updates_cli: str = None,
+        custom_nodes_parent_subdir: str = None,
+        num_iter: int = None,
+        nodes: List[AbstractNode] = None,
+        frame_queue: Optional["asyncio.Queue[Any]"] = None,
+        executor: Optional[Executor] = None,
+        release_keys: bool = False,
+        profile: bool = False,
+        profile_path: Optional[Path] = None,
+    ) -> None:
+        self.frame_queue = frame_queue
+        self.executor = executor
+        self.frame_source: Optional[FrameQueueSource] = None
+        if frame_queue is not None:
+            if not nodes:
+                logging.getLogger(__name__).error(
+                    "Frames can only be pushed through frame_queue when nodes "
+                    "are passed in directly."
+                )
+                sys.exit(1)
+            self.frame_source = FrameQueueSource(frame_queue)
+            nodes = [self.frame_source] + nodes
+        super().__init__(
+            pipeline_path=pipeline_path,
+            config_updates_cli=config_updates_cli,
+            custom_nodes_parent_subdir=custom_nodes_parent_subdir,
+            num_iter=num_iter,
+            nodes=nodes,
+            release_keys=release_keys,
+            profile=profile,
+            profile_path=profile_path,
+        )
+
+    # pylint: disable=invalid-overridden-method
+    async def run(self) -> None:  # type: ignore
+        """Runs the pipeline until it ends, discarding the results."""
+        async for _ in self.results():
+            pass
+
+    async def results(self) -> AsyncIterator[Dict[str, Any]]:
+        """Runs the pipeline and yields the data pool of every frame once all
+        the nodes have run on it.
+
+        Yields:
+            (Dict[str, Any]): A shallow copy of the data pool of the frame.
+        """
+        # returns the running loop inside a coroutine, get_running_loop() is
+        # not available in Python 3.6
+        loop = asyncio.get_event_loop()
+        data = self.pipeline.data
+        frame_source = self.frame_source
+        num_iter = 0
+        try:
+            while not self.pipeline.terminate:
+                for idx, node in enumerate(self.pipeline.nodes):
+                    if data.get("pipeline_end", False):
+                        self.pipeline.terminate = True
+                        if "pipeline_end" not in node.inputs:
+                            continue
+                    if frame_source is not None and node is frame_source:
+                        outputs = await frame_source.get()
+                    else:
+                        outputs = await loop.run_in_executor(
+                            self.executor, self._run_node, node, data
+                        )
+                    data.update(outputs)
+                    self._release_keys(idx, data)
+                if not data.get("pipeline_end", False):
+                    yield dict(data)
+                num_iter += 1
+                if self.num_iter > 0 and num_iter >= self.num_iter:
+                    self.logger.info(f"Stopping pipeline after {num_iter} iterations")
+                    break
+        finally:
+            self._release_resources()
+            if self.profiler is not None:
+                self.profiler.report()
+
+
+class FrameQueueSource(AbstractNode):
+    """Source node of an :py:class:`AsyncRunner` whose frames are pushed to
+    an asyncio queue. The runner awaits :py:meth:`get` instead of calling
+    :py:meth:`run`.
+
+    Args:
+        frame_queue (:obj:`asyncio.Queue`): Queue to take the frames from.
+    """
+
+    def __init__(self, frame_queue: "asyncio.Queue[Any]") -> None:
+        super().__init__(
+            {"input": ["none"], "output": ["img", "pipeline_end"]},
+            node_path="input.frame_queue",
+        )
+        self.frame_queue = frame_queue
+
+    async def get(self) -> Dict[str, Any]:
+        """Waits for the next frame.
+
+        Returns:
+            (Dict[str, Any]): Data pool entries of the frame, or
+            ``pipeline_end`` if :data:`END_OF_STREAM` was received.
+        """
+        item = await self.frame_queue.get()
+        if item is END_OF_STREAM:
+            return {"pipeline_end": True}
+        if isinstance(item, dict):
+            return {**item, "pipeline_end": False}
+        return {"img": item, "pipeline_end": False}
+
+    def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        raise RuntimeError("FrameQueueSource frames are read with get()")
@@ -0,0 +1,122 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Command line entry point of the benchmark suite.
+"""
+
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Tuple
+
+import click
+
+from peekingduck.benchmarks.suite import REFERENCE_PIPELINES, BenchmarkSuite
+from peekingduck.utils.logger import LoggerSetup
+
+logger = logging.getLogger("peekingduck.benchmarks")  # pylint: disable=invalid-name
+
+
+@click.command()
+@click.option(
+    "--output",
+    default="benchmark_results.json",
+    type=click.Path(dir_okay=False),
+    help="JSON file to write the results to",
+)
+@click.option(
+    "--num_frames",
+    default=30,
+    type=click.IntRange(min=1),
+    help="Number of synthetic frames read by each pipeline",
+)
+@click.option("--width", default=1280, type=click.IntRange(min=16))
+@click.option("--height", default=720, type=click.IntRange(min=16))
+@click.option(
+    "--repeats",
+    default=20,
+    type=click.IntRange(min=1),
+    help="Number of calls of every node benchmarked in isolation",
+)
+@click.option(
+    "--pipeline",
+    "pipelines",
+    multiple=True,
+    type=click.Choice(list(REFERENCE_PIPELINES)),
+    help="Reference pipeline to run, can be repeated. Defaults to all of them",
+)
+@click.option(
+    "--model",
+    "models",
+    multiple=True,
+    help=(
+        "Model node to benchmark in isolation, e.g., model.yolox, can be "
+        "repeated. Requires its weights to be available"
+    ),
+)
+@click.option("--seed", default=0, type=int)
+@click.option(
+    "--log_level",
+    default="info",
+    type=click.Choice(["debug", "info", "warning", "error", "critical"]),
+)
+def main(  # pylint: disable=too-many-arguments, too-many-locals
+    output: str,
+    num_frames: int,
+    width: int,
+    height: int,
+    repeats: int,
+    pipelines: Tuple[str, ...],
+    models: Tuple[str, ...],
+    seed: int,
+    log_level: str,
+) -> None:
+    """Benchmarks PeekingDuck nodes and reference pipelines on synthetic
+    frames, offline and on CPU. Exits with status 1 if any node or pipeline
+    failed, after saving the results.
+    """
+    LoggerSetup.set_log_level(log_level)
+    suite = BenchmarkSuite(
+        num_frames=num_frames,
+        width=width,
+        height=height,
+        repeats=repeats,
+        pipelines=list(pipelines),
+        models=list(models),
+        seed=seed,
+    )
+    results = suite.run()
+    failed = [name for name, stats in results["nodes"].items() if "error" in stats]
+    for name in failed:
+        logger.error(f"{name}: failed with {results['nodes'][name]['error']}")
+    for name, stats in results["pipelines"].items():
+        if "error" in stats:
+            failed.append(name)
+            logger.error(f"{name}: failed with {stats['error']}")
+        else:
+            logger.info(f"{name}: {stats['fps']:.2f} FPS")
+    output_path = Path(output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w") as outfile:
+        json.dump(results, outfile, indent=4)
+    logger.info(f"Benchmark results saved to {output_path}")
+    if failed:
+        logger.error(f"{len(failed)} benchmark(s) failed: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
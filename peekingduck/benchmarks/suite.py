@@ -0,0 +1,407 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmarks nodes in isolation and in reference pipelines on synthetic data.
+"""
+
+import copy
+import importlib
+import logging
+import os
+import platform
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+
+import peekingduck
+from peekingduck.benchmarks.synthetic import SyntheticModel, SyntheticScene
+from peekingduck.pipeline.data_pool import get_node_inputs
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+from peekingduck.runner import Runner
+from peekingduck.utils.profiler import NodeProfiler
+
+
+class NodeSpec(NamedTuple):
+    """A node of a reference pipeline. Nodes named ``model.synthetic_<task>``
+    are :class:`SyntheticModel` stand-ins, the others are created from the
+    PeekingDuck node of that name with ``config`` as config updates.
+    """
+
+    name: str
+    config: Dict[str, Any] = {}
+
+
+#: Reference pipelines, by name, as the source type read by ``input.visual``
+#: (``video`` or ``images``) and the nodes after it
+REFERENCE_PIPELINES: Dict[str, Tuple[str, List[NodeSpec]]] = {
+    "object_detection": (
+        "video",
+        [
+            NodeSpec("model.synthetic_detection"),
+            NodeSpec("dabble.bbox_count"),
+            NodeSpec("dabble.bbox_to_btm_midpoint"),
+            NodeSpec("dabble.zone_count"),
+            NodeSpec("dabble.tracking"),
+            NodeSpec("dabble.fps", {"fps_log_display": False}),
+            NodeSpec("draw.bbox", {"show_labels": True}),
+            NodeSpec("draw.btm_midpoint"),
+            NodeSpec("draw.zones"),
+            NodeSpec("draw.tag", {"show": ["ids"]}),
+            NodeSpec("draw.legend", {"show": ["count", "zone_count", "fps"]}),
+            NodeSpec("output.csv_writer", {"stats_to_track": ["bboxes", "count"]}),
+            NodeSpec("output.media_writer"),
+        ],
+    ),
+    "pose_estimation": (
+        "images",
+        [
+            NodeSpec("model.synthetic_pose"),
+            NodeSpec("dabble.keypoints_to_3d_loc"),
+            NodeSpec("dabble.check_nearby_objs"),
+            NodeSpec("draw.poses"),
+            NodeSpec("draw.tag", {"show": ["flags"]}),
+            NodeSpec("output.media_writer"),
+        ],
+    ),
+    "group_detection": (
+        "video",
+        [
+            NodeSpec("model.synthetic_detection"),
+            NodeSpec("dabble.bbox_to_3d_loc"),
+            NodeSpec("dabble.group_nearby_objs"),
+            NodeSpec("dabble.check_large_groups", {"group_size_threshold": 2}),
+            NodeSpec("draw.group_bbox_and_tag"),
+            NodeSpec("output.media_writer"),
+        ],
+    ),
+    "privacy_protection": (
+        "video",
+        [
+            NodeSpec("model.synthetic_detection"),
+            NodeSpec("augment.brightness", {"beta": 20}),
+            NodeSpec("augment.contrast", {"alpha": 1.2}),
+            NodeSpec("draw.blur_bbox"),
+            NodeSpec("draw.mosaic_bbox"),
+            NodeSpec("output.media_writer"),
+        ],
+    ),
+    "crowd_counting": (
+        "images",
+        [
+            NodeSpec("model.synthetic_crowd"),
+            NodeSpec("draw.heat_map"),
+            NodeSpec("draw.legend", {"show": ["count"]}),
+            NodeSpec("output.media_writer"),
+        ],
+    ),
+    "instance_segmentation": (
+        "video",
+        [
+            NodeSpec("model.synthetic_segmentation"),
+            NodeSpec("draw.instance_mask"),
+            NodeSpec("draw.bbox"),
+            NodeSpec("output.media_writer"),
+        ],
+    ),
+}
+
+
+class BenchmarkSuite:  # pylint: disable=too-few-public-methods, too-many-instance-attributes
+    """Benchmarks PeekingDuck nodes on synthetic frames, without network
+    access or a GPU.
+
+    Every reference pipeline reads a synthetic video or directory of images
+    with ``input.visual`` and replaces its model by a
+    :class:`SyntheticModel <peekingduck.benchmarks.synthetic.SyntheticModel>`
+    stand-in, so that the input, dabble, draw and output nodes are measured
+    without model weights. Each pipeline is benchmarked twice:
+
+    * as a whole, with :py:class:`Runner <peekingduck.runner.Runner>` and its
+      per-node profiler, reporting the end-to-end FPS;
+    * node by node, in isolation: the inputs of every node on the middle
+      frame are captured and the node is timed ``repeats`` times on copies
+      of them. ``input.visual`` is timed reading every frame of its source.
+
+    Nodes shared by several pipelines are benchmarked in isolation once.
+    Real model nodes listed in ``models`` are also benchmarked in isolation
+    on a synthetic frame. They load their weights as usual, so they are
+    reported with an ``error`` instead of results if the weights are not
+    available offline.
+
+    Args:
+        num_frames (int): Number of frames of the synthetic sources.
+        width (int): Width of the synthetic frames.
+        height (int): Height of the synthetic frames.
+        repeats (int): Number of calls of every node in isolation.
+        pipelines (:obj:`List[str]` | :obj:`None`): Names of the reference
+            pipelines to run, all of them if not provided.
+        models (:obj:`List[str]` | :obj:`None`): Names of model nodes, e.g.,
+            ``model.yolox``, to benchmark in isolation.
+        seed (int): Seed of the synthetic scene.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        num_frames: int = 30,
+        width: int = 1280,
+        height: int = 720,
+        repeats: int = 20,
+        pipelines: Optional[List[str]] = None,
+        models: Optional[List[str]] = None,
+        seed: int = 0,
+    ) -> None:
+        if num_frames <= 0 or repeats <= 0:
+            raise ValueError("num_frames and repeats must be positive integers")
+        unknown = set(pipelines or []) - set(REFERENCE_PIPELINES)
+        if unknown:
+            raise ValueError(
+                f"Unknown pipelines: {sorted(unknown)}, choose from "
+                f"{list(REFERENCE_PIPELINES)}"
+            )
+        self.logger = logging.getLogger(__name__)
+        self.num_frames = num_frames
+        self.width = width
+        self.height = height
+        self.repeats = repeats
+        self.pipelines = pipelines or list(REFERENCE_PIPELINES)
+        self.models = models or []
+        self.seed = seed
+        self.scene = SyntheticScene(width, height, seed=seed)
+        self._work_dir = Path(".")
+        self._sources: Dict[str, Path] = {}
+
+    def run(self) -> Dict[str, Any]:
+        """Runs the benchmarks.
+
+        Returns:
+            (Dict[str, Any]): The ``metadata`` of the run, the isolated
+            ``nodes`` results and the ``pipelines`` results. Node results are
+            the per-node statistics of
+            :py:meth:`NodeProfiler.summary <peekingduck.utils.profiler.NodeProfiler.summary>`,
+            the nodes of a pipeline are keyed by their position and name,
+            e.g., ``1:model.synthetic_detection``.
+        """
+        results: Dict[str, Any] = {
+            "metadata": self._metadata(),
+            "nodes": {},
+            "pipelines": {},
+        }
+        with tempfile.TemporaryDirectory() as work_dir:
+            self._work_dir = Path(work_dir)
+            self._sources = {
+                "video": self.scene.write_video(
+                    self._work_dir / "source" / "video.avi", self.num_frames
+                ),
+                "images": self.scene.write_images(
+                    self._work_dir / "source" / "images", self.num_frames
+                ),
+            }
+            for name in self.pipelines:
+                self.logger.info(f"Benchmarking {name} pipeline")
+                source_type, specs = REFERENCE_PIPELINES[name]
+                results["pipelines"][name] = self._guarded(
+                    name, self._benchmark_pipeline, source_type, specs
+                )
+                results["nodes"].update(
+                    self._benchmark_isolated(source_type, specs, results["nodes"])
+                )
+            for model_name in self.models:
+                self.logger.info(f"Benchmarking {model_name}")
+                results["nodes"][model_name] = self._guarded(
+                    model_name, self._benchmark_model, model_name
+                )
+        return results
+
+    def _benchmark_pipeline(
+        self, source_type: str, specs: List[NodeSpec]
+    ) -> Dict[str, Any]:
+        """Runs a reference pipeline end to end with a profiling
+        :py:class:`Runner <peekingduck.runner.Runner>`.
+        """
+        runner = Runner(nodes=self._create_nodes(source_type, specs), profile=True)
+        start = perf_counter()
+        runner.run()
+        total_s = perf_counter() - start
+        return {
+            "source": source_type,
+            "num_frames": self.num_frames,
+            "total_s": total_s,
+            "fps": self.num_frames / total_s,
+            "nodes": runner.profiler.summary(),  # type: ignore
+        }
+
+    def _benchmark_isolated(
+        self, source_type: str, specs: List[NodeSpec], done: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Times each node of a reference pipeline on its own, skipping the
+        nodes in ``done``.
+        """
+        results: Dict[str, Any] = {}
+        input_key = f"input.visual[{source_type}]"
+        if input_key not in done:
+            results[input_key] = self._guarded(
+                input_key, self._time_source, source_type
+            )
+        nodes = self._create_nodes(source_type, specs)
+        captured, errors = self._capture_inputs(nodes, self.num_frames // 2)
+        nodes[0].release_resources()
+        for node, inputs in zip(nodes[1:], captured[1:]):
+            if node.node_name in done or node.node_name in results:
+                continue
+            if node.node_name in errors:
+                results[node.node_name] = errors[node.node_name]
+            else:
+                results[node.node_name] = self._guarded(
+                    node.node_name, self._time_node, node, inputs
+                )
+        return results
+
+    def _benchmark_model(self, model_name: str) -> Dict[str, Any]:
+        """Times a model node in isolation on a synthetic frame."""
+        node = _create_node(model_name, {})
+        inputs = {"img": self.scene.frame(0)}
+        # The first call includes lazy initialization, such as graph tracing
+        node.run(_copy_inputs(inputs))
+        return self._time_node(node, inputs)
+
+    def _time_node(self, node: AbstractNode, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Times ``repeats`` calls of ``node`` on copies of ``inputs``."""
+        profiler = NodeProfiler()
+        for _ in range(self.repeats):
+            profiler.run(node, _copy_inputs(inputs))
+        if "pipeline_end" in node.inputs or "all" in node.inputs:
+            # Lets output nodes close their files
+            node.run({**_copy_inputs(inputs), "pipeline_end": True})
+        return profiler.summary()[node.node_name]
+
+    def _time_source(self, source_type: str) -> Dict[str, Any]:
+        """Times ``input.visual`` reading every frame of a synthetic
+        source.
+        """
+        node = self._create_source(source_type)
+        profiler = NodeProfiler()
+        for _ in range(self.num_frames):
+            if profiler.run(node, {}).get("pipeline_end", False):
+                break
+        node.release_resources()
+        return profiler.summary()[node.node_name]
+
+    def _capture_inputs(
+        self, nodes: List[AbstractNode], frame_idx: int
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, str]]]:
+        """Runs ``nodes`` sequentially up to frame ``frame_idx`` and captures
+        copies of the inputs of every node on that frame.
+
+        Returns:
+            (Tuple[List[Dict[str, Any]], Dict[str, Dict[str, str]]]): The
+            inputs of every node, and an ``error`` entry for each node which
+            failed. Failed nodes are not run again, so their outputs are
+            missing from the data pool of the following nodes.
+        """
+        data: Dict[str, Any] = {}
+        captured: List[Dict[str, Any]] = []
+        errors: Dict[str, Dict[str, str]] = {}
+        for _ in range(frame_idx + 1):
+            captured = []
+            for node in nodes:
+                inputs = get_node_inputs(node, data)
+                captured.append(_copy_inputs(dict(inputs)))
+                if node.node_name in errors:
+                    continue
+                outputs = self._guarded(node.node_name, node.run, inputs)
+                if "error" in outputs:
+                    errors[node.node_name] = outputs
+                else:
+                    data.update(outputs)
+        return captured, errors
+
+    def _guarded(
+        self, label: str, func: Callable[..., Dict[str, Any]], *args: Any
+    ) -> Dict[str, Any]:
+        """Calls ``func`` with ``args`` and returns an ``error`` entry
+        instead of raising, so that a failing benchmark does not stop the
+        suite.
+        """
+        try:
+            return func(*args)
+        except Exception as error:  # pylint: disable=broad-except
+            self.logger.warning(f"{label} failed: {error!r}")
+            return {"error": repr(error)}
+
+    def _create_nodes(
+        self, source_type: str, specs: List[NodeSpec]
+    ) -> List[AbstractNode]:
+        """Creates the nodes of a reference pipeline with fresh output
+        directories.
+        """
+        output_dir = self._work_dir / "output"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        nodes = [self._create_source(source_type)]
+        for spec in specs:
+            if spec.name.startswith("model.synthetic_"):
+                task = spec.name[len("model.synthetic_") :]
+                nodes.append(SyntheticModel(self.scene, task))
+                continue
+            config = dict(spec.config)
+            if spec.name == "output.media_writer":
+                config["output_dir"] = str(output_dir)
+            elif spec.name == "output.csv_writer":
+                config["file_path"] = str(output_dir / "stats.csv")
+            elif spec.name == "dabble.zone_count":
+                config["resolution"] = [self.width, self.height]
+            nodes.append(_create_node(spec.name, config))
+        return nodes
+
+    def _create_source(self, source_type: str) -> AbstractNode:
+        """Creates an ``input.visual`` node reading a synthetic source."""
+        return _create_node("input.visual", {"source": str(self._sources[source_type])})
+
+    def _metadata(self) -> Dict[str, Any]:
+        """Describes the benchmark environment and settings."""
+        return {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "peekingduck_version": peekingduck.__version__,
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "numpy_version": np.__version__,
+            "opencv_version": cv2.__version__,
+            "num_frames": self.num_frames,
+            "frame_size": [self.width, self.height],
+            "repeats": self.repeats,
+            "seed": self.seed,
+        }
+
+
+def _create_node(name: str, config_updates: Dict[str, Any]) -> AbstractNode:
+    """Creates the PeekingDuck node ``name`` with ``config_updates``."""
+    node_type, node_name = name.split(".")
+    module = importlib.import_module(
+        f"peekingduck.pipeline.nodes.{node_type}.{node_name}"
+    )
+    return module.Node(**config_updates)  # type: ignore
+
+
+def _copy_inputs(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Copies ``inputs`` so that nodes drawing in place or modifying their
+    inputs can be called repeatedly on the same data.
+    """
+    return {key: copy.deepcopy(value) for key, value in inputs.items()}
@@ -0,0 +1,201 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Synthetic frames and model stand-ins for offline benchmarks.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+
+# fmt: off
+# Pairs of COCO keypoints connected when drawing poses
+SKELETON = [
+    (5, 6), (5, 7), (7, 9), (6, 8), (8, 10), (5, 11), (6, 12),
+    (11, 12), (11, 13), (13, 15), (12, 14), (14, 16),
+]
+# Position of the COCO keypoints within a bounding box, as (x, y) fractions
+_KEYPOINT_LAYOUT = np.array(
+    [
+        [0.5, 0.08], [0.45, 0.06], [0.55, 0.06], [0.4, 0.08], [0.6, 0.08],
+        [0.3, 0.25], [0.7, 0.25], [0.2, 0.4], [0.8, 0.4], [0.15, 0.55],
+        [0.85, 0.55], [0.35, 0.55], [0.65, 0.55], [0.35, 0.75], [0.65, 0.75],
+        [0.35, 0.95], [0.65, 0.95],
+    ]
+)
+# fmt: on
+
+
+class SyntheticScene:  # pylint: disable=too-many-instance-attributes
+    """Generates frames of boxes moving over a textured background.
+
+    Every frame has the same objects, each moving with its own constant
+    velocity and bouncing off the edges, so that detections, tracks and
+    poses derived from :py:meth:`bboxes` are coherent across frames.
+
+    Args:
+        width (int): Width of the frames.
+        height (int): Height of the frames.
+        num_objects (int): Number of objects in every frame.
+        seed (int): Seed of the random number generator.
+    """
+
+    def __init__(
+        self, width: int, height: int, num_objects: int = 8, seed: int = 0
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.num_objects = num_objects
+        rng = np.random.default_rng(seed)
+        self.background = cv2.GaussianBlur(
+            rng.integers(0, 255, (height, width, 3), dtype=np.uint8), (0, 0), 3
+        )
+        self.sizes = rng.uniform([0.05, 0.15], [0.12, 0.35], (num_objects, 2))
+        self.starts = rng.uniform(0, 1 - self.sizes)
+        self.velocities = rng.uniform(-0.02, 0.02, (num_objects, 2))
+        self.colors = rng.integers(0, 255, (num_objects, 3)).tolist()
+
+    def bboxes(self, idx: int) -> np.ndarray:
+        """Returns the normalized ``(x1, y1, x2, y2)`` boxes of frame
+        ``idx``.
+        """
+        span = 1 - self.sizes
+        # Reflect the positions into [0, span] to bounce off the edges
+        position = np.abs(
+            (self.starts + idx * self.velocities + span) % (2 * span) - span
+        )
+        return np.hstack([position, position + self.sizes]).astype(np.float32)
+
+    def frame(self, idx: int) -> np.ndarray:
+        """Returns frame ``idx``."""
+        img = self.background.copy()
+        scale = np.array([self.width, self.height] * 2)
+        for bbox, color in zip(self.bboxes(idx) * scale, self.colors):
+            x_1, y_1, x_2, y_2 = bbox.astype(int)
+            cv2.rectangle(img, (x_1, y_1), (x_2, y_2), color, -1)
+        return img
+
+    def write_images(self, directory: Path, num_frames: int) -> Path:
+        """Writes ``num_frames`` frames as JPEG images to ``directory``."""
+        directory.mkdir(parents=True, exist_ok=True)
+        for idx in range(num_frames):
+            cv2.imwrite(str(directory / f"frame_{idx:05d}.jpg"), self.frame(idx))
+        return directory
+
+    def write_video(self, path: Path, num_frames: int, fps: int = 30) -> Path:
+        """Writes ``num_frames`` frames as an MJPG video to ``path``."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        writer = cv2.VideoWriter(
+            str(path),
+            cv2.VideoWriter_fourcc(*"MJPG"),
+            fps,
+            (self.width, self.height),
+        )
+        for idx in range(num_frames):
+            writer.write(self.frame(idx))
+        writer.release()
+        return path
+
+
+class SyntheticModel(AbstractNode):
+    """Stand-in for a model node which derives its outputs from the boxes of
+    a :class:`SyntheticScene` instead of running inference, so that the
+    downstream nodes can be benchmarked without model weights.
+
+    Args:
+        scene (SyntheticScene): The scene the frames are taken from.
+        task (str): One of ``detection``, ``pose``, ``crowd`` or
+            ``segmentation``, selects the outputs of the stand-in.
+    """
+
+    is_stateless = False
+    outputs_by_task = {
+        "detection": ["bboxes", "bbox_labels", "bbox_scores"],
+        "pose": ["bboxes", "keypoints", "keypoint_scores", "keypoint_conns"],
+        "crowd": ["density_map", "count"],
+        "segmentation": ["bboxes", "bbox_labels", "bbox_scores", "masks"],
+    }
+
+    def __init__(self, scene: SyntheticScene, task: str) -> None:
+        if task not in self.outputs_by_task:
+            raise ValueError(f"task must be one of {list(self.outputs_by_task)}")
+        super().__init__(
+            {"input": ["img"], "output": self.outputs_by_task[task]},
+            node_path=f"model.synthetic_{task}",
+        )
+        self.scene = scene
+        self.task = task
+        self.frame_idx = 0
+
+    def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        bboxes = self.scene.bboxes(self.frame_idx)
+        self.frame_idx += 1
+        outputs: Dict[str, Any] = {"bboxes": bboxes}
+        if self.task in ("detection", "segmentation"):
+            outputs["bbox_labels"] = np.array(["person"] * len(bboxes))
+            outputs["bbox_scores"] = np.full(len(bboxes), 0.9, dtype=np.float32)
+        if self.task == "pose":
+            outputs.update(_poses(bboxes))
+        elif self.task == "crowd":
+            outputs = _density_map(bboxes, inputs["img"].shape[:2])
+        elif self.task == "segmentation":
+            outputs["masks"] = _masks(bboxes, inputs["img"].shape[:2])
+        return outputs
+
+
+def _poses(bboxes: np.ndarray) -> Dict[str, Any]:
+    """Places the COCO keypoints at fixed positions within each box."""
+    top_left = bboxes[:, np.newaxis, :2]
+    size = (bboxes[:, 2:] - bboxes[:, :2])[:, np.newaxis]
+    keypoints = (top_left + _KEYPOINT_LAYOUT * size).astype(np.float32)
+    keypoint_conns = np.array(
+        [[keypoints[idx, [a, b]] for a, b in SKELETON] for idx in range(len(bboxes))]
+    ).reshape((len(bboxes), len(SKELETON), 2, 2))
+    return {
+        "keypoints": keypoints,
+        "keypoint_scores": np.full(keypoints.shape[:2], 0.9, dtype=np.float32),
+        "keypoint_conns": keypoint_conns,
+    }
+
+
+def _density_map(bboxes: np.ndarray, shape: Tuple[int, int]) -> Dict[str, Any]:
+    """Puts a blurred unit mass at the top centre of each box."""
+    height, width = shape
+    density_map = np.zeros(shape, dtype=np.float32)
+    for x_1, y_1, x_2, _ in bboxes:
+        col = min(int((x_1 + x_2) / 2 * width), width - 1)
+        row = min(int(y_1 * height), height - 1)
+        density_map[row, col] += 1.0
+    return {
+        "density_map": cv2.GaussianBlur(density_map, (0, 0), 4),
+        "count": len(bboxes),
+    }
+
+
+def _masks(bboxes: np.ndarray, shape: Tuple[int, int]) -> np.ndarray:
+    """Fills an ellipse within each box."""
+    height, width = shape
+    masks: List[np.ndarray] = []
+    for x_1, y_1, x_2, y_2 in bboxes * np.array([width, height] * 2):
+        mask = np.zeros(shape, dtype=np.uint8)
+        center = (int((x_1 + x_2) / 2), int((y_1 + y_2) / 2))
+        axes = (int((x_2 - x_1) / 2), int((y_2 - y_1) / 2))
+        cv2.ellipse(mask, center, axes, 0, 0, 360, 1, -1)
+        masks.append(mask)
+    return np.array(masks).reshape((-1, height, width))
@@ -19,7 +19,7 @@ import os
 import tempfile
 from pathlib import Path
 from time import perf_counter
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import click
 import yaml
@@ -28,9 +28,23 @@ from peekingduck.commands import LOGGER_NAME
 from peekingduck.runner import Runner
 from peekingduck.utils.deprecation import deprecate
 from peekingduck.utils.logger import LoggerSetup
-from peekingduck.viewer import Viewer
 
 logger = logging.getLogger(LOGGER_NAME)  # pylint: disable=invalid-name
+# Runner options which the viewer does not support, with their default values
+VIEWER_UNSUPPORTED_OPTIONS = {
+    "pipelined": False,
+    "batch_size": 1,
+    "parallel_branches": False,
+    "release_keys": False,
+    "keyframe_interval": 1,
+    "motion_threshold": 0.0,
+    "deadline": None,
+    "skip_duplicate_frames": False,
+    "model_processes": False,
+    "cache_dir": None,
+    "cache_size": None,
+    "profile_memory": False,
+}
 
 
 @click.command()
@@ -74,12 +88,151 @@ def init(custom_folder_name: str) -> None:
     is_flag=True,
     help="Launch PeekingDuck viewer",
 )
-def run(  # pylint: disable=too-many-arguments
+@click.option(
+    "--pipelined",
+    default=False,
+    is_flag=True,
+    help="Run each node in its own worker so that consecutive frames overlap",
+)
+@click.option(
+    "--batch_size",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Run each node on this number of frames at once",
+)
+@click.option(
+    "--stream",
+    "streams",
+    multiple=True,
+    help=(
+        "Run the pipeline over this visual source, repeat the option to share "
+        "the models of one pipeline between several sources"
+    ),
+)
+@click.option(
+    "--parallel_branches",
+    default=False,
+    is_flag=True,
+    help="Run nodes which do not depend on each other concurrently on each frame",
+)
+@click.option(
+    "--release_keys",
+    default=False,
+    is_flag=True,
+    help="Free data pool values after the last node which uses them",
+)
+@click.option(
+    "--keyframe_interval",
+    default=1,
+    type=click.IntRange(min=1),
+    help=(
+        "Run object detection models every this number of frames and track "
+        "their detections in between"
+    ),
+)
+@click.option(
+    "--motion_threshold",
+    default=0.0,
+    type=click.FloatRange(0.0, 1.0),
+    help=(
+        "Also run object detection models when the frame differs from the "
+        "last keyframe by more than this fraction"
+    ),
+)
+@click.option(
+    "--deadline",
+    default=None,
+    type=float,
+    help=(
+        "Drop frames older than this number of seconds since their capture "
+        "before running the models"
+    ),
+)
+@click.option(
+    "--skip_duplicate_frames",
+    default=False,
+    is_flag=True,
+    help=(
+        "Reuse the outputs of the model nodes on frames repeated by a "
+        "threaded camera input instead of running inference again"
+    ),
+)
+@click.option(
+    "--model_processes",
+    default=False,
+    is_flag=True,
+    help=(
+        "Run every model node in its own worker process, frames are passed "
+        "through shared memory"
+    ),
+)
+@click.option(
+    "--cache_dir",
+    default=None,
+    type=click.Path(file_okay=False),
+    help=(
+        "Cache the outputs of the model nodes in this folder so that frames "
+        "seen before skip inference"
+    ),
+)
+@click.option(
+    "--cache_size",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Maximum size of the model output cache in megabytes",
+)
+@click.option(
+    "--num_workers",
+    default=1,
+    type=click.IntRange(min=1),
+    help=(
+        "Split a directory source across this number of worker processes, "
+        "each running its own copy of the pipeline"
+    ),
+)
+@click.option(
+    "--profile",
+    default=False,
+    is_flag=True,
+    help="Log per-node latency statistics when the pipeline stops",
+)
+@click.option(
+    "--profile_path",
+    default=None,
+    type=click.Path(dir_okay=False),
+    help="Save per-node latency statistics to this JSON file, implies --profile",
+)
+@click.option(
+    "--profile_memory",
+    default=False,
+    is_flag=True,
+    help=(
+        "Also log the memory allocated by every node and the size of its "
+        "outputs, implies --profile"
+    ),
+)
+def run(  # pylint: disable=too-many-arguments, too-many-locals
     config_path: str,
     log_level: str,
     node_config: str,
     num_iter: int,
     viewer: bool,
+    pipelined: bool,
+    batch_size: int,
+    streams: Tuple[str, ...],
+    parallel_branches: bool,
+    release_keys: bool,
+    keyframe_interval: int,
+    motion_threshold: float,
+    deadline: Optional[float],
+    skip_duplicate_frames: bool,
+    model_processes: bool,
+    cache_dir: Optional[str],
+    cache_size: Optional[int],
+    num_workers: int,
+    profile: bool,
+    profile_path: Optional[str],
+    profile_memory: bool,
     nodes_parent_dir: str = "src",
 ) -> None:
     """Runs PeekingDuck"""
@@ -100,8 +253,32 @@ def run(  # pylint: disable=too-many-arguments
         else:
             config_path = curr_dir / "pipeline_config.yml"
     pipeline_config_path = Path(config_path)
+    runner_kwargs: Dict[str, Any] = {
+        "pipelined": pipelined,
+        "batch_size": batch_size,
+        "parallel_branches": parallel_branches,
+        "release_keys": release_keys,
+        "keyframe_interval": keyframe_interval,
+        "motion_threshold": motion_threshold,
+        "deadline": deadline,
+        "skip_duplicate_frames": skip_duplicate_frames,
+        "model_processes": model_processes,
+        "cache_dir": None if cache_dir is None else Path(cache_dir),
+        "profile": profile,
+        "profile_path": None if profile_path is None else Path(profile_path),
+        "profile_memory": profile_memory,
+    }
+    if cache_size is not None:
+        # the runner falls back to its own default size
+        runner_kwargs["cache_size"] = cache_size
 
     if viewer:
+        _check_viewer_options(runner_kwargs, streams, num_workers)
+        # The viewer pulls in tkinter and PIL, only import it when requested
+        from peekingduck.viewer import (  # pylint: disable=import-outside-toplevel
+            Viewer,
+        )
+
         logger.info("Launching PeekingDuck Viewer")
         start_time = perf_counter()
         pkd_viewer = Viewer(
@@ -109,10 +286,32 @@ def run(  # pylint: disable=too-many-arguments
             config_updates_cli=node_config,
             custom_nodes_parent_subdir=nodes_parent_dir,
             num_iter=num_iter,
+            profile=profile,
+            profile_path=runner_kwargs["profile_path"],
         )
         end_time = perf_counter()
         logger.debug(f"Startup time = {end_time - start_time:.2f} sec")
         pkd_viewer.run()
+    elif num_workers > 1:
+        if streams:
+            raise click.UsageError("--num_workers cannot be combined with --stream")
+        # only import the sharded runner and its process pool when requested
+        from peekingduck.sharded_runner import (  # pylint: disable=import-outside-toplevel
+            ShardedRunner,
+        )
+
+        try:
+            sharded_runner = ShardedRunner(
+                pipeline_path=pipeline_config_path,
+                config_updates_cli=node_config,
+                custom_nodes_parent_subdir=nodes_parent_dir,
+                num_workers=num_workers,
+                num_iter=num_iter,
+                **runner_kwargs,
+            )
+        except ValueError as error:
+            raise click.UsageError(str(error)) from error
+        sharded_runner.run()
     else:
         start_time = perf_counter()
         runner = Runner(
@@ -120,6 +319,8 @@ def run(  # pylint: disable=too-many-arguments
             config_updates_cli=node_config,
             custom_nodes_parent_subdir=nodes_parent_dir,
             num_iter=num_iter,
+            streams=[int(src) if src.isdigit() else src for src in streams],
+            **runner_kwargs,
         )
         end_time = perf_counter()
         logger.debug(f"Startup time = {end_time - start_time:.2f} sec")
@@ -161,6 +362,34 @@ def verify_install() -> None:
         os.chdir(cwd)
 
 
+def _check_viewer_options(
+    runner_kwargs: Dict[str, Any], streams: Tuple[str, ...], num_workers: int
+) -> None:
+    """Checks that no option which the viewer does not support is set.
+
+    Args:
+        runner_kwargs (Dict[str, Any]): Runner options set on the command line.
+        streams (Tuple[str, ...]): Visual sources set with --stream.
+        num_workers (int): Number of worker processes.
+
+    Raises:
+        click.UsageError: If an unsupported option is set.
+    """
+    options = [
+        f"--{name}"
+        for name, default in VIEWER_UNSUPPORTED_OPTIONS.items()
+        if runner_kwargs.get(name) != default
+    ]
+    if streams:
+        options.append("--stream")
+    if num_workers > 1:
+        options.append("--num_workers")
+    if options:
+        raise click.UsageError(
+            f"--viewer cannot be combined with {', '.join(sorted(options))}"
+        )
+
+
 def _create_custom_folder(custom_folder_name: str) -> None:
     """Makes custom nodes folder to create custom nodes.
 
@@ -23,6 +23,7 @@ import logging
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
@@ -35,6 +36,8 @@ from peekingduck.utils.deprecation import deprecate
 from peekingduck.utils.detect_id_mapper import obj_det_change_class_name_to_id
 
 PEEKINGDUCK_NODE_TYPES = ["input", "augment", "model", "draw", "dabble", "output"]
+# Config keys of model nodes which select the weights to download
+WEIGHTS_CONFIG_KEYS = {"model_format", "model_type", "weights_parent_dir"}
 
 
 class DeclarativeLoader:  # pylint: disable=too-few-public-methods, too-many-instance-attributes
@@ -56,17 +59,28 @@ class DeclarativeLoader:  # pylint: disable=too-few-public-methods, too-many-ins
             used with PeekingDuck. For more information on using custom nodes,
             please refer to
             `Getting Started <getting_started/03_custom_nodes.html>`_.
+        pkd_viewer (:obj:`bool`): Whether the PeekingDuck Viewer is
+            activated, passed on to every node.
+        model_processes (:obj:`bool`): If ``True``, every model node is
+            created in its own worker process instead of this one, see
+            :py:class:`RemoteNode <peekingduck.pipeline.frame_transport.RemoteNode>`.
+        model_process_slots (:obj:`int`): Maximum number of frames passed to
+            a model worker process per call.
     """
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         pipeline_path: Path,
         config_updates_cli: str,
         custom_nodes_parent_subdir: str,
         pkd_viewer: bool = False,
+        model_processes: bool = False,
+        model_process_slots: int = 2,
     ) -> None:
         self.logger = logging.getLogger(__name__)
         self.pkd_viewer = pkd_viewer
+        self.model_processes = model_processes
+        self.model_process_slots = model_process_slots
 
         self.pkd_base_dir = Path(__file__).resolve().parent
         self.config_loader = ConfigLoader(self.pkd_base_dir)
@@ -159,35 +173,116 @@ class DeclarativeLoader:  # pylint: disable=too-few-public-methods, too-many-ins
         return custom_name
 
     def _instantiate_nodes(self) -> List[AbstractNode]:
-        """Given a list of imported nodes, instantiate nodes"""
-        instantiated_nodes = []
-
-        for node_str, config_updates_yml in self.node_list:
-            node_str_split = node_str.split(".")
+        """Given a list of imported nodes, instantiate nodes.
+
+        The nodes other than model nodes, which may open cameras or windows,
+        are initialized first, so that an invalid config fails before any
+        weights are loaded. If there are several model nodes, their weights
+        are then downloaded concurrently before the model nodes are
+        initialized one after another, as building models with TensorFlow or
+        PyTorch from several threads is not safe. The nodes are returned in
+        their declared order.
+        """
+        nodes: List[Optional[AbstractNode]] = []
+        model_configs: Dict[int, Tuple[str, Optional[Dict[str, Any]]]] = {}
+        for idx, (node_str, config_updates_yml) in enumerate(self.node_list):
+            nodes.append(None)
+            if node_str.split(".")[-2] == "model":
+                model_configs[idx] = (node_str, config_updates_yml)
+            else:
+                self.logger.info(f"Initializing {node_str} node...")
+                nodes[idx] = self._create_node(node_str, config_updates_yml)
 
+        if len(model_configs) > 1:
+            self._download_weights(list(model_configs.values()))
+        for idx, (node_str, config_updates_yml) in model_configs.items():
             self.logger.info(f"Initializing {node_str} node...")
+            nodes[idx] = self._create_node(node_str, config_updates_yml)
+        return nodes  # type: ignore
 
-            if len(node_str_split) == 3:
-                # convert windows/linux filepath to a module path
-                path_to_node = f"{self.custom_nodes_dir.name}."
-                node_name = ".".join(node_str_split[-2:])
-
-                instantiated_node = self._init_node(
-                    path_to_node,
-                    node_name,
-                    self.custom_config_loader,
-                    config_updates_yml,
+    def _download_weights(
+        self, model_configs: List[Tuple[str, Optional[Dict[str, Any]]]]
+    ) -> None:
+        """Downloads and verifies the weights of the model nodes in
+        ``model_configs`` concurrently, which is mostly network and file I/O.
+        Errors are ignored here and raised again when the failing node is
+        initialized.
+        """
+        # pylint: disable=import-outside-toplevel
+        from peekingduck.pipeline.nodes.base import WeightsDownloader
+
+        downloaders: Dict[Path, WeightsDownloader] = {}
+        for node_str, config_updates_yml in model_configs:
+            try:
+                config = self._get_weights_config(node_str, config_updates_yml)
+                if config is None:
+                    continue
+                downloader = WeightsDownloader(config)
+                # nodes sharing the same weights download them only once
+                downloaders.setdefault(downloader.weights_path, downloader)
+            except Exception:  # pylint: disable=broad-except
+                self.logger.debug(f"Not downloading weights of {node_str} early")
+
+        if len(downloaders) < 2:
+            return
+        with ThreadPoolExecutor(max_workers=len(downloaders)) as executor:
+            futures = [
+                executor.submit(downloader.download_weights)
+                for downloader in downloaders.values()
+            ]
+        for future in futures:
+            if future.exception() is not None:
+                self.logger.debug(
+                    f"Downloading weights failed early: {future.exception()}"
                 )
-            else:
-                path_to_node = "peekingduck.pipeline.nodes."
 
-                instantiated_node = self._init_node(
-                    path_to_node, node_str, self.config_loader, config_updates_yml
+    def _get_weights_config(
+        self, node_str: str, config_updates_yml: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Returns the config of the model node ``node_str`` with the updates
+        of the keys which select its weights, or None if it does not download
+        weights.
+        """
+        node_str_split = node_str.split(".")
+        if len(node_str_split) == 3:
+            node_name = ".".join(node_str_split[-2:])
+            config = self.custom_config_loader.get(node_name)
+        else:
+            node_name = node_str
+            config = self.config_loader.get(node_name)
+        if "weights" not in config:
+            return None
+
+        config_updates_cli = self.config_updates_cli or {}
+        for updates in (config_updates_yml, config_updates_cli.get(node_name)):
+            if updates is not None:
+                config.update(
+                    (key, value)
+                    for key, value in updates.items()
+                    if key in WEIGHTS_CONFIG_KEYS
                 )
+        return config
 
-            instantiated_nodes.append(instantiated_node)
+    def _create_node(
+        self, node_str: str, config_updates_yml: Optional[Dict[str, Any]]
+    ) -> AbstractNode:
+        """Resolves whether ``node_str`` is a PeekingDuck or custom node and
+        initializes it.
+        """
+        node_str_split = node_str.split(".")
+        if len(node_str_split) == 3:
+            # convert windows/linux filepath to a module path
+            path_to_node = f"{self.custom_nodes_dir.name}."
+            node_name = ".".join(node_str_split[-2:])
+
+            return self._init_node(
+                path_to_node, node_name, self.custom_config_loader, config_updates_yml
+            )
 
-        return instantiated_nodes
+        path_to_node = "peekingduck.pipeline.nodes."
+        return self._init_node(
+            path_to_node, node_str, self.config_loader, config_updates_yml
+        )
 
     def _init_node(
         self,
@@ -196,8 +291,10 @@ class DeclarativeLoader:  # pylint: disable=too-few-public-methods, too-many-ins
         config_loader: ConfigLoader,
         config_updates_yml: Optional[Dict[str, Any]],
     ) -> AbstractNode:
-        """Imports node to filepath and initializes node with config."""
-        node = importlib.import_module(path_to_node + node_name)
+        """Imports node to filepath and initializes node with config. If
+        ``model_processes`` is set, model nodes are initialized in a worker
+        process without importing them here.
+        """
         config = config_loader.get(node_name)
 
         # First, override default configs with values from pipeline_config.yml
@@ -213,6 +310,15 @@ class DeclarativeLoader:  # pylint: disable=too-few-public-methods, too-many-ins
 
         # inform node if PeekingDuck Viewer is activated or not
         config["pkd_viewer"] = self.pkd_viewer
+        if self.model_processes and node_name.split(".")[-2] == "model":
+            # pylint: disable=import-outside-toplevel
+            from peekingduck.pipeline.frame_transport import RemoteNode
+
+            self.logger.info(f"Starting worker process for {node_name}")
+            return RemoteNode(
+                path_to_node + node_name, "Node", config, self.model_process_slots
+            )
+        node = importlib.import_module(path_to_node + node_name)
         return node.Node(config)
 
     def _edit_config(
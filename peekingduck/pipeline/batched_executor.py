@@ -0,0 +1,142 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Executor which accumulates several frames and runs each node on all of them
+at once.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List
+
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+from peekingduck.pipeline.pipeline import Pipeline
+
+
+class BatchedExecutor:  # pylint: disable=too-few-public-methods
+    """Runs the nodes of a
+    :py:class:`Pipeline <peekingduck.pipeline.pipeline.Pipeline>` on batches of
+    consecutive frames.
+
+    The input node reads up to ``batch_size`` frames, each with its own data
+    pool, then every following node is run once on the whole batch through
+    :py:meth:`AbstractNode.run_batch
+    <peekingduck.pipeline.nodes.abstract_node.AbstractNode.run_batch>`.
+    Batch-capable nodes, such as the object detection models, infer all frames
+    in a single forward pass while other nodes process the frames one by one,
+    in order.
+
+    ``pipeline_end`` retains its sequential semantics: once a frame has
+    ``pipeline_end == True``, it is only passed to nodes which take
+    ``pipeline_end`` as an input and frames read after it are discarded.
+
+    Args:
+        pipeline (:obj:`Pipeline`): The pipeline to execute.
+        run_node_batch (:obj:`Callable`): Callable which runs a node on a list
+            of data pools and returns the node outputs for each of them.
+        batch_size (:obj:`int`): Maximum number of frames in a batch.
+        num_iter (:obj:`int`): Stop after this number of frames, ``0`` to run
+            until the input is exhausted.
+    """
+
+    def __init__(
+        self,
+        pipeline: Pipeline,
+        run_node_batch: Callable[
+            [AbstractNode, List[Dict[str, Any]]], List[Dict[str, Any]]
+        ],
+        batch_size: int,
+        num_iter: int = 0,
+    ) -> None:
+        if batch_size <= 0:
+            raise ValueError("batch_size must be a positive integer")
+        self.logger = logging.getLogger(__name__)
+        self.pipeline = pipeline
+        self.run_node_batch = run_node_batch
+        self.batch_size = batch_size
+        self.num_iter = num_iter
+        self.num_frames = 0
+
+    def run(self) -> None:
+        """Runs the pipeline until the input is exhausted, ``pipeline_end``
+        is raised or ``num_iter`` frames have been processed.
+        """
+        prev_data: Dict[str, Any] = {}
+        while not self.pipeline.terminate:
+            batch = self._read_batch()
+            if not batch:
+                break
+            for node in self.pipeline.nodes[1:]:
+                batch = self._process(node, batch, prev_data)
+            self.num_frames += sum(
+                not data.get("pipeline_end", False) for data in batch
+            )
+            prev_data = batch[-1]
+            self.pipeline.data = prev_data
+            if prev_data.get("pipeline_end", False):
+                self.pipeline.terminate = True
+            elif 0 < self.num_iter <= self.num_frames:
+                self.logger.info(
+                    f"Stopping pipeline after {self.num_frames} iterations"
+                )
+                self.pipeline.terminate = True
+
+    def _read_batch(self) -> List[Dict[str, Any]]:
+        """Runs the input node until the batch is full, the input ends or
+        ``num_iter`` frames have been read.
+        """
+        source = self.pipeline.nodes[0]
+        batch: List[Dict[str, Any]] = []
+        while len(batch) < self.batch_size:
+            if 0 < self.num_iter <= self.num_frames + len(batch):
+                break
+            data: Dict[str, Any] = {}
+            data.update(self.run_node_batch(source, [data])[0])
+            batch.append(data)
+            if data.get("pipeline_end", False):
+                break
+        return batch
+
+    def _process(
+        self,
+        node: AbstractNode,
+        batch: List[Dict[str, Any]],
+        prev_data: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        """Runs ``node`` on the frames in ``batch``.
+
+        Returns:
+            (List[Dict[str, Any]]): The frames which are still to be processed
+            by the following nodes, up to and including the first frame with
+            ``pipeline_end == True``.
+        """
+        ends_pipeline = batch[-1].get("pipeline_end", False)
+        if ends_pipeline and "pipeline_end" not in node.inputs:
+            frames = batch[:-1]
+        else:
+            frames = batch
+        if frames:
+            for data, outputs in zip(frames, self.run_node_batch(node, frames)):
+                data.update(outputs)
+        if ends_pipeline:
+            # Nodes are skipped on the last frame, expose their outputs from
+            # the previous frame like the sequential runner
+            prev = batch[-2] if len(batch) > 1 else prev_data
+            for key, value in prev.items():
+                batch[-1].setdefault(key, value)
+
+        for i, data in enumerate(batch):
+            if data.get("pipeline_end", False):
+                return batch[: i + 1]
+        return batch
@@ -0,0 +1,171 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Executor which runs the nodes of a frame concurrently, as soon as the nodes
+they depend on have finished.
+"""
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Set
+
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+from peekingduck.pipeline.pipeline import Pipeline
+
+# Nodes of these types run in the calling thread, e.g., so that GUI nodes such
+# as ``output.screen`` stay on the main thread
+_CALLING_THREAD_NODE_TYPES = ("input", "output")
+
+
+def build_dependency_graph(nodes: List[AbstractNode]) -> List[Set[int]]:
+    """Finds the nodes which each node has to wait for within a frame.
+
+    Node ``j`` depends on an earlier node ``i`` when running them in any order
+    could change the result of the sequential runner, i.e., when ``j`` reads
+    a key last written by ``i``, when both write the same key, or when ``j``
+    overwrites a key read by ``i``. Every node implicitly reads
+    ``pipeline_end`` since it decides whether the node is skipped. Nodes
+    taking ``"all"`` as input read every key, so they wait for all earlier
+    nodes and all later nodes wait for them.
+
+    Args:
+        nodes (:obj:`List[AbstractNode]`): The nodes in their declared order.
+
+    Returns:
+        (:obj:`List[Set[int]]`): For each node, the indices of the earlier
+        nodes it depends on.
+    """
+    last_writer: Dict[str, int] = {}
+    # Nodes which read the current value of a key, since it was last written
+    readers: Dict[str, List[int]] = {}
+    last_barrier = None
+    dependencies = []
+    for idx, node in enumerate(nodes):
+        node_deps: Set[int] = set()
+        if "all" in node.inputs:
+            node_deps.update(range(idx))
+            reads: List[str] = []
+        else:
+            reads = [key for key in node.inputs if key != "none"]
+            reads.extend(getattr(node, "optional_inputs", []))
+            reads.append("pipeline_end")
+            node_deps.update(last_writer[key] for key in reads if key in last_writer)
+        writes = [key for key in node.outputs if key != "none"]
+        for key in writes:
+            if key in last_writer:
+                node_deps.add(last_writer[key])
+            node_deps.update(readers.get(key, []))
+        if last_barrier is not None:
+            node_deps.add(last_barrier)
+        node_deps.discard(idx)
+        dependencies.append(node_deps)
+
+        for key in reads:
+            readers.setdefault(key, []).append(idx)
+        for key in writes:
+            last_writer[key] = idx
+            readers[key] = []
+        if "all" in node.inputs:
+            last_barrier = idx
+    return dependencies
+
+
+class DagExecutor:  # pylint: disable=too-few-public-methods
+    """Runs the nodes of a
+    :py:class:`Pipeline <peekingduck.pipeline.pipeline.Pipeline>` as a
+    dependency graph built from their ``inputs`` and ``outputs``, see
+    :func:`build_dependency_graph`.
+
+    Frames are processed one at a time, but within a frame every node is
+    started in a worker thread as soon as the nodes it depends on have
+    finished. Independent branches, such as two detectors reading the same
+    ``img``, therefore run concurrently and the frame latency approaches that
+    of the longest branch. Input and output nodes run in the calling thread.
+    The data pool is only updated by the calling thread, so the results and
+    the ``pipeline_end`` semantics are identical to the sequential runner.
+
+    Args:
+        pipeline (:obj:`Pipeline`): The pipeline to execute.
+        run_node (:obj:`Callable`): Callable which runs a node on a data pool
+            and returns the node outputs.
+        num_iter (:obj:`int`): Stop after this number of frames, ``0`` to run
+            until the input is exhausted.
+    """
+
+    def __init__(
+        self,
+        pipeline: Pipeline,
+        run_node: Callable[[AbstractNode, Dict[str, Any]], Dict[str, Any]],
+        num_iter: int = 0,
+    ) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.pipeline = pipeline
+        self.run_node = run_node
+        self.num_iter = num_iter
+        self.dependencies = build_dependency_graph(pipeline.nodes)
+        self.dependents: List[List[int]] = [[] for _ in pipeline.nodes]
+        for idx, node_deps in enumerate(self.dependencies):
+            for dep in node_deps:
+                self.dependents[dep].append(idx)
+
+    def run(self) -> None:
+        """Runs the pipeline until the input is exhausted, ``pipeline_end``
+        is raised or ``num_iter`` frames have been processed.
+        """
+        num_iter = 0
+        with ThreadPoolExecutor(max_workers=len(self.pipeline.nodes)) as executor:
+            while not self.pipeline.terminate:
+                self._run_frame(executor)
+                num_iter += 1
+                if 0 < self.num_iter <= num_iter:
+                    self.logger.info(f"Stopping pipeline after {num_iter} iterations")
+                    break
+
+    def _run_frame(self, executor: ThreadPoolExecutor) -> None:
+        """Runs every node once on the current data pool."""
+        nodes = self.pipeline.nodes
+        data = self.pipeline.data
+        num_pending_deps = [len(node_deps) for node_deps in self.dependencies]
+        ready = [idx for idx, num_deps in enumerate(num_pending_deps) if not num_deps]
+        running: Dict[Future, int] = {}
+        while ready or running:
+            finished = []
+            in_calling_thread = []
+            for idx in sorted(ready):
+                node = nodes[idx]
+                if data.get("pipeline_end", False):
+                    self.pipeline.terminate = True
+                    if "pipeline_end" not in node.inputs:
+                        finished.append(idx)
+                        continue
+                if node.node_name.split(".")[0] in _CALLING_THREAD_NODE_TYPES:
+                    in_calling_thread.append(idx)
+                else:
+                    running[executor.submit(self.run_node, node, data)] = idx
+            for idx in in_calling_thread:
+                data.update(self.run_node(nodes[idx], data))
+                finished.append(idx)
+            if running and not finished:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finished.append(running.pop(future))
+                    data.update(future.result())
+
+            ready = []
+            for idx in finished:
+                for dependent in self.dependents[idx]:
+                    num_pending_deps[dependent] -= 1
+                    if not num_pending_deps[dependent]:
+                        ready.append(dependent)
@@ -0,0 +1,130 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Helper functions to pass data from the pipeline's data pool to nodes.
+"""
+
+from types import MappingProxyType
+from typing import Any, Dict, List, Set
+
+import numpy as np
+
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+
+
+def get_node_inputs(node: AbstractNode, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Collects the inputs required by ``node`` from the data pool.
+
+    Nodes which declare ``"all"`` in their inputs receive a read-only view of
+    the whole data pool, see :func:`read_only_view`.
+
+    Args:
+        node (AbstractNode): The node to collect inputs for.
+        data (Dict[str, Any]): The data pool of the current frame.
+
+    Returns:
+        (Dict[str, Any]): Inputs for ``node``.
+    """
+    if "all" in node.inputs:
+        return read_only_view(data)
+
+    inputs = {key: data[key] for key in node.inputs if key in data}
+    if hasattr(node, "optional_inputs"):
+        for key in node.optional_inputs:
+            # The nodes will not receive inputs with the optional key if it's
+            # not found upstream
+            if key in data:
+                inputs[key] = data[key]
+    return inputs
+
+
+def get_key_release_schedule(nodes: List[AbstractNode]) -> List[List[str]]:
+    """Finds the keys of the data pool which are no longer needed after each
+    node, so that large values such as masks and density maps can be freed
+    before the end of the iteration.
+
+    A key is released after its last reader or writer within an iteration.
+    Keys which carry values across iterations are never released:
+
+    - ``pipeline_end``,
+    - keys read before they are written in the iteration, e.g., by a node
+      taking ``"all"`` as input, which then receive the previous value,
+    - keys read by nodes taking ``pipeline_end`` as input, which receive the
+      values of the previous iteration once the pipeline ends.
+
+    Released keys are no longer part of the pipeline results.
+
+    Args:
+        nodes (List[AbstractNode]): The nodes of the pipeline in order.
+
+    Returns:
+        (List[List[str]]): For each node, the keys to remove from the data
+        pool after running it.
+    """
+    keys = {key for node in nodes for key in node.outputs if key != "none"}
+    kept = {"pipeline_end"}
+    written: Set[str] = set()
+    last_use: Dict[str, int] = {}
+    for idx, node in enumerate(nodes):
+        if "all" in node.inputs:
+            reads = set(keys)
+        else:
+            reads = set(node.inputs).union(getattr(node, "optional_inputs", []))
+            reads &= keys
+        if "pipeline_end" in node.inputs:
+            kept |= reads
+        kept |= reads - written
+        for key in reads:
+            last_use[key] = idx
+        for key in node.outputs:
+            if key != "none":
+                written.add(key)
+                last_use[key] = idx
+
+    schedule: List[List[str]] = [[] for _ in nodes]
+    for key, idx in last_use.items():
+        if key not in kept:
+            schedule[idx].append(key)
+    return [sorted(node_keys) for node_keys in schedule]
+
+
+def read_only_view(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Creates a read-only view of the data pool in O(number of keys).
+
+    The returned mapping cannot be modified and every top-level
+    :class:`numpy.ndarray` is replaced by a non-writeable view sharing the
+    same memory, so no image, mask or density map is copied. Nodes which need
+    to modify a value have to copy it first, e.g., ``inputs["img"].copy()``.
+    Other containers, such as lists and dictionaries, are shared with the data
+    pool and must not be modified in place.
+
+    Args:
+        data (Dict[str, Any]): The data pool of the current frame.
+
+    Returns:
+        (Dict[str, Any]): A read-only mapping with the same keys and values as
+        ``data``. Typed as a dictionary for compatibility with
+        :py:meth:`AbstractNode.run`.
+    """
+    view = {key: _freeze(value) for key, value in data.items()}
+    return MappingProxyType(view)  # type: ignore
+
+
+def _freeze(value: Any) -> Any:
+    """Returns a non-writeable view of ``value`` if it is a numpy array."""
+    if isinstance(value, np.ndarray) and value.flags.writeable:
+        value = value.view()
+        value.flags.writeable = False
+    return value
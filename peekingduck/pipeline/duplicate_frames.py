@@ -0,0 +1,92 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Skips model inference on frames which repeat the previous frame.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+
+
+class DuplicateFrameFilter:
+    """Reuses the outputs of the stateless model nodes on repeated frames.
+
+    When the pipeline is faster than a camera read by a threaded
+    :mod:`input.visual`, the same frame is returned again until the next one
+    is captured. Such frames keep the ``frame_seq`` of their first
+    occurrence, so a model node which already ran on a ``frame_seq`` returns
+    the same outputs again instead of running inference on an identical
+    image. The other nodes still run on every frame.
+
+    Every call returns a new dictionary, so changes made to it by the runner
+    or later nodes do not affect the outputs reused on the next repeated
+    frame. The values themselves are shared and must not be modified in
+    place.
+
+    Args:
+        nodes (:obj:`List[AbstractNode]`): The nodes of the pipeline.
+    """
+
+    def __init__(self, nodes: List[AbstractNode]) -> None:
+        self.logger = logging.getLogger(__name__)
+        models = [
+            node
+            for node in nodes
+            if node.node_name.startswith("model.") and node.is_stateless
+        ]
+        self.models = {id(node) for node in models}
+        # Frames are counted when they reach the first model node
+        self._first_model = id(models[0]) if models else None
+        self.num_frames = 0
+        self.num_duplicates = 0
+
+        self._last_outputs: Dict[int, Tuple[int, Dict[str, Any]]] = {}
+
+    def run(
+        self,
+        node: AbstractNode,
+        data: Dict[str, Any],
+        run_node: Callable[[AbstractNode, Dict[str, Any]], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Runs ``node`` with ``run_node`` unless it is a stateless model
+        node which already ran on the ``frame_seq`` in ``data``, in which
+        case its previous outputs are returned.
+
+        Returns:
+            (Dict[str, Any]): Outputs of the node.
+        """
+        frame_seq: Optional[int] = data.get("frame_seq")
+        if id(node) not in self.models or frame_seq is None:
+            return run_node(node, data)
+        last = self._last_outputs.get(id(node))
+        is_duplicate = last is not None and last[0] == frame_seq
+        if id(node) == self._first_model:
+            self.num_frames += 1
+            self.num_duplicates += int(is_duplicate)
+        if is_duplicate:
+            return dict(last[1])  # type: ignore
+        outputs = run_node(node, data)
+        self._last_outputs[id(node)] = (frame_seq, dict(outputs))
+        return outputs
+
+    def log_summary(self) -> None:
+        """Logs the number of repeated frames which skipped inference."""
+        if self.num_frames > 0:
+            self.logger.info(
+                f"Reused model outputs on {self.num_duplicates} repeated "
+                f"frames out of {self.num_frames}"
+            )
@@ -0,0 +1,122 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Drops frames which are too old to be processed in real time.
+"""
+
+import logging
+from time import perf_counter
+from typing import Any, Dict, List, Set
+
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+
+
+class FrameDeadline:  # pylint: disable=too-many-instance-attributes
+    """Enforces a deadline on the age of the frames processed by a pipeline.
+
+    The age of a frame is measured from its ``capture_time``, set by
+    :mod:`input.visual` when the frame is read from the source. A frame older
+    than ``deadline`` when it reaches the first model node, or the second
+    node if there is no model node, is dropped: from there on, only the
+    nodes other than model and dabble nodes whose inputs are all produced by
+    nodes which ran on the frame are run, e.g., :mod:`output.media_writer`
+    still records the raw frame. The remaining nodes, including those which
+    take ``"all"`` inputs such as :mod:`output.csv_writer`, are skipped and
+    the outputs they left in the data pool on earlier frames are removed.
+    Frames which are processed but exceed the deadline by the end of the
+    iteration are counted as late.
+
+    Args:
+        nodes (:obj:`List[AbstractNode]`): The nodes of the pipeline.
+        deadline (:obj:`float`): Maximum age of a frame in seconds.
+
+    Raises:
+        ValueError: ``deadline`` is not positive.
+    """
+
+    def __init__(self, nodes: List[AbstractNode], deadline: float) -> None:
+        if deadline <= 0:
+            raise ValueError("deadline must be positive")
+        self.logger = logging.getLogger(__name__)
+        self.deadline = deadline
+        self.check_idx = next(
+            (
+                idx
+                for idx, node in enumerate(nodes)
+                if node.node_name.startswith("model.")
+            ),
+            1,
+        )
+        self.runs_on_dropped = [idx < self.check_idx for idx in range(len(nodes))]
+        available = {key for node in nodes[: self.check_idx] for key in node.outputs}
+        self.dropped_keys: Set[str] = set()
+        for idx, node in enumerate(nodes[self.check_idx :], self.check_idx):
+            if (
+                idx > self.check_idx
+                and not node.node_name.startswith(("model.", "dabble."))
+                and "all" not in node.inputs
+                and set(node.inputs) <= available
+            ):
+                self.runs_on_dropped[idx] = True
+                available.update(node.outputs)
+            else:
+                self.dropped_keys.update(node.outputs)
+        self.dropped_keys -= available | {"none"}
+        self.num_frames = 0
+        self.num_dropped = 0
+        self.num_late = 0
+
+    def is_stale(self, idx: int, data: Dict[str, Any]) -> bool:
+        """Checks if the frame in ``data`` has to be dropped before running
+        node ``idx``.
+
+        Returns:
+            (bool): ``True`` if the frame is older than the deadline, in which
+            case only the nodes in ``runs_on_dropped`` should be run on it.
+            The outputs of the other nodes are removed from ``data``.
+        """
+        if idx != self.check_idx or data.get("capture_time") is None:
+            return False
+        if data.get("pipeline_end", False):
+            return False
+        self.num_frames += 1
+        age = perf_counter() - data["capture_time"]
+        if age > self.deadline:
+            self.num_dropped += 1
+            self.logger.debug(
+                f"Dropped frame {self.num_frames}, age {age * 1000:.0f} ms"
+            )
+            for key in self.dropped_keys:
+                data.pop(key, None)
+            return True
+        return False
+
+    def end_frame(self, data: Dict[str, Any]) -> None:
+        """Counts the processed frame in ``data`` as late if it exceeded the
+        deadline.
+        """
+        if data.get("capture_time") is None or data.get("pipeline_end", False):
+            return
+        if perf_counter() - data["capture_time"] > self.deadline:
+            self.num_late += 1
+
+    def log_summary(self) -> None:
+        """Logs the number of dropped and late frames."""
+        if self.num_frames > 0:
+            self.logger.info(
+                f"Deadline {self.deadline * 1000:.0f} ms: dropped "
+                f"{self.num_dropped} of {self.num_frames} frames, "
+                f"{self.num_late} processed frames were late"
+            )
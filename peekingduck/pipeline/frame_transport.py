@@ -0,0 +1,376 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Passes frames between processes through shared memory and runs nodes in
+worker processes.
+"""
+
+import importlib
+import logging
+import multiprocessing
+import threading
+import traceback
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+
+# Large enough for a 1080p BGR frame
+DEFAULT_SLOT_SIZE = 1920 * 1080 * 3
+DEFAULT_NUM_SLOTS = 2
+# Arrays smaller than this are cheaper to pickle than to share
+_MIN_SHARED_BYTES = 64 * 1024
+# Alignment of the arrays within a slot
+_ALIGNMENT = 64
+
+
+class ArrayRef(NamedTuple):
+    """Location of an array in a :class:`SharedFrameRing`."""
+
+    slot: int
+    offset: int
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+class SharedFrameRing:
+    """Ring buffer of fixed size slots in a shared memory block.
+
+    :py:meth:`pack` copies the large arrays of a dictionary into the next
+    slot and replaces them with :class:`ArrayRef` entries, so that only the
+    slot index, shape, dtype and the remaining small values have to be
+    pickled to another process, which attaches to the same block by
+    ``name`` and restores the arrays with :py:meth:`unpack`. Slots are
+    reused in turn, so a packed message must be unpacked before
+    ``num_slots`` more messages are packed.
+
+    Arrays which do not fit into the free space of a slot are left in the
+    dictionary and pickled as usual.
+
+    Args:
+        num_slots (int): Number of slots.
+        slot_size (int): Size of each slot in bytes.
+        name (:obj:`str` | :obj:`None`): Name of an existing ring to attach
+            to. A new shared memory block is created if not provided.
+    """
+
+    def __init__(
+        self,
+        num_slots: int = DEFAULT_NUM_SLOTS,
+        slot_size: int = DEFAULT_SLOT_SIZE,
+        name: Optional[str] = None,
+    ) -> None:
+        if num_slots <= 0 or slot_size <= 0:
+            raise ValueError("num_slots and slot_size must be positive integers")
+        self.num_slots = num_slots
+        self.slot_size = slot_size
+        self.owner = name is None
+        if self.owner:
+            self.memory = SharedMemory(create=True, size=num_slots * slot_size)
+        else:
+            self.memory = SharedMemory(name=name)
+        self.name = self.memory.name
+        self._next_slot = 0
+
+    def pack(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Copies the large arrays in ``values`` into the next slot.
+
+        Returns:
+            (Dict[str, Any]): ``values`` with the copied arrays replaced by
+            :class:`ArrayRef` entries.
+        """
+        slot = self._next_slot
+        self._next_slot = (slot + 1) % self.num_slots
+        offset = 0
+        packed = {}
+        for key, value in values.items():
+            if (
+                isinstance(value, np.ndarray)
+                and value.dtype != object
+                and value.nbytes >= _MIN_SHARED_BYTES
+                and offset + value.nbytes <= self.slot_size
+            ):
+                ref = ArrayRef(slot, offset, value.shape, value.dtype.str)
+                np.copyto(self._view(ref), value)
+                packed[key] = ref
+                offset += -(-value.nbytes // _ALIGNMENT) * _ALIGNMENT
+            else:
+                packed[key] = value
+        return packed
+
+    def unpack(self, values: Dict[str, Any], copy: bool = True) -> Dict[str, Any]:
+        """Restores the arrays packed by :py:meth:`pack`.
+
+        Args:
+            values (Dict[str, Any]): Packed dictionary.
+            copy (bool): If ``False``, the arrays are views of the shared
+                memory which are only valid until their slot is reused.
+
+        Returns:
+            (Dict[str, Any]): Dictionary with the restored arrays.
+        """
+        return {
+            key: (
+                (self._view(value).copy() if copy else self._view(value))
+                if isinstance(value, ArrayRef)
+                else value
+            )
+            for key, value in values.items()
+        }
+
+    def close(self) -> None:
+        """Detaches from the shared memory, and frees it if this ring
+        created it.
+        """
+        try:
+            self.memory.close()
+        except BufferError:
+            # arrays still reference the block, it is freed with them
+            pass
+        if self.owner:
+            self.memory.unlink()
+
+    def _view(self, ref: ArrayRef) -> np.ndarray:
+        return np.ndarray(
+            ref.shape,
+            dtype=np.dtype(ref.dtype),
+            buffer=self.memory.buf,
+            offset=ref.slot * self.slot_size + ref.offset,
+        )
+
+
+class RemoteNode(AbstractNode):  # pylint: disable=too-many-instance-attributes
+    """Runs a node in a worker process.
+
+    The worker process imports ``class_name`` from ``module_name`` and
+    creates the node from ``config``, so the node is only built, and its
+    weights only loaded, in the worker and does not have to be picklable.
+    Inputs and outputs are passed through two :class:`SharedFrameRing`, one
+    per direction, so that images and other large arrays are copied once
+    instead of being pickled. The arrays received by the node are views of
+    the shared memory which are only valid during the ``run()`` call.
+
+    Calls are synchronous: :py:meth:`run` blocks without holding the GIL
+    until the worker replies, which lets the other threads of the
+    pipelined and parallel branch executors run in the meantime.
+    :py:meth:`run_batch` passes up to ``num_slots`` frames per call to the
+    ``run_batch()`` method of the node.
+
+    Args:
+        module_name (str): Module which defines the node class.
+        class_name (str): Name of the node class.
+        config (Dict[str, Any]): Config to create the node with.
+        num_slots (int): Number of slots of each ring, i.e., the maximum
+            number of frames passed to the worker per call.
+        slot_size (int): Size of each slot in bytes.
+
+    Raises:
+        RuntimeError: The node could not be created in the worker process.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        module_name: str,
+        class_name: str,
+        config: Dict[str, Any],
+        num_slots: int = DEFAULT_NUM_SLOTS,
+        slot_size: int = DEFAULT_SLOT_SIZE,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._num_slots = num_slots
+        self._input_ring = SharedFrameRing(num_slots, slot_size)
+        self._output_ring = SharedFrameRing(num_slots, slot_size)
+        context = multiprocessing.get_context("spawn")
+        self._conn, worker_conn = context.Pipe()
+        self._process = context.Process(
+            target=_serve,
+            args=(
+                worker_conn,
+                module_name,
+                class_name,
+                config,
+                self._input_ring.name,
+                self._output_ring.name,
+                num_slots,
+                slot_size,
+            ),
+            daemon=True,
+        )
+        self._process.start()
+        worker_conn.close()
+        try:
+            status, message = self._conn.recv()
+        except EOFError:
+            status, message = "error", "Worker process exited unexpectedly"
+        if status != "ready":
+            self.release_resources()
+            raise RuntimeError(f"Failed to start {class_name} worker:\n{message}")
+        try:
+            # The full config of the node run by the worker, model nodes
+            # read e.g. "detect" in AbstractNode.__init__()
+            super().__init__(
+                {**message["config"], **message["io_config"]},
+                node_path=message["name"],
+            )
+        except Exception:
+            self.release_resources()
+            raise
+        self.is_stateless = message["is_stateless"]
+
+    @classmethod
+    def from_node(
+        cls,
+        node: AbstractNode,
+        num_slots: int = DEFAULT_NUM_SLOTS,
+        slot_size: int = DEFAULT_SLOT_SIZE,
+    ) -> "RemoteNode":
+        """Creates a worker process running a new instance of the class of
+        ``node`` with the same config. ``node`` itself is not used by the
+        worker, drop every reference to it to free its memory.
+        """
+        return cls(
+            type(node).__module__,
+            type(node).__name__,
+            node.config,
+            num_slots,
+            slot_size,
+        )
+
+    def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Sends ``inputs`` to the worker process and waits for the outputs
+        of the node.
+        """
+        with self._lock:
+            outputs = self._call("run", self._input_ring.pack(inputs))
+            return self._output_ring.unpack(outputs)
+
+    def run_batch(self, inputs_batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Sends ``inputs_batch`` to the worker process in chunks of at most
+        ``num_slots`` frames and waits for the outputs of the node.
+        """
+        outputs_batch: List[Dict[str, Any]] = []
+        with self._lock:
+            for start in range(0, len(inputs_batch), self._num_slots):
+                chunk = inputs_batch[start : start + self._num_slots]
+                outputs = self._call(
+                    "run_batch", [self._input_ring.pack(inputs) for inputs in chunk]
+                )
+                outputs_batch.extend(self._output_ring.unpack(out) for out in outputs)
+                # the node ended the pipeline within the chunk
+                if len(outputs) < len(chunk):
+                    break
+        return outputs_batch
+
+    def release_resources(self) -> None:
+        """Stops the worker process and frees the shared memory."""
+        if self._process.is_alive():
+            try:
+                self._conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self._process.join(timeout=5)
+            if self._process.is_alive():
+                self._process.terminate()
+        self._conn.close()
+        self._input_ring.close()
+        self._output_ring.close()
+
+    def _call(self, method: str, inputs: Any) -> Any:
+        """Calls ``method`` of the node in the worker process with packed
+        ``inputs`` and returns its packed outputs.
+        """
+        self._conn.send((method, inputs))
+        status, outputs = self._conn.recv()
+        if status != "ok":
+            raise RuntimeError(f"{self.name} failed in worker process:\n{outputs}")
+        return outputs
+
+
+def _serve(  # pylint: disable=too-many-arguments, too-many-locals
+    conn: Connection,
+    module_name: str,
+    class_name: str,
+    config: Dict[str, Any],
+    input_ring_name: str,
+    output_ring_name: str,
+    num_slots: int,
+    slot_size: int,
+) -> None:
+    """Runs a node on the inputs received through ``conn`` until ``None``
+    is received. Entry point of the :class:`RemoteNode` worker processes.
+    """
+    try:
+        node = getattr(importlib.import_module(module_name), class_name)(config)
+        input_ring = SharedFrameRing(num_slots, slot_size, input_ring_name)
+        output_ring = SharedFrameRing(num_slots, slot_size, output_ring_name)
+    except Exception:  # pylint: disable=broad-except
+        conn.send(("error", traceback.format_exc()))
+        return
+    io_config = {"input": node.inputs, "output": node.outputs}
+    if hasattr(node, "optional_inputs"):
+        io_config["optional_inputs"] = node.optional_inputs
+    conn.send(
+        (
+            "ready",
+            {
+                "name": node.name,
+                "io_config": io_config,
+                "config": node.config,
+                "is_stateless": node.is_stateless,
+            },
+        )
+    )
+    logger = logging.getLogger(__name__)
+    try:
+        while True:
+            request = conn.recv()
+            if request is None:
+                break
+            method, inputs = request
+            try:
+                outputs = _call_node(node, method, inputs, input_ring, output_ring)
+            except Exception:  # pylint: disable=broad-except
+                conn.send(("error", traceback.format_exc()))
+                continue
+            conn.send(("ok", outputs))
+    except EOFError:
+        logger.debug(f"{class_name} worker lost its connection")
+    finally:
+        node.release_resources()
+        input_ring.close()
+        output_ring.close()
+
+
+def _call_node(
+    node: AbstractNode,
+    method: str,
+    inputs: Any,
+    input_ring: SharedFrameRing,
+    output_ring: SharedFrameRing,
+) -> Any:
+    """Calls ``method`` of ``node`` with the packed ``inputs``, a dictionary
+    or a list of them for ``run_batch``, and returns its packed outputs.
+    """
+    if method == "run_batch":
+        return [
+            output_ring.pack(outputs)
+            for outputs in node.run_batch(
+                [input_ring.unpack(values, copy=False) for values in inputs]
+            )
+        ]
+    return output_ring.pack(node.run(input_ring.unpack(inputs, copy=False)))
@@ -0,0 +1,223 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Caches the outputs of model nodes on disk, keyed by their inputs and config.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+
+# In megabytes
+DEFAULT_CACHE_SIZE = 1024
+_SUFFIX = ".pkl"
+# Config keys which do not affect the outputs of a node
+_IGNORED_CONFIG_KEYS = {
+    "root",
+    "input",
+    "output",
+    "pkd_viewer",
+    "weights_parent_dir",
+    "warmup_iterations",
+    "warmup_background",
+}
+
+
+class InferenceCache:
+    """Size-bounded on-disk store of node outputs with least recently used
+    eviction.
+
+    Every entry is a pickle file named after its key. The modification time
+    of a file is updated whenever it is read, so the eviction order carries
+    over to later runs which use the same ``directory``.
+
+    Args:
+        directory (Path): Folder of the cache, created if it does not exist.
+        max_size (int): Maximum total size of the entries in megabytes.
+
+    Raises:
+        ValueError: ``max_size`` is not positive.
+    """
+
+    def __init__(self, directory: Path, max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        if max_size <= 0:
+            raise ValueError("max_size must be a positive integer")
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory
+        self.max_bytes = max_size * 1024 * 1024
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.stats: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+        # Entry sizes from least to most recently used
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        paths = sorted(
+            self.directory.glob(f"*{_SUFFIX}"), key=lambda path: path.stat().st_mtime
+        )
+        for path in paths:
+            self._entries[path.stem] = path.stat().st_size
+        self.size = sum(self._entries.values())
+        self._evict()
+
+    def get(self, key: str, name: str) -> Optional[Dict[str, Any]]:
+        """Returns the outputs stored under ``key``, or ``None`` if there are
+        none. Counts a hit or a miss for the node called ``name``.
+        """
+        outputs = None
+        path = self.directory / f"{key}{_SUFFIX}"
+        with self._lock:
+            is_cached = key in self._entries
+            if is_cached:
+                self._entries.move_to_end(key)
+        if is_cached:
+            try:
+                with open(path, "rb") as infile:
+                    outputs = pickle.load(infile)
+                os.utime(path)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                self.logger.warning(f"Discarding unreadable cache entry {path}")
+                self._remove(key)
+        with self._lock:
+            stats = self.stats.setdefault(name, [0, 0])
+            stats[0 if outputs is not None else 1] += 1
+        return outputs
+
+    def put(self, key: str, outputs: Dict[str, Any]) -> None:
+        """Stores ``outputs`` under ``key``, evicting the least recently used
+        entries if the cache becomes too large. Outputs larger than the
+        whole cache are not stored.
+        """
+        data = pickle.dumps(outputs, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return
+        # Write to a temporary file first so readers never see partial entries
+        handle, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(handle, "wb") as outfile:
+            outfile.write(data)
+        os.replace(tmp_path, self.directory / f"{key}{_SUFFIX}")
+        with self._lock:
+            self.size += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._evict()
+
+    def log_summary(self) -> None:
+        """Logs the hit rate of every node."""
+        for name, (hits, misses) in self.stats.items():
+            self.logger.info(
+                f"{name} cache: {hits} hits, {misses} misses "
+                f"({hits / (hits + misses):.1%} hit rate)"
+            )
+
+    def _evict(self) -> None:
+        """Removes the least recently used entries until the cache fits into
+        ``max_bytes``. Must be called with the lock held or from __init__.
+        """
+        while self.size > self.max_bytes:
+            key, size = self._entries.popitem(last=False)
+            self.size -= size
+            self._unlink(key)
+
+    def _remove(self, key: str) -> None:
+        with self._lock:
+            self.size -= self._entries.pop(key, 0)
+        self._unlink(key)
+
+    def _unlink(self, key: str) -> None:
+        try:
+            (self.directory / f"{key}{_SUFFIX}").unlink()
+        except FileNotFoundError:
+            pass
+
+
+class CachedNode(AbstractNode):
+    """Runs a node only on inputs it has not seen before and otherwise
+    returns its cached outputs, skipping preprocessing and inference.
+
+    The cache key is a hash of the node's inputs, e.g., the bytes of
+    ``img``, and of its effective config, so changing a threshold or the
+    detected classes invalidates the earlier entries. Only suitable for
+    stateless nodes, whose outputs depend on the current inputs alone.
+
+    Args:
+        node (AbstractNode): The node whose outputs are cached.
+        cache (InferenceCache): The store of the outputs, which can be shared
+            by several nodes.
+    """
+
+    def __init__(self, node: AbstractNode, cache: InferenceCache) -> None:
+        # The full config of the node, model nodes read e.g. "detect" in
+        # AbstractNode.__init__()
+        config = {**node.config, "input": node.inputs, "output": node.outputs}
+        if hasattr(node, "optional_inputs"):
+            config["optional_inputs"] = node.optional_inputs
+        super().__init__(config, node_path=node.name)
+        self.is_stateless = node.is_stateless
+        self.node = node
+        self.cache = cache
+        effective_config = {
+            key: value
+            for key, value in node.config.items()
+            if key not in _IGNORED_CONFIG_KEYS
+        }
+        self._fingerprint = json.dumps(
+            [node.node_name, effective_config], sort_keys=True, default=str
+        ).encode()
+
+    def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        key = self._key(inputs)
+        outputs = self.cache.get(key, self.node_name)
+        if outputs is None:
+            outputs = self.node.run(inputs)
+            self.cache.put(key, outputs)
+        return outputs
+
+    def run_batch(self, inputs_batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Looks up every frame of the batch and runs the node once on the
+        frames which are not cached.
+        """
+        keys = [self._key(inputs) for inputs in inputs_batch]
+        outputs_batch = [self.cache.get(key, self.node_name) for key in keys]
+        missing = [idx for idx, outputs in enumerate(outputs_batch) if outputs is None]
+        if missing:
+            computed = self.node.run_batch([inputs_batch[idx] for idx in missing])
+            for idx, outputs in zip(missing, computed):
+                self.cache.put(keys[idx], outputs)
+                outputs_batch[idx] = outputs
+        return outputs_batch  # type: ignore
+
+    def release_resources(self) -> None:
+        self.node.release_resources()
+
+    def _key(self, inputs: Dict[str, Any]) -> str:
+        digest = hashlib.blake2b(self._fingerprint, digest_size=16)
+        for key in sorted(inputs):
+            value = inputs[key]
+            digest.update(key.encode())
+            if isinstance(value, np.ndarray) and value.dtype != object:
+                digest.update(f"{value.dtype.str}{value.shape}".encode())
+                digest.update(np.ascontiguousarray(value).data)
+            else:
+                digest.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        return digest.hexdigest()
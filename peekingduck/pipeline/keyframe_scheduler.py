@@ -0,0 +1,227 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Runs object detection models on keyframes only and tracks their detections
+in between.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+from peekingduck.pipeline.utils.bbox.transforms import tlwh2xyxyn, xyxyn2tlwh
+
+# Outputs of the object detection models which are propagated on frames
+# between keyframes
+_PROPAGATED_KEYS = {"bboxes", "bbox_labels", "bbox_scores"}
+# Size of the grayscale thumbnails compared to detect motion
+_THUMBNAIL_SIZE = (64, 36)
+
+
+class KeyframeScheduler:  # pylint: disable=too-many-instance-attributes
+    """Runs object detection model nodes only on keyframes and propagates
+    their detections to the frames in between with one MOSSE tracker per
+    bounding box.
+
+    Model nodes which take ``img`` and only output ``bboxes``,
+    ``bbox_labels`` and ``bbox_scores`` are scheduled. On the other frames,
+    the tracked ``bboxes`` replace the model outputs, so downstream nodes
+    still receive a full set of detections on every frame. Detections whose
+    tracker is lost are dropped together with their labels and scores.
+
+    A frame is a keyframe if it is the first one, if ``keyframe_interval``
+    frames have passed since the last keyframe, if a tracker was lost on the
+    previous frame, or if the mean absolute difference between the grayscale
+    thumbnails of the frame and of the last keyframe exceeds
+    ``motion_threshold``.
+
+    Args:
+        nodes (:obj:`List[AbstractNode]`): The nodes of the pipeline.
+        keyframe_interval (:obj:`int`): Maximum number of frames between two
+            keyframes, ``1`` runs the models on every frame.
+        motion_threshold (:obj:`float`): Mean absolute pixel difference, as a
+            fraction of 255, above which a frame becomes a keyframe. ``0``
+            disables the motion check.
+
+    Raises:
+        ValueError: ``keyframe_interval`` is not positive or
+            ``motion_threshold`` is not within [0, 1].
+    """
+
+    def __init__(
+        self,
+        nodes: List[AbstractNode],
+        keyframe_interval: int,
+        motion_threshold: float = 0.0,
+    ) -> None:
+        if keyframe_interval <= 0:
+            raise ValueError("keyframe_interval must be a positive integer")
+        if not 0.0 <= motion_threshold <= 1.0:
+            raise ValueError("motion_threshold must be within [0, 1]")
+        self.logger = logging.getLogger(__name__)
+        self.keyframe_interval = keyframe_interval
+        self.motion_threshold = motion_threshold
+        self.detectors = {
+            id(node)
+            for node in nodes
+            if node.node_name.startswith("model.")
+            and "img" in node.inputs
+            and "bboxes" in node.outputs
+            and set(node.outputs) <= _PROPAGATED_KEYS
+        }
+        self.num_frames = 0
+        self.num_keyframes = 0
+
+        self._propagators: Dict[int, BboxPropagator] = {}
+        self._is_keyframe: Optional[bool] = None
+        self._frames_since_keyframe = 0
+        self._keyframe_thumbnail: Optional[np.ndarray] = None
+
+    def start_frame(self) -> None:
+        """Marks the start of a new frame, the keyframe decision is made when
+        the first scheduled model node runs on it.
+        """
+        self._is_keyframe = None
+
+    def run(
+        self,
+        node: AbstractNode,
+        data: Dict[str, Any],
+        run_node: Callable[[AbstractNode, Dict[str, Any]], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Runs ``node`` with ``run_node`` unless it is a scheduled model node
+        and the current frame is not a keyframe, in which case its
+        detections on the last keyframe are propagated to ``data["img"]``.
+
+        Returns:
+            (Dict[str, Any]): Outputs of the node.
+        """
+        if id(node) not in self.detectors:
+            return run_node(node, data)
+        if self._is_keyframe is None:
+            self._is_keyframe = self._check_keyframe(data["img"])
+        if self._is_keyframe or id(node) not in self._propagators:
+            outputs = run_node(node, data)
+            self._propagators[id(node)] = BboxPropagator(data["img"], outputs)
+            return outputs
+        return self._propagators[id(node)].propagate(data["img"])
+
+    def log_summary(self) -> None:
+        """Logs the share of frames on which the models were run."""
+        if self.num_frames > 0:
+            self.logger.info(
+                f"Ran object detection on {self.num_keyframes} of "
+                f"{self.num_frames} frames"
+            )
+
+    def _check_keyframe(self, img: np.ndarray) -> bool:
+        """Decides whether ``img`` is a keyframe and updates the counters."""
+        thumbnail = None
+        is_keyframe = (
+            self._keyframe_thumbnail is None
+            or self._frames_since_keyframe + 1 >= self.keyframe_interval
+            or any(propagator.lost for propagator in self._propagators.values())
+        )
+        if not is_keyframe and self.motion_threshold > 0:
+            thumbnail = _to_thumbnail(img)
+            motion = np.abs(thumbnail - self._keyframe_thumbnail).mean() / 255
+            is_keyframe = bool(motion > self.motion_threshold)
+
+        self.num_frames += 1
+        if is_keyframe:
+            self.num_keyframes += 1
+            self._frames_since_keyframe = 0
+            self._keyframe_thumbnail = (
+                thumbnail if thumbnail is not None else _to_thumbnail(img)
+            )
+        else:
+            self._frames_since_keyframe += 1
+        return is_keyframe
+
+
+class BboxPropagator:  # pylint: disable=too-few-public-methods
+    """Tracks the detections of a model node on a keyframe through the
+    following frames.
+
+    Args:
+        img (np.ndarray): The keyframe.
+        outputs (Dict[str, Any]): Outputs of the model node on ``img``.
+
+    Attributes:
+        lost (bool): ``True`` once a detection of the keyframe could not be
+            tracked.
+    """
+
+    def __init__(self, img: np.ndarray, outputs: Dict[str, Any]) -> None:
+        self.outputs = outputs
+        self.lost = False
+        self.trackers: List[Tuple[int, Any]] = []
+        height, width = img.shape[:2]
+        bboxes = np.asarray(outputs["bboxes"], dtype=float).reshape(-1, 4)
+        # Round to whole pixels, the tracker truncates the coordinates
+        tlwhs = np.round(xyxyn2tlwh(bboxes, height, width))
+        for idx, tlwh in enumerate(tlwhs):
+            tracker = cv2.legacy.TrackerMOSSE_create()
+            try:
+                tracker.init(img, tuple(tlwh))
+            except cv2.error:
+                # Degenerate bboxes cannot be tracked
+                self.lost = True
+                continue
+            self.trackers.append((idx, tracker))
+
+    def propagate(self, img: np.ndarray) -> Dict[str, Any]:
+        """Updates the trackers on ``img``.
+
+        Returns:
+            (Dict[str, Any]): The keyframe outputs with the tracked
+            ``bboxes``, without the detections whose tracker was lost.
+        """
+        tracked = []
+        tlwhs = []
+        for idx, tracker in self.trackers:
+            success, tlwh = tracker.update(img)
+            if success:
+                tracked.append((idx, tracker))
+                tlwhs.append(tlwh)
+        self.lost = self.lost or len(tracked) < len(self.trackers)
+        self.trackers = tracked
+
+        indices = [idx for idx, _ in tracked]
+        num_bboxes = len(self.outputs["bboxes"])
+        outputs = {}
+        for key, value in self.outputs.items():
+            if key == "bboxes":
+                bboxes = np.array(tlwhs, dtype=float).reshape(-1, 4)
+                value = np.clip(tlwh2xyxyn(bboxes, *img.shape[:2]), 0, 1)
+                value = value.astype(np.asarray(self.outputs["bboxes"]).dtype)
+            elif isinstance(value, np.ndarray) and len(value) == num_bboxes:
+                value = value[indices]
+            elif isinstance(value, list) and len(value) == num_bboxes:
+                value = [value[idx] for idx in indices]
+            outputs[key] = value
+        return outputs
+
+
+def _to_thumbnail(img: np.ndarray) -> np.ndarray:
+    """Downscales ``img`` to a small grayscale image for motion detection."""
+    if img.ndim == 3:
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(img, _THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA).astype(
+        np.float32
+    )
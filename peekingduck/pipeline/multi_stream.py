@@ -0,0 +1,169 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Runs one pipeline definition over several visual sources, sharing stateless
+nodes between the streams.
+"""
+
+import copy
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+from peekingduck.pipeline.pipeline import Pipeline
+
+# Config keys which name a per-stream resource, such as an output file or a
+# window, and are made unique for every stream after the first one
+_STREAM_SPECIFIC_KEYS = {
+    "input.visual": "filename",
+    "output.csv_writer": "file_path",
+    "output.recorder": "output_dir",
+    "output.screen": "window_name",
+}
+
+
+def fan_out(pipeline: Pipeline, sources: List[Union[int, str]]) -> List[Pipeline]:
+    """Creates one pipeline per source from the nodes of ``pipeline``.
+
+    Every stream reads from its own ``input.visual`` node. Stateless nodes,
+    i.e., those with ``is_stateless == True`` such as the object detection and
+    pose estimation models, are shared by all streams so that their weights
+    are only loaded once. Every other node is re-created from its config for
+    each stream after the first one, which reuses the nodes of ``pipeline``.
+
+    Args:
+        pipeline (:obj:`Pipeline`): Pipeline starting with ``input.visual``.
+        sources (:obj:`List[Union[int, str]]`): The source of each stream, see
+            the ``source`` config of ``input.visual``.
+
+    Returns:
+        (:obj:`List[Pipeline]`): One pipeline per source.
+
+    Raises:
+        ValueError: ``sources`` is empty or ``pipeline`` does not start with
+            ``input.visual``.
+    """
+    if not sources:
+        raise ValueError("At least one source is required for multi-stream mode.")
+    if pipeline.nodes[0].node_name != "input.visual":
+        raise ValueError(
+            "Multi-stream mode requires the pipeline to start with input.visual."
+        )
+
+    # The template input node has already opened its own source
+    pipeline.nodes[0].release_resources()
+    streams = []
+    for idx, source in enumerate(sources):
+        nodes = [_create_stream_node(pipeline.nodes[0], idx, source)]
+        for node in pipeline.nodes[1:]:
+            if node.is_stateless or idx == 0:
+                nodes.append(node)
+            else:
+                nodes.append(_create_stream_node(node, idx))
+        streams.append(Pipeline(nodes))
+    return streams
+
+
+class MultiStreamExecutor:  # pylint: disable=too-few-public-methods
+    """Runs several streams created by :func:`fan_out` in lockstep.
+
+    On every iteration, each node position is run for all streams before
+    moving on to the next one. A node shared by several streams is called once
+    through :py:meth:`AbstractNode.run_batch
+    <peekingduck.pipeline.nodes.abstract_node.AbstractNode.run_batch>` with
+    the current frame of each stream, so batch-capable models infer all
+    streams in a single forward pass. Every stream keeps its own data pool and
+    follows the ``pipeline_end`` semantics of the sequential runner; the
+    executor stops once every stream has ended.
+
+    Args:
+        streams (:obj:`List[Pipeline]`): The streams to run.
+        run_node_batch (:obj:`Callable`): Callable which runs a node on a list
+            of data pools and returns the node outputs for each of them.
+        num_iter (:obj:`int`): Stop after this number of iterations, ``0`` to
+            run until all inputs are exhausted.
+        release_schedule (:obj:`List[List[str]]` | :obj:`None`): If provided,
+            the keys to remove from the data pool of every stream after each
+            node position, see
+            :py:func:`~peekingduck.pipeline.data_pool.get_key_release_schedule`.
+    """
+
+    def __init__(
+        self,
+        streams: List[Pipeline],
+        run_node_batch: Callable[
+            [AbstractNode, List[Dict[str, Any]]], List[Dict[str, Any]]
+        ],
+        num_iter: int = 0,
+        release_schedule: Optional[List[List[str]]] = None,
+    ) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.streams = streams
+        self.run_node_batch = run_node_batch
+        self.num_iter = num_iter
+        self.release_schedule = release_schedule
+
+    def run(self) -> None:
+        """Runs all streams until every input is exhausted or ``num_iter``
+        iterations have been run.
+        """
+        num_iter = 0
+        active = [stream for stream in self.streams if not stream.terminate]
+        while active:
+            for position in range(len(active[0].nodes)):
+                for node, batch in self._group_by_node(active, position):
+                    for data, outputs in zip(batch, self.run_node_batch(node, batch)):
+                        data.update(outputs)
+                if self.release_schedule is not None:
+                    for stream in active:
+                        for key in self.release_schedule[position]:
+                            stream.data.pop(key, None)
+            active = [stream for stream in active if not stream.terminate]
+            num_iter += 1
+            if 0 < self.num_iter <= num_iter:
+                self.logger.info(f"Stopping pipeline after {num_iter} iterations")
+                break
+
+    @staticmethod
+    def _group_by_node(
+        streams: List[Pipeline], position: int
+    ) -> List[Tuple[AbstractNode, List[Dict[str, Any]]]]:
+        """Collects the data pools of the streams which have to run the node
+        at ``position``, grouped by node instance.
+        """
+        groups: Dict[int, Tuple[AbstractNode, List[Dict[str, Any]]]] = {}
+        for stream in streams:
+            node = stream.nodes[position]
+            if stream.data.get("pipeline_end", False):
+                stream.terminate = True
+                if "pipeline_end" not in node.inputs:
+                    continue
+            groups.setdefault(id(node), (node, []))[1].append(stream.data)
+        return list(groups.values())
+
+
+def _create_stream_node(
+    node: AbstractNode, idx: int, source: Union[int, str, None] = None
+) -> AbstractNode:
+    """Creates a new instance of ``node`` for stream ``idx``."""
+    config = copy.deepcopy(node.config)
+    if source is not None:
+        config["source"] = source
+    key = _STREAM_SPECIFIC_KEYS.get(node.node_name)
+    if idx > 0 and key is not None:
+        path = Path(config[key])
+        config[key] = str(path.with_name(f"{path.stem}_stream{idx}{path.suffix}"))
+    return type(node)(config=config)
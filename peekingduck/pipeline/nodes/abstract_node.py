@@ -18,10 +18,13 @@ Abstract Node class for all nodes.
 
 import collections
 import logging
+import threading
 from abc import ABCMeta, abstractmethod
 from pathlib import Path
+from time import perf_counter
 from typing import Any, Dict, List, Optional, Union
 
+import numpy as np
 from typeguard import check_type
 
 from peekingduck.config_loader import ConfigLoader
@@ -41,6 +44,11 @@ class AbstractNode(metaclass=ABCMeta):
             ``peekingduck`` directory.
     """
 
+    #: ``True`` if the node keeps no state between frames. Stateless nodes
+    #: are shared by all streams in multi-stream execution while every stream
+    #: gets its own instance of the other nodes.
+    is_stateless = False
+
     def __init__(
         self,
         config: Dict[str, Any] = None,
@@ -50,6 +58,7 @@ class AbstractNode(metaclass=ABCMeta):
     ) -> None:
         self._name = node_path
         self.logger = logging.getLogger(self._name)
+        self._warm_up_thread: Optional[threading.Thread] = None
 
         if not pkd_base_dir:
             pkd_base_dir = Path(__file__).resolve().parents[2]
@@ -86,12 +95,94 @@ class AbstractNode(metaclass=ABCMeta):
         """abstract method needed for running node"""
         raise NotImplementedError("This method needs to be implemented")
 
+    def run_batch(self, inputs_batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Runs the node on a batch of consecutive frames.
+
+        The default implementation calls :py:meth:`run` on every frame in
+        order and stops after the first frame for which the node raises
+        ``pipeline_end``, like the sequential runner would. Nodes which can
+        process several frames at once more efficiently, e.g., model nodes
+        stacking images into a single inference call, should override this
+        method.
+
+        Args:
+            inputs_batch (List[Dict[str, Any]]): Inputs of each frame, in
+                frame order.
+
+        Returns:
+            (List[Dict[str, Any]]): Outputs of each frame, in frame order.
+            Frames after the one which ends the pipeline have no outputs.
+        """
+        outputs_batch = []
+        for inputs in inputs_batch:
+            outputs = self.run(inputs)
+            outputs_batch.append(outputs)
+            if outputs.get("pipeline_end", False):
+                break
+        return outputs_batch
+
     # pylint: disable=R0201, W0107
     def release_resources(self) -> None:
         """To gracefully release any acquired system resources, e.g. webcam
         NOTE: To be overridden by subclass if required"""
         pass
 
+    def warm_up(self, width: int, height: int) -> None:
+        """Runs the node ``warmup_iterations`` times on a dummy frame so that
+        graph tracing, kernel selection and memory allocation happen before
+        the first real frame. Does nothing unless the node's config sets
+        ``warmup_iterations``.
+
+        The dummy frame is random noise of ``width`` x ``height``, usually the
+        input size of the model, with a bounding box covering its centre for
+        nodes which take ``bboxes``. If ``warmup_background`` is set, the
+        warm-up runs in a background thread and :py:meth:`wait_for_warm_up`
+        blocks until it is done.
+
+        Args:
+            width (int): Width of the dummy frame.
+            height (int): Height of the dummy frame.
+        """
+        iterations = self.config.get("warmup_iterations", 0)
+        if iterations <= 0:
+            return
+        inputs: Dict[str, Any] = {
+            "img": np.random.default_rng(0).integers(
+                0, 256, (height, width, 3), dtype=np.uint8
+            )
+        }
+        if "bboxes" in self.inputs:
+            inputs["bboxes"] = np.array([[0.25, 0.25, 0.75, 0.75]], dtype=np.float32)
+        if self.config.get("warmup_background", False):
+            self._warm_up_thread = threading.Thread(
+                target=self._run_warm_up, args=(inputs, iterations), daemon=True
+            )
+            self._warm_up_thread.start()
+        else:
+            self._run_warm_up(inputs, iterations)
+
+    def wait_for_warm_up(self) -> None:
+        """Blocks until the background warm-up started by :py:meth:`warm_up`,
+        if any, is done. To be called at the start of ``run()``.
+        """
+        thread = self._warm_up_thread
+        # The warm-up itself calls run() from the background thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+            self._warm_up_thread = None
+
+    def _run_warm_up(self, inputs: Dict[str, Any], iterations: int) -> None:
+        start_time = perf_counter()
+        try:
+            for _ in range(iterations):
+                self.run(inputs)
+        except Exception as error:  # pylint: disable=broad-except
+            self.logger.warning(f"Warm-up of {self.node_name} failed: {error!r}")
+            return
+        self.logger.info(
+            f"Warmed up {self.node_name} in {perf_counter() - start_time:.2f} sec"
+        )
+
     @property
     def inputs(self) -> List[str]:
         """Input requirements."""
@@ -15,6 +15,7 @@
 """Mixin classes for PeekingDuck nodes and models."""
 
 import hashlib
+import logging
 import operator
 import os
 import re
@@ -371,3 +372,22 @@ class WeightsDownloaderMixin:
                 for chunk in iter(lambda: infile.read(buffer_size), b""):
                     hash_func.update(chunk)
         return hash_func
+
+
+class WeightsDownloader(WeightsDownloaderMixin):
+    """Downloads the weights selected by the config of a model node without
+    building the model, e.g., to download the weights of several model nodes
+    concurrently before they are initialized.
+
+    Args:
+        config (Dict[str, Any]): Config of the model node.
+    """
+
+    def __init__(self, config: Dict[str, Any]) -> None:
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def weights_path(self) -> Path:
+        """Path to the selected weights on local machine."""
+        return self._find_paths() / self.model_filename
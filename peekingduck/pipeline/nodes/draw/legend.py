@@ -93,9 +93,12 @@ class Node(AbstractNode):
             outputs (dict): Dictionary with keys "none".
         """
         _check_data_type(inputs, self.show)
-        self.legend.draw(inputs)
+        # `inputs` is a read-only view of the data pool, draw on a copy of the
+        # image instead
+        img = inputs["img"].copy()
+        self.legend.draw({**inputs, "img": img})
         # cv2 weighted does not update the referenced image. Need to return and replace.
-        return {"img": inputs["img"]}
+        return {"img": img}
 
     def _get_config_types(self) -> Dict[str, Any]:
         """Returns a dictionary which maps the node's config keys to their
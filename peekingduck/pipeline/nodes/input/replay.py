@@ -0,0 +1,95 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Replays a data pool recorded by :mod:`output.recorder`.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+from peekingduck.pipeline.utils.recording import INDEX_FILE, RecordingReader
+
+
+class Node(AbstractNode):
+    """Feeds the data pool recorded by :mod:`output.recorder` back into a
+    pipeline, one frame per iteration. Downstream nodes receive the recorded
+    outputs of the model nodes without running the models again, which makes
+    tuning and regression testing dabble, draw and output nodes much faster.
+
+    The outputs of this node are the recorded keys, which are only known
+    once the recording is opened.
+
+    Inputs:
+        |none_input_data|
+
+    Outputs:
+        ``<recorded keys>``: The keys listed in ``keys``, or every recorded
+        key if ``keys`` is empty.
+
+        |pipeline_end_data|
+
+    Configs:
+        keys (:obj:`List[str]`): **default = []**. |br|
+            Keys to replay. Every recorded key is replayed if empty.
+        source (:obj:`str`): **default = "PeekingDuck/data/recordings"**. |br|
+            Folder of a recording. If it is the ``output_dir`` of
+            :mod:`output.recorder` instead, its latest recording is replayed.
+    """
+
+    def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
+        super().__init__(config, node_path=__name__, **kwargs)
+
+        self.logger = logging.getLogger(__name__)
+        recording = self._find_recording(Path(self.source))
+        self.reader = RecordingReader(recording, self.keys)
+        self.output = self.reader.keys + ["pipeline_end"]
+        self.config["output"] = self.output
+        self.logger.info(
+            f"Replaying {self.reader.num_frames} frames from "
+            f"{self.reader.directory}: {self.reader.keys}"
+        )
+        self._frames: Iterator[Dict[str, Any]] = iter(self.reader)
+
+    def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Reads the next recorded frame.
+
+        Args:
+            inputs (dict): Unused, this is a source node.
+
+        Returns:
+            outputs (dict): The recorded data pool entries of the frame.
+        """
+        frame = next(self._frames, None)
+        if frame is None:
+            return {"pipeline_end": True}
+        return {**frame, "pipeline_end": False}
+
+    def _get_config_types(self) -> Dict[str, Any]:
+        """Returns dictionary mapping the node's config keys to respective types."""
+        return {"keys": List[str], "source": str}
+
+    @staticmethod
+    def _find_recording(source: Path) -> Path:
+        """Returns ``source`` if it is a recording, else its most recently
+        modified subfolder which is a recording.
+        """
+        if (source / INDEX_FILE).is_file() or not source.is_dir():
+            return source
+        recordings = [path.parent for path in source.glob(f"*/{INDEX_FILE}")]
+        if not recordings:
+            return source
+        return max(recordings, key=lambda path: path.stat().st_mtime)
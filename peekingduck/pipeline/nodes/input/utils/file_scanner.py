@@ -0,0 +1,184 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Lazy enumeration of the files in a directory
+"""
+
+import fnmatch
+import os
+from collections import deque
+from pathlib import Path
+from typing import (
+    Deque,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+# Maximum number of file names sorted at once, larger directories are yielded
+# in sorted chunks
+CHUNK_SIZE = 10000
+
+
+class FileScanner:  # pylint: disable=too-few-public-methods
+    """
+    Enumerates the files in a directory in a deterministic order without
+    creating a list of all of them first.
+
+    Every directory is listed with `os.scandir` only when it is reached, in
+    chunks of up to `chunk_size` files. Each chunk is sorted before its files
+    are yielded, so the first file is available after reading a single chunk,
+    however large the directory is. The files of a directory with up to
+    `chunk_size` files are therefore yielded in sorted order. Larger
+    directories are yielded in sorted chunks, in the order in which
+    `os.scandir` lists them, which is the same for an unchanged directory.
+    The files of a directory are followed by the files of its
+    subdirectories, in sorted order, if `recursive` is True. Directories
+    which are reached again through symbolic links are skipped.
+
+    Args:
+        directory (Path): The directory to enumerate.
+        recursive (bool): Whether to include the files of subdirectories.
+        pattern (Optional[str]): Glob pattern, e.g., "*.jpg", which the names
+            of the files must match.
+        chunk_size (int): Maximum number of files sorted at once.
+
+    Attributes:
+        num_files (Optional[int]): Number of files, only known if `recursive`
+            is False and the directory has up to `chunk_size` files.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        recursive: bool = False,
+        pattern: Optional[str] = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size {chunk_size}: must be a positive integer")
+        self.directory = directory
+        self.recursive = recursive
+        self.pattern = pattern
+        self.chunk_size = chunk_size
+        self.num_files = None if recursive else self._count_files(directory)
+
+    def __iter__(self) -> Iterator[Path]:
+        # device and inode of the enumerated directories
+        visited: Set[Tuple[int, int]] = set()
+        stack = [self.directory]
+        while stack:
+            directory = stack.pop()
+            stat = os.stat(directory)
+            if (stat.st_dev, stat.st_ino) in visited:
+                continue
+            visited.add((stat.st_dev, stat.st_ino))
+            subdirs: List[str] = []
+            for files in self._scan(directory, subdirs):
+                for name in files:
+                    yield directory / name
+            if self.recursive:
+                subdirs.sort(key=os.path.normcase)
+                # reversed so that the first subdirectory is enumerated next
+                stack.extend(directory / name for name in reversed(subdirs))
+
+    def _count_files(self, directory: Path) -> Optional[int]:
+        """Returns the number of files, or None if there are more than
+        `chunk_size` of them.
+        """
+        num_files = 0
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_dir() and self._matches(entry.name):
+                    num_files += 1
+                    if num_files > self.chunk_size:
+                        return None
+        return num_files
+
+    def _matches(self, name: str) -> bool:
+        return self.pattern is None or fnmatch.fnmatch(name, self.pattern)
+
+    def _scan(self, directory: Path, subdirs: List[str]) -> Iterator[List[str]]:
+        """Yields the names of the files in sorted chunks and adds the names
+        of the subdirectories to `subdirs`.
+        """
+        files = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    subdirs.append(entry.name)
+                elif self._matches(entry.name):
+                    files.append(entry.name)
+                    if len(files) == self.chunk_size:
+                        # same order as sorting the paths, which is case
+                        # insensitive on Windows
+                        files.sort(key=os.path.normcase)
+                        yield files
+                        files = []
+        files.sort(key=os.path.normcase)
+        yield files
+
+
+class PeekableIterator(Generic[T]):
+    """
+    Iterator which can look at its upcoming items without consuming them.
+
+    Args:
+        iterable (Iterable[T]): The items to iterate over.
+    """
+
+    def __init__(self, iterable: Iterable[T]) -> None:
+        self._iterator = iter(iterable)
+        self._lookahead: Deque[T] = deque()
+
+    def __iter__(self) -> "PeekableIterator[T]":
+        return self
+
+    def __next__(self) -> T:
+        if self._lookahead:
+            return self._lookahead.popleft()
+        return next(self._iterator)
+
+    def __bool__(self) -> bool:
+        """Whether there are items left."""
+        if self._lookahead:
+            return True
+        try:
+            self._lookahead.append(next(self._iterator))
+        except StopIteration:
+            return False
+        return True
+
+    def upcoming(self) -> Iterator[T]:
+        """
+        Yields the upcoming items without consuming them. Items are only
+        taken from the underlying iterator as the generator advances. The
+        generator must not be used after the iterator is advanced.
+        """
+        idx = 0
+        while True:
+            if idx == len(self._lookahead):
+                try:
+                    self._lookahead.append(next(self._iterator))
+                except StopIteration:
+                    return
+            yield self._lookahead[idx]
+            idx += 1
@@ -0,0 +1,108 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Bounded frame buffer between a capture thread and the pipeline
+"""
+
+from collections import deque
+from threading import Condition
+from typing import Any, Deque, Optional
+
+DROP_POLICIES = ("block", "drop_oldest", "drop_newest", "latest")
+
+
+class FrameBuffer:
+    """
+    First in, first out buffer of frames with a fixed capacity, filled by a
+    capture thread and emptied by the pipeline. The drop policy decides what
+    happens to a frame put into a full buffer:
+
+    - block: the producer waits until the consumer takes a frame, so no
+      frames are lost
+    - drop_oldest: the oldest buffered frame is discarded
+    - drop_newest: the new frame is discarded
+    - latest: only the newest frame is kept, the capacity is 1
+
+    Args:
+        capacity (int): Maximum number of buffered frames, 0 for unbounded.
+        policy (str): One of `DROP_POLICIES`.
+    """
+
+    def __init__(self, capacity: int = 0, policy: str = "block") -> None:
+        if capacity < 0:
+            raise ValueError(f"buffer_size {capacity}: must be non-negative")
+        if policy not in DROP_POLICIES:
+            raise ValueError(
+                f"drop_policy {policy}: must be one of {list(DROP_POLICIES)}"
+            )
+        self.capacity = 1 if policy == "latest" else capacity
+        self.policy = policy
+        self.num_dropped = 0
+        self.high_water_mark = 0
+        self._frames: Deque[Any] = deque()
+        self._is_closed = False
+        self._not_full = Condition()
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def put(self, frame: Any) -> None:
+        """
+        Adds a frame, applying the drop policy if the buffer is full. With the
+        block policy, waits until there is space or the buffer is closed, in
+        which case the frame is discarded.
+        """
+        with self._not_full:
+            if self._is_full():
+                if self.policy == "block":
+                    self._not_full.wait_for(
+                        lambda: not self._is_full() or self._is_closed
+                    )
+                    if self._is_closed:
+                        return
+                elif self.policy == "drop_newest":
+                    self.num_dropped += 1
+                    return
+                else:
+                    self._frames.popleft()
+                    self.num_dropped += 1
+            self._frames.append(frame)
+            self.high_water_mark = max(self.high_water_mark, len(self._frames))
+
+    def get(self) -> Optional[Any]:
+        """
+        Takes the oldest frame without waiting.
+
+        Returns:
+            Any: the oldest frame, or None if the buffer is empty
+        """
+        with self._not_full:
+            if not self._frames:
+                return None
+            frame = self._frames.popleft()
+            self._not_full.notify()
+            return frame
+
+    def close(self) -> None:
+        """
+        Releases a producer waiting on a full buffer, which discards its
+        frame. Later frames put into a full buffer are discarded too.
+        """
+        with self._not_full:
+            self._is_closed = True
+            self._not_full.notify_all()
+
+    def _is_full(self) -> bool:
+        return 0 < self.capacity <= len(self._frames)
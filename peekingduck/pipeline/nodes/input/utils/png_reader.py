@@ -21,10 +21,17 @@ import numpy as np
 
 
 class PNGReader:
-    """Custom PNG reader to fix opencv 'PNG magic' problem on Windows platform"""
+    """Custom PNG reader to fix opencv 'PNG magic' problem on Windows platform.
+    Also reads JPEG images at a reduced size, see `flags`.
 
-    def __init__(self, input_source: str) -> None:
-        self.img = cv2.imread(input_source)
+    Args:
+        input_source (str): path of the image
+        flags (int): flags passed to cv2.imread(), e.g.,
+            cv2.IMREAD_REDUCED_COLOR_2 to decode at half the size
+    """
+
+    def __init__(self, input_source: str, flags: int = cv2.IMREAD_COLOR) -> None:
+        self.img = cv2.imread(input_source, flags)
         self.height, self.width, _ = self.img.shape
         self.get_map = {
             cv2.CAP_PROP_FPS: 0,
@@ -55,6 +62,29 @@ class PNGReader:
         """
         return True
 
+    def grab(self) -> bool:
+        """To mimic opencv's video capture object grab()
+
+        Returns:
+            bool: True if the image has not been read or grabbed yet
+        """
+        has_frames = self.has_frames
+        self.has_frames = False
+        return has_frames
+
+    # pylint: disable=invalid-name, no-self-use, unused-argument
+    def set(self, param: Any, value: Any) -> bool:
+        """To mimic opencv's video capture object set(cv2.SOME_PROPERTY, value)
+
+        Args:
+            param (Any): cv2 property
+            value (Any): new value of the property
+
+        Returns:
+            bool: always False, the properties cannot be changed
+        """
+        return False
+
     def read(self) -> Tuple[bool, np.ndarray]:
         """To mimic opencv's video capture object read()
 
@@ -16,18 +16,111 @@
 Reader functions for input nodes
 """
 
+import itertools
 import logging
 import platform
-import queue
+import struct
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from threading import Event, Thread
-from typing import Any, Tuple, Union
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import cv2
 
+from peekingduck.pipeline.nodes.input.utils.frame_buffer import FrameBuffer
 from peekingduck.pipeline.nodes.input.utils.png_reader import PNGReader
 from peekingduck.pipeline.nodes.input.utils.preprocess import mirror
 
+# Smallest number of skipped frames for which seeking is tried instead of
+# grabbing every skipped frame
+MIN_SEEK_FRAMES = 25
+# Images which can be decoded at a reduced size
+REDUCIBLE_EXTENSIONS = (".jpeg", ".jpg", ".png")
+# cv2.imread() applies the EXIF orientation, cv2.VideoCapture does not, so it
+# is ignored to return the same frames as the full size path
+_REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8 | cv2.IMREAD_IGNORE_ORIENTATION),
+    (4, cv2.IMREAD_REDUCED_COLOR_4 | cv2.IMREAD_IGNORE_ORIENTATION),
+    (2, cv2.IMREAD_REDUCED_COLOR_2 | cv2.IMREAD_IGNORE_ORIENTATION),
+)
+# JPEG start of frame markers, which hold the image size
+_JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Readers of a video or image, PNGReader mimics the used VideoCapture methods
+VideoStream = Union[cv2.VideoCapture, PNGReader]
+
+
+def read_image_size(path: str) -> Optional[Tuple[int, int]]:
+    """Reads the size of a PNG or JPEG image from its header, without
+    decoding it.
+
+    Args:
+        path (str): path of the image
+
+    Returns:
+        Optional[Tuple[int, int]]: width and height of the image, or None if
+        the file is not a PNG or JPEG image
+    """
+    with open(path, "rb") as infile:
+        header = infile.read(24)
+        if header.startswith(b"\x89PNG\r\n\x1a\n") and header[12:16] == b"IHDR":
+            width, height = struct.unpack(">II", header[16:24])
+            return width, height
+        if not header.startswith(b"\xff\xd8"):
+            return None
+        infile.seek(2)
+        while True:
+            marker = infile.read(2)
+            if len(marker) < 2 or marker[0] != 0xFF:
+                return None
+            code = marker[1]
+            if code == 0xFF:
+                # fill byte before the marker
+                infile.seek(-1, 1)
+                continue
+            if code == 0x01 or 0xD0 <= code <= 0xD7:
+                # markers without a segment
+                continue
+            # segment length, followed by precision, height and width for SOF
+            segment = infile.read(7)
+            if len(segment) < 7:
+                return None
+            if code in _JPEG_SOF_MARKERS:
+                height, width = struct.unpack(">HH", segment[3:7])
+                return width, height
+            (length,) = struct.unpack(">H", segment[:2])
+            infile.seek(length - 7, 1)
+
+
+def get_reduced_imread_flags(path: str, target_size: Tuple[int, int]) -> int:
+    """Returns the cv2.imread() flags which decode the image at `path` at the
+    smallest size which is still at least `target_size`, so that resizing it
+    afterwards only scales it down. JPEG images are then decoded at 1/2, 1/4
+    or 1/8 of their size directly, which skips most of the decoding work.
+
+    Args:
+        path (str): path of the image
+        target_size (Tuple[int, int]): width and height the image is resized to
+    """
+    size = read_image_size(path)
+    if size is not None:
+        width, height = size
+        target_width, target_height = target_size
+        for factor, flags in _REDUCED_FLAGS:
+            if width // factor >= target_width and height // factor >= target_height:
+                return flags
+    return cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION
+
 
 class VideoThread:
     """
@@ -36,10 +129,16 @@ class VideoThread:
 
     # pylint: disable=too-many-instance-attributes
 
-    def __init__(
-        self, input_source: Union[int, str], mirror_image: bool, buffering: bool
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        input_source: Union[int, str],
+        mirror_image: bool,
+        buffering: bool,
+        buffer_size: int = 0,
+        drop_policy: str = "block",
     ) -> None:
         assert isinstance(input_source, (int, str))
+        self.stream: VideoStream
         if isinstance(input_source, int):
             if platform.system().startswith("Windows"):
                 # to eliminate opencv's "[WARN] terminating async callback" on Windows
@@ -59,10 +158,15 @@ class VideoThread:
         self.is_thread_start = Event()
         # frame storage and buffering
         self.frame_counter = 0
-        self.frame = None
+        self.frame: Any = None
+        # latest frame with its capture time and sequence number, replaced as
+        # a whole by the thread
+        self.latest_frame: Tuple[Any, float, int] = (None, 0.0, 0)
         self.prev_frame = None
+        self.capture_time = 0.0
+        self.frame_seq = 0
         self.buffer = buffering
-        self.queue: queue.Queue = queue.Queue()
+        self.queue = FrameBuffer(buffer_size, drop_policy)
         # start threading
         self.thread = Thread(target=self._reading_thread, args=(), daemon=True)
         self.thread.start()
@@ -82,6 +186,8 @@ class VideoThread:
         """
         self.logger.debug("VideoThread.shutdown")
         self.is_done.set()
+        # release the reading thread if it waits on a full buffer
+        self.queue.close()
         self.thread.join()
 
     def _reading_thread(self) -> None:
@@ -91,6 +197,7 @@ class VideoThread:
         while not self.is_done.is_set():
             if self.stream.isOpened():
                 ret, frame = self.stream.read()
+                frame_time = time.perf_counter()
                 if not ret:
                     self.logger.debug(
                         f"_reading_thread: ret={ret}, "
@@ -101,32 +208,40 @@ class VideoThread:
                     if self.mirror:
                         frame = mirror(frame)
                     self.frame = frame
-                    self.is_thread_start.set()  # thread really started
                     self.frame_counter += 1
+                    self.latest_frame = (frame, frame_time, self.frame_counter)
+                    self.is_thread_start.set()  # thread really started
                     if self.buffer:
-                        self.queue.put(self.frame)
+                        self.queue.put(self.latest_frame)
 
     def read_frame(self) -> Tuple[bool, Any]:
         """
-        Reads the frame.
+        Reads the frame. The time it was captured is available in
+        `capture_time` and its sequence number in `frame_seq`. A frame which
+        is returned again keeps its sequence number.
         """
         # pylint: disable=no-else-return
         if self.buffer:
-            if self.queue.empty():
-                if self.is_done.is_set():
+            # check before taking a frame, the last frame is buffered before
+            # is_done is set
+            is_done = self.is_done.is_set()
+            item = self.queue.get()
+            if item is None:
+                if is_done:
                     # end of input
                     return False, None
                 else:
                     # input slow, so duplicate frame
                     return True, self.prev_frame
             else:
-                self.prev_frame = self.queue.get()
+                self.prev_frame, self.capture_time, self.frame_seq = item
                 return True, self.prev_frame
         else:
             if self.is_done.is_set():
                 return False, None
             else:
-                return True, self.frame
+                frame, self.capture_time, self.frame_seq = self.latest_frame
+                return True, frame
 
     @property
     def fps(self) -> float:
@@ -148,6 +263,24 @@ class VideoThread:
         num_frames = self.stream.get(cv2.CAP_PROP_FRAME_COUNT)
         return int(num_frames)
 
+    @property
+    def high_water_mark(self) -> int:
+        """Get the largest number of frames held by the buffer
+
+        Returns:
+            int: peak buffer size
+        """
+        return self.queue.high_water_mark
+
+    @property
+    def num_dropped(self) -> int:
+        """Get number of frames dropped by the buffer
+
+        Returns:
+            int: number of dropped frames
+        """
+        return self.queue.num_dropped
+
     @property
     def queue_size(self) -> int:
         """Get buffer queue size
@@ -155,7 +288,7 @@ class VideoThread:
         Returns:
             int: number of frames in buffer
         """
-        return self.queue.qsize()
+        return len(self.queue)
 
     @property
     def resolution(self) -> Tuple[int, int]:
@@ -170,19 +303,114 @@ class VideoThread:
         return int(width), int(height)
 
 
+class FrameSelection:
+    """
+    Selects the frames read from a video file: every `stride`-th frame from
+    `start_time` until `end_time`, or only the frames listed in `indices`
+    within that time range. Times are in seconds and are ignored if the FPS
+    of the file is unknown.
+
+    Args:
+        stride (int): Read every this number of frames.
+        start_time (float): Time of the first frame to read.
+        end_time (Optional[float]): Time at which reading stops, until the
+            end of the file if None.
+        indices (Optional[Sequence[int]]): Indices of the frames to read,
+            `stride` is ignored if provided.
+    """
+
+    def __init__(
+        self,
+        stride: int = 1,
+        start_time: float = 0.0,
+        end_time: Optional[float] = None,
+        indices: Optional[Sequence[int]] = None,
+    ) -> None:
+        if stride < 1:
+            raise ValueError(f"frame_stride {stride}: must be a positive integer")
+        if start_time < 0:
+            raise ValueError(f"start_time {start_time}: must be non-negative")
+        if end_time is not None and end_time <= start_time:
+            raise ValueError(f"end_time {end_time}: must be larger than start_time")
+        if indices is not None and any(idx < 0 for idx in indices):
+            raise ValueError("frame_indices must be non-negative")
+        self.stride = stride
+        self.start_time = start_time
+        self.end_time = end_time
+        self.indices: Optional[List[int]] = (
+            None if indices is None else sorted(set(indices))
+        )
+
+    @property
+    def is_all_frames(self) -> bool:
+        """Whether every frame is selected."""
+        return (
+            self.stride == 1
+            and self.start_time == 0
+            and self.end_time is None
+            and self.indices is None
+        )
+
+    def frame_indices(self, fps: float, frame_count: int) -> Iterable[int]:
+        """
+        Returns the indices of the selected frames in increasing order, a
+        `range` or `list` if their number is known.
+
+        Args:
+            fps (float): FPS of the file, 0 if unknown.
+            frame_count (int): number of frames of the file, 0 or less if
+                unknown.
+        """
+        start = int(round(self.start_time * fps)) if fps > 0 else 0
+        end = None
+        if self.end_time is not None and fps > 0:
+            end = int(round(self.end_time * fps))
+        if frame_count > 0:
+            end = frame_count if end is None else min(end, frame_count)
+        if self.indices is not None:
+            return [
+                idx
+                for idx in self.indices
+                if start <= idx and (end is None or idx < end)
+            ]
+        if end is None:
+            return itertools.count(start, self.stride)
+        return range(start, end, self.stride)
+
+
 class VideoNoThread:
     """
     No threading to deal with recorded videos and images.
+    Only the frames chosen by `selection` are read, the skipped frames are
+    passed over by seeking or grabbing without decoding them into images.
+    If `target_size` is given, PNG and JPEG images are decoded at a reduced
+    size which is still at least `target_size`.
     """
 
-    def __init__(self, input_source: Union[int, str], mirror_image: bool) -> None:
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+        self,
+        input_source: Union[int, str],
+        mirror_image: bool,
+        selection: Optional[FrameSelection] = None,
+        target_size: Optional[Tuple[int, int]] = None,
+    ) -> None:
         assert isinstance(input_source, (int, str))
+        self.stream: VideoStream
         if isinstance(input_source, int):
             if platform.system().startswith("Windows"):
                 # to eliminate opencv's "[WARN] terminating async callback" on Windows
                 self.stream = cv2.VideoCapture(input_source, cv2.CAP_DSHOW)
             else:
                 self.stream = cv2.VideoCapture(input_source)
+        elif (
+            target_size is not None
+            and Path(input_source.lower()).suffix in REDUCIBLE_EXTENSIONS
+        ):
+            self.stream = PNGReader(
+                input_source, get_reduced_imread_flags(input_source, target_size)
+            )
         elif Path(input_source.lower()).suffix == ".png":
             self.stream = PNGReader(input_source)
         else:
@@ -190,8 +418,23 @@ class VideoNoThread:
         if not self.stream.isOpened():
             raise ValueError(f"Video or image path incorrect: {input_source}")
         self._frame_counter = 0
+        self._read_ahead: Optional[Tuple[bool, Any]] = None
+        self.capture_time = 0.0
+        self.frame_seq = 0
         self.logger = logging.getLogger(type(self).__name__)
         self.mirror = mirror_image
+        # index of the frame returned by the next stream.read()
+        self._next_index = 0
+        self._num_selected: Optional[int] = None
+        self._selected: Optional[Iterator[int]] = None
+        if selection is not None and not selection.is_all_frames:
+            indices = selection.frame_indices(
+                self.stream.get(cv2.CAP_PROP_FPS),
+                int(self.stream.get(cv2.CAP_PROP_FRAME_COUNT)),
+            )
+            if isinstance(indices, (list, range)):
+                self._num_selected = len(indices)
+            self._selected = iter(indices)
 
     def __del__(self) -> None:
         # Note: self.logger.debug below crashes on Nvidia Jetson Xavier Ubuntu 18.04 python 3.6
@@ -201,17 +444,54 @@ class VideoNoThread:
 
     def read_frame(self) -> Tuple[bool, Any]:
         """
-        Reads the frame.
+        Reads the frame. The time it was captured is available in
+        `capture_time` and its sequence number in `frame_seq`.
         """
-        ret, frame = self.stream.read()
+        if self._read_ahead is None:
+            ret, frame = self._read()
+        else:
+            (ret, frame), self._read_ahead = self._read_ahead, None
+        self.capture_time = time.perf_counter()
         if not ret:
             self.logger.debug(
                 f"read_frame: ret={ret}, #frames read={self._frame_counter}"
             )
         else:
             self._frame_counter += 1
+            self.frame_seq = self._frame_counter
         return ret, frame
 
+    def read_ahead(self) -> None:
+        """
+        Decodes the next frame now, so that the next `read_frame()` call
+        returns it without waiting for the decoder. Its capture time is the
+        time it is returned by `read_frame()`.
+        """
+        if self._read_ahead is None:
+            self._read_ahead = self._read()
+
+    def _read(self) -> Tuple[bool, Any]:
+        """
+        Reads the next selected frame, seeking to it if many frames are
+        skipped and the stream supports seeking, otherwise grabbing the
+        skipped frames.
+        """
+        if self._selected is None:
+            return self.stream.read()
+        target = next(self._selected, None)
+        if target is None:
+            return False, None
+        num_skipped = target - self._next_index
+        if not (
+            num_skipped >= MIN_SEEK_FRAMES
+            and self.stream.set(cv2.CAP_PROP_POS_FRAMES, target)
+        ):
+            for _ in range(num_skipped):
+                if not self.stream.grab():
+                    return False, None
+        self._next_index = target + 1
+        return self.stream.read()
+
     # pylint: disable=R0201
     def shutdown(self) -> None:
         """
@@ -233,14 +513,34 @@ class VideoNoThread:
 
     @property
     def frame_count(self) -> int:
-        """Get total number of frames of file
+        """Get total number of frames to be read from file
 
         Returns:
             int: number indicating frame count
         """
+        if self._selected is not None:
+            return self._num_selected if self._num_selected is not None else 0
         num_frames = self.stream.get(cv2.CAP_PROP_FRAME_COUNT)
         return int(num_frames)
 
+    @property
+    def high_water_mark(self) -> int:
+        """Get the largest number of frames held by the buffer
+
+        Returns:
+            int: always 0 as there is no buffer
+        """
+        return 0
+
+    @property
+    def num_dropped(self) -> int:
+        """Get number of frames dropped by the buffer
+
+        Returns:
+            int: always 0 as there is no buffer
+        """
+        return 0
+
     @property
     def queue_size(self) -> int:
         """Get buffer queue size
@@ -261,3 +561,80 @@ class VideoNoThread:
         width = self.stream.get(cv2.CAP_PROP_FRAME_WIDTH)
         height = self.stream.get(cv2.CAP_PROP_FRAME_HEIGHT)
         return int(width), int(height)
+
+
+class FilePrefetcher:
+    """
+    Opens files and decodes their first frame ahead of time in a thread pool,
+    so that moving on to the next file of a directory does not stall on
+    probing the container and decoding. For a directory of images, this
+    decodes the upcoming images while the current one is being processed.
+
+    Args:
+        mirror_image (bool): Flag passed to the opened `VideoNoThread`.
+        depth (int): Maximum number of files opened ahead.
+        selection (Optional[FrameSelection]): Frames to read from every file.
+        target_size (Optional[Tuple[int, int]]): Size the frames are resized
+            to, passed to the opened `VideoNoThread`.
+    """
+
+    def __init__(
+        self,
+        mirror_image: bool,
+        depth: int,
+        selection: Optional[FrameSelection] = None,
+        target_size: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        if depth <= 0:
+            raise ValueError("depth must be a positive integer")
+        self.mirror = mirror_image
+        self.selection = selection
+        self.target_size = target_size
+        self.depth = depth
+        self.logger = logging.getLogger(type(self).__name__)
+        self._executor = ThreadPoolExecutor(max_workers=depth)
+        # files being opened, in the order they will be requested
+        self._futures: Dict[str, Future] = {}
+
+    def schedule(self, input_sources: Iterable[str]) -> None:
+        """
+        Starts opening `input_sources` in order, until `depth` files are
+        opened ahead. Only as many sources as needed are taken from the
+        iterable.
+        """
+        for input_source in input_sources:
+            if len(self._futures) >= self.depth:
+                break
+            if input_source not in self._futures:
+                self._futures[input_source] = self._executor.submit(
+                    self._open, input_source
+                )
+
+    def open(self, input_source: str) -> VideoNoThread:
+        """
+        Returns the reader of `input_source`, waiting for it if it is being
+        opened ahead or opening it now otherwise. Errors raised while opening
+        the file are raised here.
+        """
+        future = self._futures.pop(input_source, None)
+        if future is None:
+            return self._open(input_source)
+        return future.result()
+
+    def shutdown(self) -> None:
+        """
+        Cancels the files which have not started opening and waits for the
+        others, which are then released.
+        """
+        self.logger.debug("FilePrefetcher.shutdown")
+        for future in self._futures.values():
+            future.cancel()
+        self._executor.shutdown(wait=True)
+        self._futures.clear()
+
+    def _open(self, input_source: str) -> VideoNoThread:
+        reader = VideoNoThread(
+            input_source, self.mirror, self.selection, self.target_size
+        )
+        reader.read_ahead()
+        return reader
@@ -24,8 +24,17 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
 from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+from peekingduck.pipeline.nodes.input.utils.file_scanner import (
+    FileScanner,
+    PeekableIterator,
+)
 from peekingduck.pipeline.nodes.input.utils.preprocess import resize_image
-from peekingduck.pipeline.nodes.input.utils.read import VideoNoThread, VideoThread
+from peekingduck.pipeline.nodes.input.utils.read import (
+    FilePrefetcher,
+    FrameSelection,
+    VideoNoThread,
+    VideoThread,
+)
 
 
 class SourceType:  # pylint: disable=too-few-public-methods
@@ -52,18 +61,57 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
 
         |saved_video_fps_data|
 
+        |capture_time_data|
+
+        |frame_seq_data|
+
     Configs:
+        end_time (:obj:`Optional[float]`): **default = null**. |br|
+            Time in seconds at which reading of every video file stops. Reads
+            until the end of the file if null. Ignored if threading is True.
+        file_pattern (:obj:`Optional[str]`): **default = null**. |br|
+            If source is a directory, only processes the files whose names
+            match this glob pattern, e.g., "\*.jpg".
         filename (:obj:`str`): **default = "video.mp4"**. |br|
             If source is a live stream/webcam, filename defines the name of the
             MP4 file if the media is exported. |br|
             If source is a local file or directory of files, then filename is
             the current file being processed, and the value specified here is
             overridden.
+        frame_indices (:obj:`Optional[List[int]]`): **default = null**. [1]_ |br|
+            Indices of the frames to read from every video file, counted from
+            0. Overrides ``frame_stride`` if provided. Ignored if threading is
+            True.
+        frame_stride (:obj:`int`): **default = 1**. |br|
+            Reads every this number of frames of a video file, e.g., 30 to
+            sample one frame per second of a 30 FPS video. The skipped frames
+            are not decoded into images, and long stretches of them are
+            skipped by seeking where the video container supports it. Ignored
+            if threading is True.
         mirror_image (:obj:`bool`): **default = False**. |br|
             Flag to set extracted image frame as mirror image of input stream.
+        num_shards (:obj:`int`): **default = 1**. [1]_ |br|
+            If source is a directory, splits its sorted files into this number
+            of contiguous shards and only processes the shard selected by
+            ``shard_index``. Used to process a directory with several
+            pipelines in parallel.
+        prefetch (:obj:`int`): **default = 0**. [1]_ |br|
+            If source is a directory, the number of upcoming files which are
+            opened and have their first frame decoded in background threads
+            while the current file is being processed. Speeds up directories
+            of many images, where reading and decoding would otherwise stall
+            every frame. Set to 0 to disable. Ignored if threading is True.
+        recursive (:obj:`bool`): **default = False**. |br|
+            If source is a directory, also processes the files in its
+            subdirectories. The files of a directory are processed in sorted
+            order, followed by those of its subdirectories. |br|
+            Directories are enumerated while they are processed, so that
+            processing starts without listing every file first.
         resize (:obj:`Dict[str, Any]`):
             **default = { do_resizing: False, width: 1280, height: 720 }** |br|
-            Dimension of extracted image frame.
+            Dimension of extracted image frame. When resizing, JPEG images
+            which are at least twice as large are decoded directly at 1/2, 1/4
+            or 1/8 of their size, unless threading is True.
         source (:obj:`Union[int, str]`):
             **default = https://storage.googleapis.com/peekingduck/videos/wave.mp4**. |br|
             Input source can be: |br|
@@ -75,6 +123,9 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
             Refer to `OpenCV documentation
             <https://docs.opencv.org/4.5.5/d8/dfe/classcv_1_1VideoCapture.html>`_
             for more technical information.
+        start_time (:obj:`float`): **default = 0**. |br|
+            Time in seconds of the first frame read from every video file.
+            Ignored if threading is True.
 
         frames_log_freq (:obj:`int`): **default = 100**. [#]_ |br|
             Logs frequency of frames passed in CLI
@@ -90,6 +141,9 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
             the output file.  It is recommended to set this to the actual FPS
             obtained on the machine running PeekingDuck
             (using :mod:`dabble.fps`).
+        shard_index (:obj:`int`): **[0, num_shards), default = 0**. [1]_ |br|
+            Index of the shard of the directory to process, see
+            ``num_shards``.
         threading (:obj:`bool`): **default = False**. [1]_ |br|
             Flag to enable threading when reading frames from camera / live
             stream. The FPS can increase up to 30%. |br|
@@ -102,6 +156,18 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
             One side effect of setting threading=True, buffering=True for a
             live stream/webcam is the onscreen video could appear to be playing
             in slow-mo.
+        buffer_size (:obj:`int`): **default = 0**. [1]_ |br|
+            Maximum number of image frames buffered when threading and
+            buffering are True. Set to 0 for an unbounded buffer, which can
+            run out of memory if the source is faster than PeekingDuck.
+        drop_policy (:obj:`str`):
+            **{"block", "drop_oldest", "drop_newest", "latest"},
+            default = "block"**. [1]_ |br|
+            What happens to a new frame when the buffer is full: "block" waits
+            for space so no frames are lost, "drop_oldest" discards the oldest
+            buffered frame, "drop_newest" discards the new frame, and "latest"
+            only keeps the newest frame. The number of dropped frames and the
+            peak buffer size are shown in the progress logs.
 
     .. [#] advanced configuration
 
@@ -157,14 +223,31 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
         self._allowed_extensions = self._image_ext + self._video_ext
         self._fps: float = 0  # self._fps > 0 if file playback
         self._file_name: str = ""
-        self._filepaths: List[Path] = []
+        self._filepaths: PeekableIterator[Path] = PeekableIterator([])
+        self._num_files: Optional[int] = None
         self.do_resize: bool = self.resize["do_resizing"]
+        self._target_size = (
+            (self.resize["width"], self.resize["height"]) if self.do_resize else None
+        )
         self.frame_counter: int = 0
+        # frame_seq of the last frame, and of the frame before the current input
+        self._frame_seq: int = 0
+        self._frame_seq_base: int = 0
         self.total_frame_count: int = 0
         self.has_multiple_inputs: bool = False
         self.progress: int = 0
         self.videocap: Optional[Union[VideoNoThread, VideoThread]] = None
+        self._prefetcher: Optional[FilePrefetcher] = None
         self._determine_source_type()
+        self._selection = FrameSelection(
+            self.frame_stride, self.start_time, self.end_time, self.frame_indices
+        )
+        if self.prefetch < 0:
+            raise ValueError(f"prefetch {self.prefetch}: must be non-negative")
+        if self.has_multiple_inputs and self.prefetch > 0 and not self.threading:
+            self._prefetcher = FilePrefetcher(
+                self.mirror_image, self.prefetch, self._selection, self._target_size
+            )
         # error checking for user-defined output filename
         if not self._is_valid_file_type(Path(self.filename)):
             raise ValueError(
@@ -176,13 +259,15 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
         """Override base class method to free video resource"""
         if self.videocap:
             self.videocap.shutdown()
+        if self._prefetcher:
+            self._prefetcher.shutdown()
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         outputs = self._get_next_frame()
         if self.file_end and self.has_multiple_inputs:
             self.logger.info(
                 f"Completed processing file: {self._file_name}"
-                f" ({self._curr_file_num} / {self._num_files})"
+                f" ({self._file_position()})"
             )
             self.logger.debug(f"#frames={self.frame_counter}, done={self.progress}%")
             self._open_next_input()
@@ -213,7 +298,6 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
                 self._source_type = SourceType.DIRECTORY
                 self._get_files(Path(self.source))
                 self.has_multiple_inputs = True
-                self._num_files = len(self._filepaths)
                 self._curr_file_num = 0
             else:
                 self._source_type = SourceType.FILE
@@ -222,21 +306,42 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
     def _get_config_types(self) -> Dict[str, Any]:
         """Returns dictionary mapping the node's config keys to respective types."""
         return {
+            "buffer_size": int,
             "buffering": bool,
+            "drop_policy": str,
+            "end_time": Optional[Union[float, int]],
+            "file_pattern": Optional[str],
             "filename": str,
+            "frame_indices": Optional[List[int]],
+            "frame_stride": int,
             "frames_log_freq": int,
             "mirror_image": bool,
+            "num_shards": int,
+            "prefetch": int,
+            "recursive": bool,
             "resize": Dict[str, Union[bool, int]],
             "resize.do_resizing": bool,
             "resize.height": int,
             "resize.width": int,
             "saved_video_fps": int,
+            "shard_index": int,
             "source": Union[int, str],
+            "start_time": Union[float, int],
             "threading": bool,
         }
 
+    def _file_position(self) -> str:
+        """Returns the number of the current file, out of the number of files
+        if it is known.
+        """
+        if self._num_files is None:
+            return str(self._curr_file_num)
+        return f"{self._curr_file_num} / {self._num_files}"
+
     def _get_files(self, path: Path) -> None:
-        """Read all files in given directory (non-recursive)
+        """Enumerate the files in given directory, lazily and in sorted order,
+        see :class:`FileScanner`. Files are only listed up front if the
+        directory is sharded.
 
         Args:
             path (Path): the directory path
@@ -248,8 +353,14 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
             raise FileNotFoundError("Filepath does not exist")
 
         self.logger.info(f"Directory: {path}")
-        self._filepaths = list(path.iterdir())
-        self._filepaths.sort()
+        scanner = FileScanner(path, self.recursive, self.file_pattern)
+        self._num_files = scanner.num_files
+        if self.num_shards > 1:
+            filepaths = self._select_shard(list(scanner))
+            self._num_files = len(filepaths)
+            self._filepaths = PeekableIterator(filepaths)
+        else:
+            self._filepaths = PeekableIterator(scanner)
 
     def _get_next_frame(self) -> Dict[str, Any]:
         """Read next frame from current input file/source"""
@@ -261,6 +372,8 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
             "saved_video_fps": self._fps
             if (0 < self._fps <= 200)
             else self.saved_video_fps,
+            "capture_time": None,
+            "frame_seq": None,
         }
         if self.videocap:
             success, img = self.videocap.read_frame()
@@ -270,6 +383,9 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
                     img = resize_image(img, self.resize["width"], self.resize["height"])
                 outputs["img"] = img
                 outputs["pipeline_end"] = False
+                outputs["capture_time"] = self.videocap.capture_time
+                self._frame_seq = self._frame_seq_base + self.videocap.frame_seq
+                outputs["frame_seq"] = self._frame_seq
                 self._show_progress()
             else:
                 self.logger.debug("No video frames available for processing.")
@@ -297,12 +413,28 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
                                 - CCTV or webcam live feed
         """
         if self.threading:
-            self.videocap = VideoThread(self.source, self.mirror_image, self.buffering)
+            self.videocap = VideoThread(
+                self.source,
+                self.mirror_image,
+                self.buffering,
+                self.buffer_size,
+                self.drop_policy,
+            )
+        elif self._prefetcher:
+            self.videocap = self._prefetcher.open(input_source)
+            self._prefetcher.schedule(
+                str(path)
+                for path in self._filepaths.upcoming()
+                if self._is_valid_file_type(path)
+            )
         else:
-            self.videocap = VideoNoThread(input_source, self.mirror_image)
+            self.videocap = VideoNoThread(
+                input_source, self.mirror_image, self._selection, self._target_size
+            )
         self._fps = self.videocap.fps
         self.total_frame_count = max(0, self.videocap.frame_count)
         self.frame_counter = 0  # reset for newly opened input
+        self._frame_seq_base = self._frame_seq
         self._progress_tenth: int = 1  # each 10% progress
         # check resizing configuration
         width, height = self.videocap.resolution
@@ -315,7 +447,7 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
     def _open_next_file(self) -> None:
         """Load next file in a directory of files"""
         while self._filepaths:
-            file_path = self._filepaths.pop(0)
+            file_path = next(self._filepaths)
             self._file_name = file_path.name
             self._curr_file_num += 1
             if self._is_valid_file_type(file_path):
@@ -324,7 +456,7 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
             self.logger.warning(
                 f"Skipping '{file_path}' as it is not an accepted "
                 f"file format {str(self._allowed_extensions)}"
-                f" ({self._curr_file_num} / {self._num_files})"
+                f" ({self._file_position()})"
             )
 
     def _open_next_input(self) -> None:
@@ -334,12 +466,41 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
         else:
             self._open_input(self.source)
 
+    def _select_shard(self, filepaths: List[Path]) -> List[Path]:
+        """Selects the contiguous shard of `filepaths` indicated by
+        `shard_index`, so that concatenating the outputs of all shards in
+        order gives the same order as processing the whole directory.
+
+        Args:
+            filepaths (List[Path]): sorted paths of all files in the directory
+
+        Returns:
+            List[Path]: the paths of the files in this shard
+
+        Raises:
+            ValueError: `shard_index` is not in [0, `num_shards`)
+        """
+        if not 0 <= self.shard_index < self.num_shards:
+            raise ValueError(
+                f"shard_index {self.shard_index}: must be in [0, {self.num_shards})"
+            )
+        num_files = len(filepaths)
+        start = num_files * self.shard_index // self.num_shards
+        end = num_files * (self.shard_index + 1) // self.num_shards
+        self.logger.info(
+            f"Shard {self.shard_index + 1} / {self.num_shards}: "
+            f"{end - start} of {num_files} files"
+        )
+        return filepaths[start:end]
+
     def _show_progress(self) -> None:
         """Show progress information during pipeline iteration"""
         self.frame_counter += 1
         if self.frame_counter % self.frames_log_freq == 0 and self.videocap:
             buffer_info = (
                 f", buffer: {self.videocap.queue_size}"
+                f" (peak: {self.videocap.high_water_mark},"
+                f" dropped: {self.videocap.num_dropped})"
                 if self.threading and self.buffering
                 else ""
             )
@@ -58,6 +58,13 @@ class Node(AbstractNode):
             to preserve its aspect ratio. In general, decreasing the width of
             an image will improve inference speed. However, this might impact
             the accuracy of the model.
+        warmup_background (:obj:`bool`): **default = False**. |br|
+            Runs the warm-up in a background thread while the rest of the
+            pipeline is initialized. The first frame waits for it to finish.
+        warmup_iterations (:obj:`int`): **default = 0**. |br|
+            Number of inference passes on a dummy frame of the model's input
+            size when the node is initialized, so that the first real frame
+            is processed at steady-state latency.
 
     References:
         CSRNet: Dilated Convolutional Neural Networks for Understanding the
@@ -69,9 +76,12 @@ class Node(AbstractNode):
         Inference code adapted from https://github.com/Neerajj9/CSRNet-keras
     """
 
+    is_stateless = True
+
     def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
         super().__init__(config, node_path=__name__, **kwargs)
         self.model = csrnet_model.CSRNetModel(self.config)
+        self.warm_up(self.config["width"], self.config["width"] * 9 // 16)
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Reads in image frames and returns the density map and crowd count.
@@ -83,6 +93,7 @@ class Node(AbstractNode):
             outputs (dict): csrnet output in dictionary format with keys
             "density_map" and "count".
         """
+        self.wait_for_warm_up()
         image = cv2.cvtColor(inputs["img"], cv2.COLOR_BGR2RGB)
         density_map, crowd_count = self.model.predict(image)
         outputs = {"density_map": density_map, "count": crowd_count}
@@ -90,4 +101,10 @@ class Node(AbstractNode):
 
     def _get_config_types(self) -> Dict[str, Any]:
         """Returns dictionary mapping the node's config keys to respective types."""
-        return {"model_type": str, "weights_parent_dir": Optional[str], "width": int}
+        return {
+            "model_type": str,
+            "warmup_background": bool,
+            "warmup_iterations": int,
+            "weights_parent_dir": Optional[str],
+            "width": int,
+        }
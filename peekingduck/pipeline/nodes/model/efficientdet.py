@@ -59,6 +59,13 @@ class Node(AbstractNode):
         weights_parent_dir (:obj:`Optional[str]`): **default = null**. |br|
             Change the parent directory where weights will be stored by
             replacing ``null`` with an absolute path to the desired directory.
+        warmup_background (:obj:`bool`): **default = False**. |br|
+            Runs the warm-up in a background thread while the rest of the
+            pipeline is initialized. The first frame waits for it to finish.
+        warmup_iterations (:obj:`int`): **default = 0**. |br|
+            Number of inference passes on a dummy frame of the model's input
+            size when the node is initialized, so that the first real frame
+            is processed at steady-state latency.
 
     References:
         EfficientDet: Scalable and Efficient Object Detection:
@@ -67,14 +74,19 @@ class Node(AbstractNode):
         Code adapted from https://github.com/xuannianz/EfficientDet.
     """
 
+    is_stateless = True
+
     def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
         super().__init__(config, node_path=__name__, **kwargs)
         self.model = efficientdet_model.EfficientDetModel(self.config)
+        size = self.config["image_size"][self.config["model_type"]]
+        self.warm_up(size, size)
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Takes an image as input and returns bboxes of objects specified
         in config.
         """
+        self.wait_for_warm_up()
         image = cv2.cvtColor(inputs["img"], cv2.COLOR_BGR2RGB)
         bboxes, labels, scores = self.model.predict(image)
         bboxes = np.clip(bboxes, 0, 1)
@@ -82,11 +94,30 @@ class Node(AbstractNode):
         outputs = {"bboxes": bboxes, "bbox_labels": labels, "bbox_scores": scores}
         return outputs
 
+    def run_batch(self, inputs_batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Takes the images of a batch of frames as input and returns bboxes
+        of objects specified in config, inferring all images in a single call.
+        """
+        self.wait_for_warm_up()
+        images = [
+            cv2.cvtColor(inputs["img"], cv2.COLOR_BGR2RGB) for inputs in inputs_batch
+        ]
+        return [
+            {
+                "bboxes": np.clip(bboxes, 0, 1),
+                "bbox_labels": labels,
+                "bbox_scores": scores,
+            }
+            for bboxes, labels, scores in self.model.predict_batch(images)
+        ]
+
     def _get_config_types(self) -> Dict[str, Any]:
         """Returns dictionary mapping the node's config keys to respective types."""
         return {
             "detect": List[Union[int, str]],
             "model_type": int,
             "score_threshold": float,
+            "warmup_background": bool,
+            "warmup_iterations": int,
             "weights_parent_dir": Optional[str],
         }
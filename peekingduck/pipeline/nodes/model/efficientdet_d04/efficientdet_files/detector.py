@@ -89,6 +89,34 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
 
         return boxes, labels, scores
 
+    def predict_object_bboxes_from_images(
+        self, images: List[np.ndarray]
+    ) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Efficientdet bbox prediction function for a batch of images,
+        which are inferred in a single call
+
+        Args:
+            images (List[np.ndarray]): images in numpy array
+
+        Returns:
+            (List[Tuple[np.ndarray, np.ndarray, np.ndarray]]): the detected
+                bboxes, labels and scores of each image
+        """
+        img_shapes = [image.shape[:2] for image in images]
+        preprocessed = [self._preprocess(image) for image in images]
+
+        # run network
+        graph_input = tf.convert_to_tensor(
+            np.stack([image for image, _ in preprocessed]), dtype=tf.float32
+        )
+        boxes, scores, labels = self.efficient_det(x=graph_input)
+        boxes, scores, labels = boxes.numpy(), scores.numpy(), labels.numpy()
+
+        return [
+            self._postprocess((boxes[i], scores[i], labels[i]), scale, img_shape)
+            for i, ((_, scale), img_shape) in enumerate(zip(preprocessed, img_shapes))
+        ]
+
     def _create_efficient_det_model(self) -> tf.keras.Model:
         model = load_graph(
             str(self.model_path),
@@ -91,3 +91,20 @@ class EfficientDetModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
 
         # returns object_bboxes, object_labels, object_scores
         return self.detector.predict_object_bbox_from_image(image)
+
+    def predict_batch(
+        self, images: List[np.ndarray]
+    ) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """predict the bboxes from a batch of frames
+
+        Args:
+            images (List[np.ndarray]): Input image frames.
+
+        Returns:
+            (List[Tuple[np.ndarray, np.ndarray, np.ndarray]]): The bboxes,
+            labels and confidence scores of the objects detected in each frame.
+        """
+        if not all(isinstance(image, np.ndarray) for image in images):
+            raise TypeError("image must be a np.ndarray")
+
+        return self.detector.predict_object_bboxes_from_images(images)
@@ -57,20 +57,31 @@ class Node(AbstractNode):
             Resolution of input array to HRNet model.
         score_threshold (:obj:`float`): **[0, 1], default = 0.1**. |br|
             Threshold to determine if detection should be returned
+        warmup_background (:obj:`bool`): **default = False**. |br|
+            Runs the warm-up in a background thread while the rest of the
+            pipeline is initialized. The first frame waits for it to finish.
+        warmup_iterations (:obj:`int`): **default = 0**. |br|
+            Number of inference passes on a dummy frame of the model's input
+            size when the node is initialized, so that the first real frame
+            is processed at steady-state latency.
 
     References:
         Deep High-Resolution Representation Learning for Visual Recognition:
         https://arxiv.org/abs/1908.07919
     """
 
+    is_stateless = True
+
     def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
         super().__init__(config, node_path=__name__, **kwargs)
         self.model = hrnet_model.HRNetModel(self.config)
+        self.warm_up(**self.config["resolution"])
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Reads the bbox input and returns the poses and pose bbox of the
         specified objects chosen to be detected.
         """
+        self.wait_for_warm_up()
         keypoints, keypoint_scores, keypoint_conns = self.model.predict(
             inputs["img"], inputs["bboxes"]
         )
@@ -89,5 +100,7 @@ class Node(AbstractNode):
             "resolution.height": int,
             "resolution.width": int,
             "score_threshold": float,
+            "warmup_background": bool,
+            "warmup_iterations": int,
             "weights_parent_dir": Optional[str],
         }
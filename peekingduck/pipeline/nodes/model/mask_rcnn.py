@@ -66,6 +66,13 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
         mask_threshold (:obj:`float`): **[0, 1], default = 0.5**. |br|
             The confidence threshold for binarizing the masks' pixel values; determines whether an
             object is detected at a particular pixel.
+        warmup_background (:obj:`bool`): **default = False**. |br|
+            Runs the warm-up in a background thread while the rest of the
+            pipeline is initialized. The first frame waits for it to finish.
+        warmup_iterations (:obj:`int`): **default = 0**. |br|
+            Number of inference passes on a dummy frame of the model's input
+            size when the node is initialized, so that the first real frame
+            is processed at steady-state latency.
 
     References:
         Mask R-CNN: A conceptually simple, flexible, and general framework for object
@@ -79,9 +86,12 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
         https://download.pytorch.org/models/maskrcnn_resnet50_fpn_coco-bf2d0c1e.pth
     """
 
+    is_stateless = True
+
     def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
         super().__init__(config, node_path=__name__, **kwargs)
         self.model = mask_rcnn_model.MaskRCNNModel(self.config)
+        self.warm_up(self.config["max_size"], self.config["min_size"])
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Reads `img` from `inputs` and return the bboxes and masks of the detect
@@ -97,6 +107,7 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
             (Dict): Outputs dictionary with the keys `bboxes`, `bbox_labels`,
                 `bbox_scores` and `masks`.
         """
+        self.wait_for_warm_up()
         bboxes, labels, scores, masks = self.model.predict(inputs["img"])
 
         outputs = {
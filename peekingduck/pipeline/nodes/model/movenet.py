@@ -70,11 +70,21 @@ class Node(AbstractNode):
         keypoint_score_threshold (:obj:`float`): **[0,1], default = 0.3** |br|
             Detected keypoints confidence score threshold, only keypoints above
             threshold will be kept in output.
+        warmup_background (:obj:`bool`): **default = False**. |br|
+            Runs the warm-up in a background thread while the rest of the
+            pipeline is initialized. The first frame waits for it to finish.
+        warmup_iterations (:obj:`int`): **default = 0**. |br|
+            Number of inference passes on a dummy frame of the model's input
+            size when the node is initialized, so that the first real frame
+            is processed at steady-state latency.
     """
 
+    is_stateless = True
+
     def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
         super().__init__(config, node_path=__name__, **kwargs)
         self.model = movenet_model.MoveNetModel(self.config)
+        self.warm_up(**self.config["resolution"][self.config["model_type"]])
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Function that reads the image input and returns the bboxes,
@@ -89,6 +99,7 @@ class Node(AbstractNode):
             "bboxes", "keypoints", "keypoint_scores", "keypoint_conns", and
             "bbox_labels".
         """
+        self.wait_for_warm_up()
         image = cv2.cvtColor(inputs["img"], cv2.COLOR_BGR2RGB)
         bboxes, keypoints, keypoint_scores, keypoint_conns = self.model.predict(image)
         bbox_labels = np.array(["person"] * len(bboxes))
@@ -109,5 +120,7 @@ class Node(AbstractNode):
             "keypoint_score_threshold": float,
             "model_format": str,
             "model_type": str,
+            "warmup_background": bool,
+            "warmup_iterations": int,
             "weights_parent_dir": Optional[str],
         }
@@ -62,6 +62,13 @@ class Node(AbstractNode):
         score_threshold (:obj:`float`): **[0, 1], default = 0.7**. |br|
             Bounding boxes with confidence scores less than the specified
             threshold in the final output are discarded.
+        warmup_background (:obj:`bool`): **default = False**. |br|
+            Runs the warm-up in a background thread while the rest of the
+            pipeline is initialized. The first frame waits for it to finish.
+        warmup_iterations (:obj:`int`): **default = 0**. |br|
+            Number of inference passes on a dummy frame of the model's input
+            size when the node is initialized, so that the first real frame
+            is processed at steady-state latency.
 
     References:
         Joint Face Detection and Alignment using Multi-task Cascaded
@@ -77,9 +84,13 @@ class Node(AbstractNode):
         ``mtcnn_score`` is renamed to ``score_threshold``.
     """
 
+    is_stateless = True
+
     def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
         super().__init__(config, node_path=__name__, **kwargs)
         self.model = mtcnn_model.MTCNNModel(self.config)
+        # MTCNN has no fixed input size, warm up on a 720p frame
+        self.warm_up(1280, 720)
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Reads the image input and returns the bboxes, scores and labels of
@@ -92,6 +103,7 @@ class Node(AbstractNode):
             outputs (dict): Outputs in dictionary format with keys "bboxes",
             "bbox_scores", and "bbox_labels".
         """
+        self.wait_for_warm_up()
         bboxes, bbox_scores, _ = self.model.predict(inputs["img"])
         bbox_labels = np.array(["face"] * len(bboxes))
         bboxes = np.clip(bboxes, 0, 1)
@@ -109,5 +121,7 @@ class Node(AbstractNode):
             "network_thresholds": List[float],
             "scale_factor": float,
             "score_threshold": float,
+            "warmup_background": bool,
+            "warmup_iterations": int,
             "weights_parent_dir": Optional[str],
         }
@@ -59,6 +59,13 @@ class Node(AbstractNode):
         score_threshold (:obj:`float`): **[0, 1], default = 0.4**. |br|
             Detected keypoints confidence score threshold, only keypoints above
             threshold will be kept in output.
+        warmup_background (:obj:`bool`): **default = False**. |br|
+            Runs the warm-up in a background thread while the rest of the
+            pipeline is initialized. The first frame waits for it to finish.
+        warmup_iterations (:obj:`int`): **default = 0**. |br|
+            Number of inference passes on a dummy frame of the model's input
+            size when the node is initialized, so that the first real frame
+            is processed at steady-state latency.
 
     References:
         PersonLab: Person Pose Estimation and Instance Segmentation with a
@@ -68,14 +75,18 @@ class Node(AbstractNode):
         Code adapted from https://github.com/rwightman/posenet-python
     """
 
+    is_stateless = True
+
     def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
         super().__init__(config, node_path=__name__, **kwargs)
         self.model = posenet_model.PoseNetModel(self.config)
+        self.warm_up(**self.config["resolution"])
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Reads the image input and returns the bboxes of the specified
         objects chosen to be detected.
         """
+        self.wait_for_warm_up()
         bboxes, keypoints, keypoint_scores, keypoint_conns = self.model.predict(
             inputs["img"]
         )
@@ -100,5 +111,7 @@ class Node(AbstractNode):
             "resolution.height": int,
             "resolution.width": int,
             "score_threshold": float,
+            "warmup_background": bool,
+            "warmup_iterations": int,
             "weights_parent_dir": Optional[str],
         }
@@ -58,6 +58,13 @@ class Node(AbstractNode):
         score_threshold (:obj:`float`): **[0, 1], default = 0.2**. |br|
             Bounding boxes with confidence score (product of objectness score
             and classification score) below the threshold will be discarded.
+        warmup_background (:obj:`bool`): **default = False**. |br|
+            Runs the warm-up in a background thread while the rest of the
+            pipeline is initialized. The first frame waits for it to finish.
+        warmup_iterations (:obj:`int`): **default = 0**. |br|
+            Number of inference passes on a dummy frame of the model's input
+            size when the node is initialized, so that the first real frame
+            is processed at steady-state latency.
 
 
     References:
@@ -68,9 +75,12 @@ class Node(AbstractNode):
         https://github.com/haotian-liu/yolact_edge
     """
 
+    is_stateless = True
+
     def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
         super().__init__(config, node_path=__name__, **kwargs)
         self.model = yolact_edge_model.YolactEdgeModel(self.config)
+        self.warm_up(self.config["input_size"], self.config["input_size"])
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Reads `img` from `inputs` and return the bboxes and masks of the detected
@@ -86,6 +96,7 @@ class Node(AbstractNode):
             (Dict): Outputs dictionary with the keys `bboxes`, `bbox_labels`,
                 `bbox_scores` and `masks`.
         """
+        self.wait_for_warm_up()
         bboxes, labels, scores, masks = self.model.predict(inputs["img"])
 
         outputs = {
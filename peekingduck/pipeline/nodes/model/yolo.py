@@ -61,6 +61,13 @@ class Node(AbstractNode):
         score_threshold (:obj:`float`): **[0, 1], default = 0.2**. |br|
             Bounding box with confidence score less than the specified
             confidence score threshold is discarded.
+        warmup_background (:obj:`bool`): **default = False**. |br|
+            Runs the warm-up in a background thread while the rest of the
+            pipeline is initialized. The first frame waits for it to finish.
+        warmup_iterations (:obj:`int`): **default = 0**. |br|
+            Number of inference passes on a dummy frame of the model's input
+            size when the node is initialized, so that the first real frame
+            is processed at steady-state latency.
 
     References:
         YOLOv4: Optimal Speed and Accuracy of Object Detection:
@@ -76,9 +83,12 @@ class Node(AbstractNode):
         ``yolo_score_threshold`` is renamed to ``score_threshold``.
     """
 
+    is_stateless = True
+
     def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
         super().__init__(config, node_path=__name__, **kwargs)
         self.model = yolo_model.YOLOModel(self.config)
+        self.warm_up(self.config["input_size"], self.config["input_size"])
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Reads the image input and returns the bboxes of the specified
@@ -91,6 +101,7 @@ class Node(AbstractNode):
             outputs (dict): bbox output in dictionary format with keys
             "bboxes", "bbox_labels", and "bbox_scores".
         """
+        self.wait_for_warm_up()
         image = cv2.cvtColor(inputs["img"], cv2.COLOR_BGR2RGB)
         bboxes, labels, scores = self.model.predict(image)
         bboxes = np.clip(bboxes, 0, 1)
@@ -98,6 +109,30 @@ class Node(AbstractNode):
         outputs = {"bboxes": bboxes, "bbox_labels": labels, "bbox_scores": scores}
         return outputs
 
+    def run_batch(self, inputs_batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Reads the image inputs of a batch of frames and returns the bboxes
+        of the specified objects, inferring all images in a single call.
+
+        Args:
+            inputs_batch (list): List of dictionaries of inputs with key "img".
+
+        Returns:
+            outputs (list): List of bbox outputs in dictionary format with keys
+            "bboxes", "bbox_labels", and "bbox_scores".
+        """
+        self.wait_for_warm_up()
+        images = [
+            cv2.cvtColor(inputs["img"], cv2.COLOR_BGR2RGB) for inputs in inputs_batch
+        ]
+        return [
+            {
+                "bboxes": np.clip(bboxes, 0, 1),
+                "bbox_labels": labels,
+                "bbox_scores": scores,
+            }
+            for bboxes, labels, scores in self.model.predict_batch(images)
+        ]
+
     def _get_config_types(self) -> Dict[str, Any]:
         return {
             "detect": List[Union[int, str]],
@@ -107,5 +142,7 @@ class Node(AbstractNode):
             "model_type": str,
             "num_classes": int,
             "score_threshold": float,
+            "warmup_background": bool,
+            "warmup_iterations": int,
             "weights_parent_dir": Optional[str],
         }
@@ -61,6 +61,13 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
         score_threshold (:obj:`float`): **[0, 1], default = 0.7**. |br|
             Bounding box with confidence score less than the specified
             confidence score threshold is discarded.
+        warmup_background (:obj:`bool`): **default = False**. |br|
+            Runs the warm-up in a background thread while the rest of the
+            pipeline is initialized. The first frame waits for it to finish.
+        warmup_iterations (:obj:`int`): **default = 0**. |br|
+            Number of inference passes on a dummy frame of the model's input
+            size when the node is initialized, so that the first real frame
+            is processed at steady-state latency.
 
     References:
         YOLOv4: Optimal Speed and Accuracy of Object Detection:
@@ -74,11 +81,15 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
         ``yolo_score_threshold`` is renamed to ``score_threshold``.
     """
 
+    is_stateless = True
+
     def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
         super().__init__(config, node_path=__name__, **kwargs)
         self.model = yolo_face_model.YOLOFaceModel(self.config)
+        self.warm_up(self.config["input_size"], self.config["input_size"])
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        self.wait_for_warm_up()
         image = cv2.cvtColor(inputs["img"], cv2.COLOR_BGR2RGB)
         bboxes, labels, scores = self.model.predict(image)
         bboxes = np.clip(bboxes, 0, 1)
@@ -100,5 +111,7 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
             "max_total_size": int,
             "model_type": str,
             "score_threshold": float,
+            "warmup_background": bool,
+            "warmup_iterations": int,
             "weights_parent_dir": Optional[str],
         }
@@ -54,6 +54,13 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
         score_threshold (:obj:`float`): **[0, 1], default = 0.1**. |br|
             Bounding box with confidence score less than the specified
             confidence score threshold is discarded.
+        warmup_background (:obj:`bool`): **default = False**. |br|
+            Runs the warm-up in a background thread while the rest of the
+            pipeline is initialized. The first frame waits for it to finish.
+        warmup_iterations (:obj:`int`): **default = 0**. |br|
+            Number of inference passes on a dummy frame of the model's input
+            size when the node is initialized, so that the first real frame
+            is processed at steady-state latency.
 
     References:
         YOLOv4: Optimal Speed and Accuracy of Object Detection:
@@ -67,9 +74,12 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
         ``yolo_score_threshold`` is renamed to ``score_threshold``.
     """
 
+    is_stateless = True
+
     def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
         super().__init__(config, node_path=__name__, **kwargs)
         self.model = yolo_license_plate_model.YOLOLicensePlateModel(self.config)
+        self.warm_up(self.config["input_size"], self.config["input_size"])
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Reads the image input and returns the bboxes of the specified
@@ -81,6 +91,7 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
             outputs (dict): bbox output in dictionary format with keys
             "bboxes", "bbox_labels", and "bbox_scores".
         """
+        self.wait_for_warm_up()
         image = cv2.cvtColor(inputs["img"], cv2.COLOR_BGR2RGB)
         bboxes, labels, scores = self.model.predict(image)
         bboxes = np.clip(bboxes, 0, 1)
@@ -99,5 +110,7 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
             "iou_threshold": float,
             "model_type": str,
             "score_threshold": float,
+            "warmup_background": bool,
+            "warmup_iterations": int,
             "weights_parent_dir": Optional[str],
         }
@@ -82,6 +82,31 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
 
         return bboxes, labels, scores
 
+    def predict_object_bboxes_from_images(
+        self, images: List[np.ndarray]
+    ) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Detect all objects' bounding boxes from a batch of images in a
+        single inference call
+
+        Args:
+            images (List[np.ndarray]): input images
+
+        Return:
+            (List[Tuple[np.ndarray, np.ndarray, np.ndarray]]): the bounding
+                boxes, labels and scores of each image
+        """
+        batch = tf.concat([self._preprocess(image) for image in images], axis=0)
+
+        pred = self.yolo(batch)[-1]
+
+        results = []
+        for bboxes, scores, classes in self._postprocess_batch(
+            pred[:, :, :4], pred[:, :, 4:]
+        ):
+            labels = np.array([self.class_names[int(i)] for i in classes])
+            results.append((bboxes, labels, scores))
+        return results
+
     def _create_yolo_model(self) -> Callable:
         """Creates YOLO model for human detection."""
         self.logger.info(
@@ -115,6 +140,11 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
     def _postprocess(
         self, pred_boxes: tf.Tensor, pred_scores: tf.Tensor
     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self._postprocess_batch(pred_boxes, pred_scores)[0]
+
+    def _postprocess_batch(
+        self, pred_boxes: tf.Tensor, pred_scores: tf.Tensor
+    ) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
         bboxes, scores, classes, valid_dets = tf.image.combined_non_max_suppression(
             tf.reshape(pred_boxes, (tf.shape(pred_boxes)[0], -1, 1, 4)),
             tf.reshape(
@@ -125,27 +155,25 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
             self.iou_threshold,
             self.score_threshold,
         )
-        num_valid = valid_dets[0]
-
-        classes = classes.numpy()[0]
-        classes = classes[:num_valid]
-        # only identify objects we are interested in
-        mask = np.isin(classes, self.detect_ids)
-        classes = classes[mask]
-
-        scores = scores.numpy()[0]
-        scores = scores[:num_valid]
-        scores = scores[mask]
-
-        bboxes = bboxes.numpy()[0]
-        bboxes = bboxes[:num_valid]
-        bboxes = bboxes[mask]
-
-        # swapping x and y axes
-        bboxes[:, [0, 1]] = bboxes[:, [1, 0]]
-        bboxes[:, [2, 3]] = bboxes[:, [3, 2]]
-
-        return bboxes, scores, classes
+        bboxes = bboxes.numpy()
+        scores = scores.numpy()
+        classes = classes.numpy()
+
+        results = []
+        for i, num_valid in enumerate(valid_dets.numpy()):
+            image_classes = classes[i, :num_valid]
+            # only identify objects we are interested in
+            mask = np.isin(image_classes, self.detect_ids)
+            image_classes = image_classes[mask]
+            image_scores = scores[i, :num_valid][mask]
+            image_bboxes = bboxes[i, :num_valid][mask]
+
+            # swapping x and y axes
+            image_bboxes[:, [0, 1]] = image_bboxes[:, [1, 0]]
+            image_bboxes[:, [2, 3]] = image_bboxes[:, [3, 2]]
+
+            results.append((image_bboxes, image_scores, image_classes))
+        return results
 
     def _preprocess(self, image: np.ndarray) -> tf.Tensor:
         processed_image = tf.convert_to_tensor(image.astype(np.float32))
@@ -84,3 +84,20 @@ class YOLOModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
             raise TypeError("image must be a np.ndarray")
 
         return self.detector.predict_object_bbox_from_image(image)
+
+    def predict_batch(
+        self, images: List[np.ndarray]
+    ) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """predict the bboxes from a batch of frames
+
+        Args:
+            images (List[np.ndarray]): Input image frames.
+
+        Returns:
+            (List[Tuple[np.ndarray, np.ndarray, np.ndarray]]): The detection
+            bboxes, human-friendly class names, and scores of each frame.
+        """
+        if not all(isinstance(image, np.ndarray) for image in images):
+            raise TypeError("image must be a np.ndarray")
+
+        return self.detector.predict_object_bboxes_from_images(images)
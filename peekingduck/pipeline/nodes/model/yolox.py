@@ -72,6 +72,13 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
         fuse (:obj:`bool`): **default = False**. |br|
             Flag to determine if the convolution and batch normalization layers
             should be fused for inference.
+        warmup_background (:obj:`bool`): **default = False**. |br|
+            Runs the warm-up in a background thread while the rest of the
+            pipeline is initialized. The first frame waits for it to finish.
+        warmup_iterations (:obj:`int`): **default = 0**. |br|
+            Number of inference passes on a dummy frame of the model's input
+            size when the node is initialized, so that the first real frame
+            is processed at steady-state latency.
 
     References:
         YOLOX: Exceeding YOLO Series in 2021:
@@ -81,9 +88,12 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
         https://github.com/Megvii-BaseDetection/YOLOX
     """
 
+    is_stateless = True
+
     def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
         super().__init__(config, node_path=__name__, **kwargs)
         self.model = yolox_model.YOLOXModel(self.config)
+        self.warm_up(self.config["input_size"], self.config["input_size"])
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Reads `img` from `inputs` and return the bboxes of the detect
@@ -99,6 +109,7 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
             (Dict): Outputs dictionary with the keys `bboxes`, `bbox_labels`,
                 and `bbox_scores`.
         """
+        self.wait_for_warm_up()
         bboxes, labels, scores = self.model.predict(inputs["img"])
         bboxes = np.clip(bboxes, 0, 1)
 
@@ -106,6 +117,30 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
 
         return outputs
 
+    def run_batch(self, inputs_batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Reads `img` from each of `inputs_batch` and returns the bboxes of
+        the detected objects, inferring all images in a single forward pass.
+
+        Args:
+            inputs_batch (List[Dict]): Inputs dictionaries with the key `img`.
+
+        Returns:
+            (List[Dict]): Outputs dictionaries with the keys `bboxes`,
+                `bbox_labels`, and `bbox_scores`.
+        """
+        self.wait_for_warm_up()
+        predictions = self.model.predict_batch(
+            [inputs["img"] for inputs in inputs_batch]
+        )
+        return [
+            {
+                "bboxes": np.clip(bboxes, 0, 1),
+                "bbox_labels": labels,
+                "bbox_scores": scores,
+            }
+            for bboxes, labels, scores in predictions
+        ]
+
     def _get_config_types(self) -> Dict[str, Any]:
         """Returns dictionary mapping the node's config keys to respective types."""
         return {
@@ -118,5 +153,7 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
             "model_format": str,
             "model_type": str,
             "score_threshold": float,
+            "warmup_background": bool,
+            "warmup_iterations": int,
             "weights_parent_dir": Optional[str],
         }
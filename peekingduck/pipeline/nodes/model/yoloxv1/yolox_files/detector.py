@@ -127,6 +127,43 @@ class Detector:  # pylint: disable=too-many-instance-attributes
 
         return bboxes, classes, scores
 
+    @torch.no_grad()
+    def predict_object_bboxes_from_images(
+        self, images: List[np.ndarray]
+    ) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Detects bounding boxes of selected object categories from a batch
+        of images.
+
+        The preprocessed images are stacked and inferred in a single forward
+        pass before each detection result is postprocessed like in
+        :meth:`predict_object_bbox_from_image`. TensorRT engines are built for
+        a batch size of one, so images are inferred one at a time for the
+        `tensorrt` model format.
+
+        Args:
+            images (List[np.ndarray]): Input images.
+
+        Returns:
+            (List[Tuple[np.ndarray, np.ndarray, np.ndarray]]): The detection
+            bboxes, human-friendly class names, and scores of each image.
+        """
+        if self.model_format != "pytorch":
+            return [self.predict_object_bbox_from_image(image) for image in images]
+
+        image_sizes = [image.shape[:2] for image in images]
+        preprocessed = [self._preprocess(image) for image in images]
+        batch = torch.from_numpy(np.stack([image for image, _ in preprocessed]))
+        batch = batch.to(self.device)
+        batch = batch.half() if self.half else batch.float()
+        predictions = self.yolox(batch)
+
+        return [
+            self._postprocess(prediction, scale, image_size, self.class_names)
+            for prediction, (_, scale), image_size in zip(
+                predictions, preprocessed, image_sizes
+            )
+        ]
+
     def update_detect_ids(self, ids: List[int]) -> None:
         """Updates list of selected object category IDs. When the list is
         empty, all available object category IDs are detected.
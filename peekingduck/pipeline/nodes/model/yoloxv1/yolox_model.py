@@ -101,3 +101,22 @@ class YOLOXModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
         if not isinstance(image, np.ndarray):
             raise TypeError("image must be a np.ndarray")
         return self.detector.predict_object_bbox_from_image(image)
+
+    def predict_batch(
+        self, images: List[np.ndarray]
+    ) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Predicts bboxes from a batch of images.
+
+        Args:
+            images (List[np.ndarray]): Input image frames.
+
+        Returns:
+            (List[Tuple[np.ndarray, np.ndarray, np.ndarray]]): The detection
+            bboxes, human-friendly class names, and scores of each image.
+
+        Raises:
+            TypeError: Any of the provided `images` is not a numpy array.
+        """
+        if not all(isinstance(image, np.ndarray) for image in images):
+            raise TypeError("image must be a np.ndarray")
+        return self.detector.predict_object_bboxes_from_images(images)
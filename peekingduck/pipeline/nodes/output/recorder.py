@@ -0,0 +1,129 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Records the data pool of every frame so that it can be replayed."""
+
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+from peekingduck.pipeline.utils.recording import IMG_FORMATS, RecordingWriter
+
+
+class Node(AbstractNode):
+    """Records the data pool of every frame to a folder, which
+    :mod:`input.replay` feeds back into a pipeline. Place this node after the
+    model nodes, so that downstream dabble, draw and output nodes can be
+    tuned and tested on the replayed outputs without running the models
+    again.
+
+    The frames are written in chunks of ``chunk_size`` frames to a new
+    ``recording_<timestamp>`` subfolder of ``output_dir``.
+
+    Inputs:
+        |all_input_data|
+
+        |pipeline_end_data|
+
+    Outputs:
+        |none_output_data|
+
+    Configs:
+        chunk_size (:obj:`int`): **default = 100**. |br|
+            Number of frames per chunk file. Frames are held in memory until
+            their chunk is written.
+        compress (:obj:`bool`): **default = False**. |br|
+            Compresses the chunk files. Saves space when recording large
+            arrays such as masks, at the cost of speed.
+        exclude (:obj:`List[str]`): **default = []**. |br|
+            Keys of the data pool which are not recorded.
+        img_format (:obj:`str`): **{"png", "jpg", "raw"}, default = "png"**. |br|
+            Encoding of ``img``. ``png`` is lossless, ``jpg`` is smaller and
+            ``raw`` stores the arrays as is.
+        keys (:obj:`List[str]`): **default = []**. |br|
+            Keys of the data pool to record. All the keys are recorded if
+            empty.
+        output_dir (:obj:`str`): **default = "PeekingDuck/data/recordings"**. |br|
+            Folder in which the recordings are saved.
+    """
+
+    def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
+        super().__init__(config, node_path=__name__, **kwargs)
+
+        self.logger = logging.getLogger(__name__)
+        if self.img_format not in IMG_FORMATS:
+            raise ValueError(f"img_format must be one of {list(IMG_FORMATS)}")
+        if self.chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+        self.output_dir = Path(self.output_dir)  # type: ignore
+        self.keys: List[str]
+        self.exclude: List[str]
+        self.writer: Optional[RecordingWriter] = None
+
+    def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Adds the data pool of the frame to the recording.
+
+        Args:
+            inputs (dict): The data pool of the pipeline.
+
+        Returns:
+            outputs: [None]
+        """
+        if inputs["pipeline_end"]:
+            self._close()
+            return {}
+
+        if self.writer is None:
+            time_str = datetime.now().strftime("%d%m%y-%H-%M-%S")
+            self.writer = RecordingWriter(
+                self.output_dir / f"recording_{time_str}",
+                self.chunk_size,
+                self.img_format,
+                self.compress,
+            )
+            self.logger.info(f"Recording data pool to {self.writer.directory}")
+        keys: Iterable[str] = self.keys or inputs.keys()
+        self.writer.write(
+            {
+                key: inputs[key]
+                for key in keys
+                if key in inputs and key != "pipeline_end" and key not in self.exclude
+            }
+        )
+        return {}
+
+    def release_resources(self) -> None:
+        """Writes the frames which have not been written yet."""
+        self._close()
+
+    def _close(self) -> None:
+        if self.writer is not None:
+            self.writer.flush()
+            self.logger.info(
+                f"Recorded {self.writer.num_frames} frames to {self.writer.directory}"
+            )
+            self.writer = None
+
+    def _get_config_types(self) -> Dict[str, Any]:
+        """Returns dictionary mapping the node's config keys to respective types."""
+        return {
+            "chunk_size": int,
+            "compress": bool,
+            "exclude": List[str],
+            "img_format": str,
+            "keys": List[str],
+            "output_dir": str,
+        }
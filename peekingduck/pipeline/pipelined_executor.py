@@ -0,0 +1,223 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Stage-parallel executor which runs each node of a pipeline in its own worker.
+"""
+
+import logging
+import queue
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+from peekingduck.pipeline.pipeline import Pipeline
+
+DEFAULT_QUEUE_SIZE = 2
+
+# A frame travelling through the stages: (sequence number, data pool)
+Frame = Tuple[int, Dict[str, Any]]
+# Marks the end of the frame stream, passed from stage to stage
+_END_OF_STREAM = None
+
+
+class PipelinedExecutor:  # pylint: disable=too-few-public-methods, too-many-instance-attributes
+    """Runs the nodes of a
+    :py:class:`Pipeline <peekingduck.pipeline.pipeline.Pipeline>` as a chain of
+    stages connected by bounded queues.
+
+    Every node runs in its own worker thread, so decoding, inference, drawing
+    and encoding of consecutive frames overlap and throughput approaches that
+    of the slowest stage instead of the sum of all stages. Each frame carries
+    a sequence number and its own data pool; since each stage is served by a
+    single worker and the queues are FIFO, frames leave the pipeline in the
+    order they were produced. The last node runs in the calling thread so
+    that GUI nodes such as ``output.screen`` stay on the main thread.
+
+    ``pipeline_end`` retains its sequential semantics: once a frame has
+    ``pipeline_end == True``, only nodes which take ``pipeline_end`` as an
+    input are run on it, the input node stops producing frames, and frames
+    produced after it are discarded.
+
+    Args:
+        pipeline (:obj:`Pipeline`): The pipeline to execute.
+        run_node (:obj:`Callable`): Callable which runs a node on a data pool
+            and returns the node outputs.
+        num_iter (:obj:`int`): Stop after this number of frames, ``0`` to run
+            until the input is exhausted.
+        queue_size (:obj:`int`): Maximum number of frames waiting in front of
+            each stage.
+    """
+
+    def __init__(
+        self,
+        pipeline: Pipeline,
+        run_node: Callable[[AbstractNode, Dict[str, Any]], Dict[str, Any]],
+        num_iter: int = 0,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        if queue_size <= 0:
+            raise ValueError("queue_size must be a positive integer")
+        self.logger = logging.getLogger(__name__)
+        self.pipeline = pipeline
+        self.run_node = run_node
+        self.num_iter = num_iter
+        self.queue_size = queue_size
+        self.num_frames = 0
+
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._end_seq: Optional[int] = None
+        self._error: Optional[BaseException] = None
+
+    def run(self) -> None:
+        """Runs the pipeline until the input is exhausted, ``pipeline_end``
+        is raised or ``num_iter`` frames have been processed.
+
+        Raises:
+            BaseException: Any exception raised by a node is re-raised in the
+                calling thread once all workers have stopped.
+        """
+        nodes = self.pipeline.nodes
+        queues: List["queue.Queue[Optional[Frame]]"] = [
+            queue.Queue(maxsize=self.queue_size) for _ in nodes[1:]
+        ]
+        workers = []
+        if len(nodes) > 1:
+            workers.append(
+                threading.Thread(
+                    target=self._source_worker,
+                    args=(nodes[0], queues[0]),
+                    name=f"stage-{nodes[0].name}",
+                    daemon=True,
+                )
+            )
+            for i, node in enumerate(nodes[1:-1], start=1):
+                workers.append(
+                    threading.Thread(
+                        target=self._stage_worker,
+                        args=(node, queues[i - 1], queues[i]),
+                        name=f"stage-{node.name}",
+                        daemon=True,
+                    )
+                )
+        for worker in workers:
+            worker.start()
+
+        if len(nodes) > 1:
+            self._stage_worker(nodes[-1], queues[-1], None)
+        else:
+            self._source_worker(nodes[0], None)
+
+        for worker in workers:
+            worker.join()
+        self.pipeline.terminate = True
+        if self._error is not None:
+            raise self._error
+
+    def _source_worker(
+        self, node: AbstractNode, out_queue: Optional["queue.Queue[Optional[Frame]]"]
+    ) -> None:
+        """Runs the first node to produce new frames until the input ends or
+        a downstream stage requests a stop.
+        """
+        seq = 0
+        while not self._stop.is_set() and not self.pipeline.terminate:
+            data: Dict[str, Any] = {}
+            if not self._process(node, seq, data):
+                break
+            if out_queue is None:
+                self._collect(seq, data)
+            else:
+                out_queue.put((seq, data))
+            seq += 1
+            if data.get("pipeline_end", False):
+                break
+            if 0 < self.num_iter <= seq:
+                self.logger.info(f"Stopping pipeline after {seq} iterations")
+                break
+        if out_queue is not None:
+            out_queue.put(_END_OF_STREAM)
+
+    def _stage_worker(
+        self,
+        node: AbstractNode,
+        in_queue: "queue.Queue[Optional[Frame]]",
+        out_queue: Optional["queue.Queue[Optional[Frame]]"],
+    ) -> None:
+        """Runs ``node`` on every frame from ``in_queue`` and passes it on to
+        ``out_queue``, or to the pipeline data pool for the last stage.
+        """
+        prev_data: Dict[str, Any] = {}
+        while True:
+            frame = in_queue.get()
+            if frame is _END_OF_STREAM:
+                break
+            seq, data = frame
+            # Keep draining the input after an error or past the last frame
+            # so that upstream stages never block on a full queue
+            if self._error is not None or self._is_after_end(seq):
+                continue
+            if data.get("pipeline_end", False):
+                # Upstream nodes are skipped on the last frame, expose their
+                # outputs from the previous frame like the sequential runner
+                for key, value in prev_data.items():
+                    data.setdefault(key, value)
+            if not self._process(node, seq, data):
+                continue
+            prev_data = data
+            if out_queue is None:
+                self._collect(seq, data)
+            else:
+                out_queue.put(frame)
+        if out_queue is not None:
+            out_queue.put(_END_OF_STREAM)
+
+    def _process(self, node: AbstractNode, seq: int, data: Dict[str, Any]) -> bool:
+        """Runs ``node`` on the data pool of frame ``seq``, honoring the
+        ``pipeline_end`` semantics of the sequential runner.
+
+        Returns:
+            (bool): ``False`` if the node raised an exception.
+        """
+        try:
+            if data.get("pipeline_end", False) and "pipeline_end" not in node.inputs:
+                return True
+            data.update(self.run_node(node, data))
+        except BaseException as error:  # pylint: disable=broad-except
+            with self._lock:
+                if self._error is None:
+                    self._error = error
+            self._stop.set()
+            return False
+        if data.get("pipeline_end", False):
+            self._mark_end(seq)
+        return True
+
+    def _collect(self, seq: int, data: Dict[str, Any]) -> None:
+        """Publishes the data pool of a fully processed frame."""
+        self.pipeline.data = data
+        self.num_frames = seq + 1
+
+    def _is_after_end(self, seq: int) -> bool:
+        return self._end_seq is not None and seq > self._end_seq
+
+    def _mark_end(self, seq: int) -> None:
+        """Records ``seq`` as the last frame to be processed and stops the
+        input node from producing more frames.
+        """
+        with self._lock:
+            if self._end_seq is None or seq < self._end_seq:
+                self._end_seq = seq
+        self._stop.set()
@@ -16,8 +16,14 @@
 another.
 """
 
+from typing import TYPE_CHECKING
+
 import numpy as np
-import torch
+
+if TYPE_CHECKING:
+    # torch is only needed by the PyTorch-backed models, avoid importing it
+    # with the conversions used by the TensorFlow-backed ones
+    import torch
 
 
 def tlwh2xyah(inputs: np.ndarray) -> np.ndarray:
@@ -89,7 +95,7 @@ def tlwh2xyxyn(inputs: np.ndarray, height: int, width: int) -> np.ndarray:
     return outputs
 
 
-def xywh2xyxy(inputs: torch.Tensor) -> torch.Tensor:
+def xywh2xyxy(inputs: "torch.Tensor") -> "torch.Tensor":
     """Converts from [x, y, w, h] to [x1, y1, x2, y2] format.
 
     (x, y) is the object center, w is the width, and h is the height. (x1, y1)
@@ -114,7 +120,7 @@ def xywh2xyxy(inputs: torch.Tensor) -> torch.Tensor:
         (torch.Tensor): Bounding boxes with the format `(top left x, top left y,
         bottom right x, bottom right y)`.
     """
-    outputs = torch.empty_like(inputs)
+    outputs = inputs.new_empty(inputs.shape)
     outputs[:, 0] = inputs[:, 0] - inputs[:, 2] / 2
     outputs[:, 1] = inputs[:, 1] - inputs[:, 3] / 2
     outputs[:, 2] = inputs[:, 0] + inputs[:, 2] / 2
@@ -0,0 +1,190 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Reads and writes recordings of the pipeline data pool.
+
+A recording is a directory of chunk files and an index file. Every chunk is
+an ``.npz`` archive holding the data pool of up to ``chunk_size``
+consecutive frames. Within a chunk, the entries of frame ``idx`` are stored
+as:
+
+- ``{idx}/a/{key}``: NumPy arrays, stored as is
+- ``{idx}/i/{key}``: images, encoded as PNG or JPEG
+- ``{idx}/p/{key}``: any other value, pickled into a byte array
+
+Values are encoded when they are added, so nodes which modify them in place
+later in the pipeline do not alter the recording.
+
+The index, ``index.json``, lists the chunks, the number of frames in each
+of them and all the recorded keys. It is rewritten whenever a chunk is
+written, so an interrupted recording can be read up to its last chunk.
+"""
+
+import json
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import cv2
+import numpy as np
+
+INDEX_FILE = "index.json"
+FORMAT_VERSION = 1
+IMG_FORMATS = ("png", "jpg", "raw")
+# Keys which are encoded as images when they hold 8-bit images
+IMG_KEYS = ("img",)
+
+
+class RecordingWriter:  # pylint: disable=too-many-instance-attributes
+    """Writes the data pool of consecutive frames into a recording.
+
+    Args:
+        directory (Path): Directory of the recording, created if it does not
+            exist.
+        chunk_size (int): Number of frames per chunk file.
+        img_format (str): One of ``png`` (lossless), ``jpg`` (smaller) or
+            ``raw`` (uncompressed arrays), the encoding of images.
+        compress (bool): Whether to compress the chunk files. Only worthwhile
+            for large arrays other than images, such as masks.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        chunk_size: int = 100,
+        img_format: str = "png",
+        compress: bool = False,
+    ) -> None:
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+        if img_format not in IMG_FORMATS:
+            raise ValueError(f"img_format must be one of {list(IMG_FORMATS)}")
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.img_format = img_format
+        self.compress = compress
+        self.keys: List[str] = []
+        self.chunks: List[Dict[str, Any]] = []
+        self.num_frames = 0
+        # Arrays of the buffered frames, passed to np.savez() as keywords
+        self._buffer: Dict[str, Any] = {}
+        self._buffered_frames = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def write(self, data: Dict[str, Any]) -> None:
+        """Adds the data pool of the next frame, writing a chunk file once
+        ``chunk_size`` frames have been added.
+        """
+        idx = self._buffered_frames
+        for key, value in data.items():
+            if key not in self.keys:
+                self.keys.append(key)
+            self._buffer.update(self._encode(idx, key, value))
+        self._buffered_frames += 1
+        self.num_frames += 1
+        if self._buffered_frames == self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes the buffered frames into a new chunk file and updates the
+        index.
+        """
+        if self._buffered_frames == 0:
+            return
+        file_name = f"chunk_{len(self.chunks):05d}.npz"
+        save = np.savez_compressed if self.compress else np.savez
+        save(self.directory / file_name, **self._buffer)
+        self.chunks.append({"file": file_name, "num_frames": self._buffered_frames})
+        self._buffer = {}
+        self._buffered_frames = 0
+        index = {
+            "version": FORMAT_VERSION,
+            "img_format": self.img_format,
+            "keys": self.keys,
+            "num_frames": self.num_frames,
+            "chunks": self.chunks,
+        }
+        with open(self.directory / INDEX_FILE, "w") as outfile:
+            json.dump(index, outfile, indent=2)
+
+    def _encode(self, idx: int, key: str, value: Any) -> Dict[str, np.ndarray]:
+        if (
+            key in IMG_KEYS
+            and self.img_format != "raw"
+            and isinstance(value, np.ndarray)
+            and value.dtype == np.uint8
+            and value.ndim in (2, 3)
+        ):
+            _, encoded = cv2.imencode(f".{self.img_format}", value)
+            return {f"{idx}/i/{key}": encoded}
+        if isinstance(value, np.ndarray) and value.dtype != object:
+            return {f"{idx}/a/{key}": value.copy()}
+        pickled = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        return {f"{idx}/p/{key}": np.frombuffer(pickled, dtype=np.uint8)}
+
+
+class RecordingReader:  # pylint: disable=too-few-public-methods
+    """Reads the data pool of the frames of a recording, one chunk file at a
+    time.
+
+    Args:
+        directory (Path): Directory of the recording.
+        keys (:obj:`List[str]` | :obj:`None`): Keys to read. All the recorded
+            keys are read if not provided.
+
+    Raises:
+        FileNotFoundError: ``directory`` does not contain a recording.
+        ValueError: ``keys`` contains keys which were not recorded.
+    """
+
+    def __init__(self, directory: Path, keys: Optional[List[str]] = None) -> None:
+        index_path = directory / INDEX_FILE
+        if not index_path.is_file():
+            raise FileNotFoundError(f"No recording found in {directory}")
+        with open(index_path) as infile:
+            index = json.load(infile)
+        if index["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported recording version: {index['version']}")
+        self.directory = directory
+        self.chunks: List[Dict[str, Any]] = index["chunks"]
+        self.num_frames: int = index["num_frames"]
+        if keys:
+            missing = [key for key in keys if key not in index["keys"]]
+            if missing:
+                raise ValueError(
+                    f"{missing} were not recorded. Recorded keys: {index['keys']}"
+                )
+            self.keys = list(keys)
+        else:
+            self.keys = index["keys"]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Yields the data pool of every frame in order."""
+        for chunk in self.chunks:
+            frames: List[Dict[str, Any]] = [{} for _ in range(chunk["num_frames"])]
+            with np.load(self.directory / chunk["file"]) as archive:
+                for name in archive.files:
+                    idx, kind, key = name.split("/", 2)
+                    if key in self.keys:
+                        frames[int(idx)][key] = _decode(kind, archive[name])
+            yield from frames
+
+
+def _decode(kind: str, value: np.ndarray) -> Any:
+    if kind == "i":
+        return cv2.imdecode(value, cv2.IMREAD_UNCHANGED)
+    if kind == "p":
+        return pickle.loads(value.tobytes())
+    return value
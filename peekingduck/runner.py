@@ -16,20 +16,37 @@
 Main engine for PeekingDuck processes.
 """
 
-import copy
+import gc
 import logging
 import sys
 from pathlib import Path
 from time import perf_counter
-from typing import List
+from typing import Any, Dict, List, Optional, Union
 
 from peekingduck.declarative_loader import DeclarativeLoader, NodeList
+from peekingduck.pipeline.batched_executor import BatchedExecutor
+from peekingduck.pipeline.dag_executor import DagExecutor
+from peekingduck.pipeline.data_pool import get_key_release_schedule, get_node_inputs
+from peekingduck.pipeline.duplicate_frames import DuplicateFrameFilter
+from peekingduck.pipeline.frame_deadline import FrameDeadline
+from peekingduck.pipeline.inference_cache import (
+    DEFAULT_CACHE_SIZE,
+    CachedNode,
+    InferenceCache,
+)
+from peekingduck.pipeline.keyframe_scheduler import KeyframeScheduler
+from peekingduck.pipeline.multi_stream import MultiStreamExecutor, fan_out
 from peekingduck.pipeline.nodes.abstract_node import AbstractNode
 from peekingduck.pipeline.pipeline import Pipeline
+from peekingduck.pipeline.pipelined_executor import (
+    DEFAULT_QUEUE_SIZE,
+    PipelinedExecutor,
+)
+from peekingduck.utils.profiler import MemoryProfiler, NodeProfiler
 from peekingduck.utils.requirement_checker import RequirementChecker
 
 
-class Runner:
+class Runner:  # pylint: disable=too-many-instance-attributes
     """The runner class for creation of pipeline using declared/given nodes.
 
     The runner class uses the provided configurations to setup a node pipeline
@@ -53,33 +70,163 @@ class Runner:
         num_iter (int): Stop pipeline after running this number of iterations
         nodes (:obj:`List[AbstractNode]` | :obj:`None`): If a list of nodes is
             provided, initialize by the node stack directly.
+        pipelined (bool): If ``True``, runs every node in its own worker
+            thread with bounded queues in between so that consecutive frames
+            are processed by different nodes concurrently. See
+            :py:class:`~peekingduck.pipeline.pipelined_executor.PipelinedExecutor`.
+        queue_size (int): Maximum number of frames buffered in front of each
+            node when ``pipelined`` is ``True``.
+        batch_size (int): If greater than 1, accumulates this number of
+            frames and runs every node once on all of them, so that
+            batch-capable model nodes infer several frames in a single call.
+            See
+            :py:class:`BatchedExecutor <peekingduck.pipeline.batched_executor.BatchedExecutor>`.
+            Cannot be combined with ``pipelined``.
+        streams (:obj:`List[Union[int, str]]` | :obj:`None`): If provided,
+            runs the pipeline over each of these visual sources. Stateless
+            nodes, such as the models, are shared by all streams while every
+            stream gets its own instance of the other nodes. See
+            :py:class:`MultiStreamExecutor <peekingduck.pipeline.multi_stream.MultiStreamExecutor>`.
+            Cannot be combined with ``pipelined`` or ``batch_size``.
+        parallel_branches (bool): If ``True``, runs the nodes of each frame
+            as a dependency graph so that independent nodes, e.g., two models
+            reading the same ``img``, run concurrently. See
+            :py:class:`DagExecutor <peekingduck.pipeline.dag_executor.DagExecutor>`.
+            Cannot be combined with ``pipelined``, ``batch_size`` or
+            ``streams``.
+        release_keys (bool): If ``True``, removes every key from the data pool
+            after the last node which uses it within an iteration, see
+            :py:func:`~peekingduck.pipeline.data_pool.get_key_release_schedule`.
+            Released keys are not part of the pipeline results. Only
+            supported by the sequential and multi-stream execution.
+        keyframe_interval (int): If greater than 1, runs the object detection
+            models at most every this number of frames and tracks their
+            detections in between. See
+            :py:class:`~peekingduck.pipeline.keyframe_scheduler.KeyframeScheduler`.
+            Only supported by the sequential execution.
+        motion_threshold (float): If greater than 0, frames which differ
+            from the last keyframe by more than this fraction also become
+            keyframes. Only used when ``keyframe_interval`` is greater than 1.
+        deadline (:obj:`float` | :obj:`None`): If provided, frames older than
+            this number of seconds since their capture are dropped before the
+            model nodes, and the number of dropped and late frames is logged.
+            Later nodes which only need the outputs of the earlier nodes, e.g.,
+            ``output.media_writer``, still run on dropped frames. See
+            :py:class:`FrameDeadline <peekingduck.pipeline.frame_deadline.FrameDeadline>`.
+            Only supported by the sequential execution.
+        skip_duplicate_frames (bool): If ``True``, the stateless model nodes
+            reuse their outputs on frames with the same ``frame_seq`` as the
+            previous frame, which a threaded camera input returns when the
+            pipeline is faster than the camera. See
+            :py:class:`~peekingduck.pipeline.duplicate_frames.DuplicateFrameFilter`.
+            Only supported by the sequential execution.
+        model_processes (bool): If ``True``, runs every model node in its
+            own worker process and passes the frames to it through shared
+            memory, so that model inference does not compete with the other
+            nodes for the GIL. Nodes declared in ``pipeline_path`` are only
+            built in their worker process, except in multi-stream execution.
+            Batches are passed to the workers whole. See
+            :py:class:`RemoteNode <peekingduck.pipeline.frame_transport.RemoteNode>`.
+            Requires Python 3.8 or later.
+        cache_dir (:obj:`pathlib.Path` | :obj:`None`): If provided, caches
+            the outputs of the stateless model nodes in this folder, keyed by
+            a hash of their inputs and config, so that frames seen in an
+            earlier run skip preprocessing and inference. The hit rate of
+            every model is logged when the pipeline stops. See
+            :py:class:`InferenceCache <peekingduck.pipeline.inference_cache.InferenceCache>`.
+        cache_size (int): Maximum size of the cache in megabytes, the least
+            recently used outputs are evicted first.
+        profile (bool): If ``True``, measures the latency of every node call
+            and logs a per-node summary when the pipeline stops.
+        profile_path (:obj:`pathlib.Path` | :obj:`None`): If provided, the
+            per-node summary is also saved to this JSON file. Implies
+            ``profile``.
+        profile_memory (bool): If ``True``, also measures the Python and
+            native memory allocated by every node call and the size of the
+            values it writes into the data pool, see
+            :py:class:`MemoryProfiler <peekingduck.utils.profiler.MemoryProfiler>`.
+            Implies ``profile``. Models running in worker processes are not
+            covered.
     """
 
-    def __init__(  # pylint: disable=too-many-arguments
+    def __init__(  # pylint: disable=too-many-arguments, too-many-locals
         self,
         pipeline_path: Path = None,
         config_updates_cli: str = None,
         custom_nodes_parent_subdir: str = None,
         num_iter: int = None,
         nodes: List[AbstractNode] = None,
+        pipelined: bool = False,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        batch_size: int = 1,
+        streams: Optional[List[Union[int, str]]] = None,
+        parallel_branches: bool = False,
+        release_keys: bool = False,
+        keyframe_interval: int = 1,
+        motion_threshold: float = 0.0,
+        deadline: Optional[float] = None,
+        skip_duplicate_frames: bool = False,
+        model_processes: bool = False,
+        cache_dir: Optional[Path] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        profile: bool = False,
+        profile_path: Optional[Path] = None,
+        profile_memory: bool = False,
     ) -> None:
         self.logger = logging.getLogger(__name__)
+        self.pipelined = pipelined
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.parallel_branches = parallel_branches
+        self.streams: List[Pipeline] = []
+        self.remote_nodes: List[AbstractNode] = []
+        self.inference_cache: Optional[InferenceCache] = None
+        self.profiler: Optional[NodeProfiler] = None
+        if profile_memory:
+            self.profiler = MemoryProfiler(profile_path)
+        elif profile or profile_path:
+            self.profiler = NodeProfiler(profile_path)
         try:
-            if nodes:
-                # instantiated_nodes is created differently when given nodes
-                self.pipeline = Pipeline(nodes)
-            elif pipeline_path and config_updates_cli and custom_nodes_parent_subdir:
-                # create Graph to run
-                self.node_loader = DeclarativeLoader(
-                    pipeline_path, config_updates_cli, custom_nodes_parent_subdir
-                )
-                self.pipeline = self.node_loader.get_pipeline()
-            else:
-                raise ValueError(
-                    "Arguments error! Pass in either nodes to load directly via "
-                    "Pipeline or pipeline_path, config_updates_cli, and "
-                    "custom_nodes_parent_subdir to load via DeclarativeLoader."
-                )
+            self._check_execution_modes(
+                pipelined,
+                batch_size,
+                streams,
+                parallel_branches,
+                release_keys,
+                {
+                    "Keyframe scheduling": keyframe_interval > 1,
+                    "Deadline mode": deadline is not None,
+                    "Skipping duplicate frames": skip_duplicate_frames,
+                },
+            )
+            if model_processes:
+                self._check_model_processes_supported()
+            self.pipeline = self._load_pipeline(
+                pipeline_path,
+                config_updates_cli,
+                custom_nodes_parent_subdir,
+                nodes,
+                model_processes and not streams,
+                self._get_model_process_slots(streams),
+            )
+            if streams:
+                self.streams = fan_out(self.pipeline, streams)
+            if model_processes:
+                self._start_model_processes(self._get_model_process_slots(streams))
+                # free the models built in this process, which may be cyclic
+                gc.collect()
+            if cache_dir is not None:
+                self._start_inference_cache(Path(cache_dir), cache_size)
+            self._setup_frame_hooks(
+                release_keys,
+                keyframe_interval,
+                motion_threshold,
+                deadline,
+                skip_duplicate_frames,
+            )
+            if self.profiler is not None:
+                for pipeline in self.streams or [self.pipeline]:
+                    self.profiler.add_pipeline(pipeline.nodes)
         except ValueError as error:
             self.logger.error(str(error))
             sys.exit(1)
@@ -96,11 +243,34 @@ class Runner:
             self.num_iter = num_iter
             self.logger.info(f"Run pipeline for {num_iter} iterations")
 
-    def run(self) -> None:  # pylint: disable=too-many-branches
+    def run(self) -> None:
         """execute single or continuous inference"""
+        try:
+            if self.pipelined:
+                self._run_pipelined()
+            elif self.streams:
+                self._run_multi_stream()
+            elif self.batch_size > 1:
+                self._run_batched()
+            elif self.parallel_branches:
+                self._run_parallel_branches()
+            else:
+                self._run_sequential()
+        finally:
+            self._release_resources()
+            if self.inference_cache is not None:
+                self.inference_cache.log_summary()
+            if self.profiler is not None:
+                self.profiler.report()
+
+    def _run_sequential(self) -> None:
+        """Runs the nodes one after another for every frame."""
         num_iter = 0
         while not self.pipeline.terminate:
-            for node in self.pipeline.nodes:
+            if self.keyframe_scheduler is not None:
+                self.keyframe_scheduler.start_frame()
+            is_dropped = False
+            for idx, node in enumerate(self.pipeline.nodes):
                 if num_iter == 0:  # report node setup times at first iteration
                     self.logger.debug(f"First iteration: setup {node.name}...")
                     node_start_time = perf_counter()
@@ -108,38 +278,340 @@ class Runner:
                     self.pipeline.terminate = True
                     if "pipeline_end" not in node.inputs:
                         continue
+                if self.frame_deadline is not None:
+                    if self.frame_deadline.is_stale(idx, self.pipeline.data):
+                        is_dropped = True
+                    if is_dropped and not self.frame_deadline.runs_on_dropped[idx]:
+                        continue
 
-                if "all" in node.inputs:
-                    inputs = copy.deepcopy(self.pipeline.data)
-                else:
-                    inputs = {
-                        key: self.pipeline.data[key]
-                        for key in node.inputs
-                        if key in self.pipeline.data
-                    }
-                if hasattr(node, "optional_inputs"):
-                    for key in node.optional_inputs:
-                        # The nodes will not receive inputs with the optional
-                        # key if it's not found upstream
-                        if key in self.pipeline.data:
-                            inputs[key] = self.pipeline.data[key]
-
-                outputs = node.run(inputs)
-                self.pipeline.data.update(outputs)
+                self._run_sequential_node(idx, node)
                 if num_iter == 0:
                     node_end_time = perf_counter()
                     self.logger.debug(
-                        f"{node.name} setup time = {node_end_time - node_start_time:.2f} sec"
+                        f"{node.name} setup time = "
+                        f"{node_end_time - node_start_time:.2f} sec"
                     )
+            if self.frame_deadline is not None and not is_dropped:
+                self.frame_deadline.end_frame(self.pipeline.data)
             num_iter += 1
             if self.num_iter > 0 and num_iter >= self.num_iter:
                 self.logger.info(f"Stopping pipeline after {num_iter} iterations")
                 break
+        self._log_frame_hook_summaries()
+
+    def _run_sequential_node(self, idx: int, node: AbstractNode) -> None:
+        """Runs the ``idx``-th node on the data pool of the current frame and
+        releases the keys it was the last user of.
+        """
+        if self.duplicate_filter is not None:
+            outputs = self.duplicate_filter.run(
+                node, self.pipeline.data, self._run_scheduled_node
+            )
+        else:
+            outputs = self._run_scheduled_node(node, self.pipeline.data)
+        self.pipeline.data.update(outputs)
+        self._release_keys(idx, self.pipeline.data)
+
+    def _release_keys(self, idx: int, data: Dict[str, Any]) -> None:
+        """Removes the keys whose last user is the ``idx``-th node from
+        ``data`` if ``release_keys`` is enabled.
+        """
+        if self.release_schedule:
+            for key in self.release_schedule[idx]:
+                data.pop(key, None)
+
+    def _log_frame_hook_summaries(self) -> None:
+        """Logs the statistics of the enabled sequential execution helpers."""
+        if self.keyframe_scheduler is not None:
+            self.keyframe_scheduler.log_summary()
+        if self.frame_deadline is not None:
+            self.frame_deadline.log_summary()
+        if self.duplicate_filter is not None:
+            self.duplicate_filter.log_summary()
+
+    def _run_pipelined(self) -> None:
+        """Runs every node in its own worker, see
+        :py:class:`PipelinedExecutor <peekingduck.pipeline.pipelined_executor.PipelinedExecutor>`.
+        """
+        self.logger.info(
+            f"Running pipeline in pipelined mode, queue size: {self.queue_size}"
+        )
+        executor = PipelinedExecutor(
+            self.pipeline, self._run_node, self.num_iter, self.queue_size
+        )
+        executor.run()
 
-        # clean up nodes with threads
-        for node in self.pipeline.nodes:
-            if node.name.endswith(".visual"):
-                node.release_resources()
+    def _run_batched(self) -> None:
+        """Runs every node on batches of frames, see
+        :py:class:`BatchedExecutor <peekingduck.pipeline.batched_executor.BatchedExecutor>`.
+        """
+        self.logger.info(
+            f"Running pipeline in batched mode, batch size: {self.batch_size}"
+        )
+        executor = BatchedExecutor(
+            self.pipeline, self._run_node_batch, self.batch_size, self.num_iter
+        )
+        executor.run()
+
+    def _run_multi_stream(self) -> None:
+        """Runs the pipeline over several sources, see
+        :py:class:`MultiStreamExecutor <peekingduck.pipeline.multi_stream.MultiStreamExecutor>`.
+        """
+        self.logger.info(f"Running pipeline over {len(self.streams)} streams")
+        executor = MultiStreamExecutor(
+            self.streams,
+            self._run_node_batch,
+            self.num_iter,
+            self.release_schedule or None,
+        )
+        executor.run()
+
+    def _run_parallel_branches(self) -> None:
+        """Runs independent nodes of each frame concurrently, see
+        :py:class:`DagExecutor <peekingduck.pipeline.dag_executor.DagExecutor>`.
+        """
+        self.logger.info("Running pipeline in parallel branch mode")
+        executor = DagExecutor(self.pipeline, self._run_node, self.num_iter)
+        executor.run()
+
+    def _run_node(self, node: AbstractNode, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Collects the inputs required by ``node`` from the data pool and
+        runs it.
+
+        Args:
+            node (AbstractNode): The node to run.
+            data (Dict[str, Any]): The data pool of the current frame.
+
+        Returns:
+            (Dict[str, Any]): Outputs of the node.
+        """
+        inputs = get_node_inputs(node, data)
+        if self.profiler is not None:
+            return self.profiler.run(node, inputs)
+        return node.run(inputs)
+
+    def _run_scheduled_node(
+        self, node: AbstractNode, data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Runs ``node`` through the keyframe scheduler if it is enabled."""
+        if self.keyframe_scheduler is not None:
+            return self.keyframe_scheduler.run(node, data, self._run_node)
+        return self._run_node(node, data)
+
+    def _run_node_batch(
+        self, node: AbstractNode, batch: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Collects the inputs required by ``node`` from the data pool of
+        every frame in ``batch`` and runs it on all of them.
+
+        Args:
+            node (AbstractNode): The node to run.
+            batch (List[Dict[str, Any]]): The data pools of the frames.
+
+        Returns:
+            (List[Dict[str, Any]]): Outputs of the node for each frame.
+        """
+        inputs_batch = [get_node_inputs(node, data) for data in batch]
+        if self.profiler is not None:
+            return self.profiler.run_batch(node, inputs_batch)
+        return node.run_batch(inputs_batch)
+
+    @staticmethod
+    def _check_execution_modes(  # pylint: disable=too-many-arguments
+        pipelined: bool,
+        batch_size: int,
+        streams: Optional[List[Union[int, str]]],
+        parallel_branches: bool,
+        release_keys: bool,
+        sequential_only: Dict[str, bool],
+    ) -> None:
+        """Checks that the requested execution modes can be combined.
+
+        Args:
+            sequential_only (Dict[str, bool]): Whether each of the features
+                which are only supported by sequential execution is enabled.
+
+        Raises:
+            ValueError: Two of the execution modes cannot be combined.
+        """
+        if pipelined and batch_size > 1:
+            raise ValueError(
+                "Pipelined execution cannot be combined with a batch size "
+                "larger than 1."
+            )
+        if streams and (pipelined or batch_size > 1):
+            raise ValueError(
+                "Multi-stream execution cannot be combined with pipelined "
+                "execution or a batch size larger than 1."
+            )
+        if parallel_branches and (pipelined or batch_size > 1 or streams):
+            raise ValueError(
+                "Parallel branch execution cannot be combined with pipelined "
+                "or multi-stream execution or a batch size larger than 1."
+            )
+        if release_keys and (pipelined or batch_size > 1 or parallel_branches):
+            raise ValueError(
+                "Releasing keys is only supported by sequential and "
+                "multi-stream execution."
+            )
+        if pipelined or batch_size > 1 or streams or parallel_branches:
+            for feature, is_enabled in sequential_only.items():
+                if is_enabled:
+                    raise ValueError(
+                        f"{feature} is only supported by sequential execution."
+                    )
+
+    def _load_pipeline(  # pylint: disable=too-many-arguments
+        self,
+        pipeline_path: Optional[Path],
+        config_updates_cli: Optional[str],
+        custom_nodes_parent_subdir: Optional[str],
+        nodes: Optional[List[AbstractNode]],
+        model_processes: bool,
+        model_process_slots: int,
+    ) -> Pipeline:
+        """Creates the pipeline from ``nodes`` if provided, otherwise from the
+        nodes declared in ``pipeline_path``.
+
+        Raises:
+            ValueError: Neither ``nodes`` nor all of ``pipeline_path``,
+                ``config_updates_cli`` and ``custom_nodes_parent_subdir`` are
+                provided.
+        """
+        if nodes:
+            # instantiated_nodes is created differently when given nodes
+            return Pipeline(nodes)
+        if pipeline_path and config_updates_cli and custom_nodes_parent_subdir:
+            # create Graph to run
+            # fan_out() re-creates the stateful nodes of every stream
+            # from their instance, so these are moved to worker processes
+            # after the pipeline is built
+            self.node_loader = DeclarativeLoader(
+                pipeline_path,
+                config_updates_cli,
+                custom_nodes_parent_subdir,
+                model_processes=model_processes,
+                model_process_slots=model_process_slots,
+            )
+            return self.node_loader.get_pipeline()
+        raise ValueError(
+            "Arguments error! Pass in either nodes to load directly via "
+            "Pipeline or pipeline_path, config_updates_cli, and "
+            "custom_nodes_parent_subdir to load via DeclarativeLoader."
+        )
+
+    def _setup_frame_hooks(  # pylint: disable=too-many-arguments
+        self,
+        release_keys: bool,
+        keyframe_interval: int,
+        motion_threshold: float,
+        deadline: Optional[float],
+        skip_duplicate_frames: bool,
+    ) -> None:
+        """Creates the helpers which sequential execution calls around every
+        node, each one is ``None`` (or empty) if it is disabled.
+        """
+        self.release_schedule: List[List[str]] = (
+            get_key_release_schedule(self.pipeline.nodes) if release_keys else []
+        )
+        self.keyframe_scheduler = (
+            KeyframeScheduler(self.pipeline.nodes, keyframe_interval, motion_threshold)
+            if keyframe_interval > 1
+            else None
+        )
+        self.frame_deadline = (
+            FrameDeadline(self.pipeline.nodes, deadline)
+            if deadline is not None
+            else None
+        )
+        self.duplicate_filter = (
+            DuplicateFrameFilter(self.pipeline.nodes) if skip_duplicate_frames else None
+        )
+
+    @staticmethod
+    def _check_model_processes_supported() -> None:
+        """Raises:
+        ValueError: Shared memory is not supported by this Python version.
+        """
+        try:
+            # pylint: disable=import-outside-toplevel, unused-import
+            from peekingduck.pipeline import frame_transport  # noqa: F401
+        except ImportError as error:
+            raise ValueError(
+                "Running models in worker processes requires Python 3.8 or later."
+            ) from error
+
+    def _get_model_process_slots(self, streams: Optional[List[Union[int, str]]]) -> int:
+        """Returns the maximum number of frames passed to a model worker
+        process per call, i.e., a batch or one frame of every stream.
+        """
+        return max(2, self.batch_size, len(streams or []))
+
+    def _start_model_processes(self, num_slots: int) -> None:
+        """Replaces the model nodes which are not already running in worker
+        processes with proxies which do. Nodes shared by several streams share
+        a single worker. The worker builds its own instance of the node, so
+        every reference to the original node is dropped to free its memory.
+        """
+        # pylint: disable=import-outside-toplevel
+        from peekingduck.pipeline.frame_transport import RemoteNode
+
+        remote_nodes: Dict[int, AbstractNode] = {}
+        pipelines = [self.pipeline] + self.streams
+        for pipeline in pipelines:
+            for idx, node in enumerate(pipeline.nodes):
+                if not node.node_name.startswith("model."):
+                    continue
+                # isinstance() is True for every node, see
+                # AbstractNode.__subclasshook__
+                if type(node) is RemoteNode:  # pylint: disable=unidiomatic-typecheck
+                    remote_nodes.setdefault(id(node), node)
+                    continue
+                if id(node) not in remote_nodes:
+                    self.logger.info(f"Starting worker process for {node.node_name}")
+                    remote_nodes[id(node)] = RemoteNode.from_node(node, num_slots)
+                pipeline.nodes[idx] = remote_nodes[id(node)]
+        # the template pipeline is not run when there are several streams
+        self.remote_nodes = list(
+            {
+                id(node): node
+                for pipeline in self.streams or [self.pipeline]
+                for node in pipeline.nodes
+                if type(node) is RemoteNode  # pylint: disable=unidiomatic-typecheck
+            }.values()
+        )
+
+    def _start_inference_cache(self, cache_dir: Path, cache_size: int) -> None:
+        """Wraps the stateless model nodes so that their outputs are cached.
+        Nodes shared by several streams share a single wrapper.
+        """
+        self.inference_cache = InferenceCache(cache_dir, cache_size)
+        cached_nodes: Dict[int, AbstractNode] = {}
+        for pipeline in self.streams or [self.pipeline]:
+            for idx, node in enumerate(pipeline.nodes):
+                if not node.node_name.startswith("model."):
+                    continue
+                if not node.is_stateless:
+                    self.logger.info(
+                        f"Not caching {node.node_name}, its outputs depend on "
+                        "earlier frames"
+                    )
+                    continue
+                if id(node) not in cached_nodes:
+                    cached_nodes[id(node)] = CachedNode(node, self.inference_cache)
+                pipeline.nodes[idx] = cached_nodes[id(node)]
+        self.logger.info(f"Caching model outputs in {cache_dir}")
+
+    def _release_resources(self) -> None:
+        """Cleans up nodes with threads or worker processes, and writes the
+        frames buffered by recorders.
+        """
+        for pipeline in self.streams or [self.pipeline]:
+            for node in pipeline.nodes:
+                if node.name.endswith((".visual", ".recorder")):
+                    node.release_resources()
+        for node in self.remote_nodes:
+            node.release_resources()
 
     def get_pipeline(self) -> NodeList:
         """Retrieves run configuration.
@@ -0,0 +1,239 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Processes a directory source with a pool of worker processes.
+"""
+
+import copy
+import csv
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from peekingduck.declarative_loader import DeclarativeLoader
+from peekingduck.pipeline.nodes.output.csv_writer import Node as CSVWriter
+from peekingduck.runner import Runner
+
+
+class ShardedRunner:  # pylint: disable=too-few-public-methods, too-many-instance-attributes
+    """Runs a pipeline whose ``input.visual`` source is a directory with a
+    pool of worker processes.
+
+    The sorted files of the directory are split into ``num_workers``
+    contiguous shards with the ``num_shards`` and ``shard_index`` configs of
+    ``input.visual``, and each worker process runs its own copy of the
+    pipeline on one shard. Workers are started with the ``spawn`` method so
+    that every process initializes its own TensorFlow/PyTorch runtime.
+
+    Outputs are merged deterministically: ``output.csv_writer`` writes one
+    file per shard, which are concatenated in shard order, i.e., in the order
+    the files would have been processed by a single pipeline.
+    ``output.media_writer`` already writes one output per input file, so
+    the workers share its output directory.
+
+    Args:
+        pipeline_path (:obj:`pathlib.Path`): Path to *pipeline_config.yml*.
+        config_updates_cli (:obj:`str`): Configuration changes passed as part
+            of the CLI command.
+        custom_nodes_parent_subdir (:obj:`str`): Relative path to a folder
+            which contains custom nodes.
+        num_workers (:obj:`int`): Number of worker processes and shards.
+        num_iter (:obj:`int` | :obj:`None`): Stop each worker after running
+            this number of iterations.
+        **runner_kwargs (Any): Passed to the
+            :py:class:`Runner <peekingduck.runner.Runner>` of each worker,
+            e.g., ``pipelined``, ``batch_size`` or ``cache_dir``. Every worker
+            saves its own ``profile_path`` file, suffixed with its shard index.
+            ``nodes`` and ``streams`` are not supported.
+
+    Raises:
+        ValueError: ``nodes`` or ``streams`` is passed in ``runner_kwargs``.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        pipeline_path: Path,
+        config_updates_cli: str,
+        custom_nodes_parent_subdir: str,
+        num_workers: int,
+        num_iter: Optional[int] = None,
+        **runner_kwargs: Any,
+    ) -> None:
+        if num_workers <= 0:
+            raise ValueError("num_workers must be a positive integer")
+        if runner_kwargs.get("nodes") or runner_kwargs.get("streams"):
+            raise ValueError(
+                "Sharded execution cannot be combined with nodes or streams"
+            )
+        self.logger = logging.getLogger(__name__)
+        self.pipeline_path = Path(pipeline_path).resolve()
+        self.custom_nodes_parent_subdir = custom_nodes_parent_subdir
+        self.num_workers = num_workers
+        self.num_iter = num_iter
+        self.runner_kwargs = runner_kwargs
+
+        self.node_loader = DeclarativeLoader(
+            self.pipeline_path, config_updates_cli, custom_nodes_parent_subdir
+        )
+        if num_workers > 1:
+            self._check_source()
+        self.csv_file_path = self._get_csv_file_path()
+
+    def run(self) -> None:
+        """Runs all shards and merges the ``output.csv_writer`` files."""
+        self.logger.info(f"Processing directory with {self.num_workers} workers")
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(self.num_workers, mp_context=context) as executor:
+            futures = [
+                executor.submit(
+                    _run_shard,
+                    self.pipeline_path,
+                    self._get_shard_config_updates(shard_index),
+                    self.custom_nodes_parent_subdir,
+                    self.num_iter,
+                    self._get_shard_runner_kwargs(shard_index),
+                )
+                for shard_index in range(self.num_workers)
+            ]
+            csv_paths = [future.result() for future in futures]
+
+        if self.csv_file_path is not None:
+            # pylint: disable=protected-access
+            output_path = CSVWriter._append_datetime_file_path(self.csv_file_path)
+            self._merge_csv_files(
+                [Path(csv_path) for csv_path in csv_paths if csv_path], output_path
+            )
+            self.logger.info(f"Merged CSV output of all shards into {output_path}")
+
+    def _check_source(self) -> None:
+        """Checks that the ``input.visual`` source is a directory. Other
+        sources cannot be split into shards, so every worker would process
+        the whole source and the merged output would contain duplicates.
+
+        Raises:
+            ValueError: The pipeline does not start with ``input.visual`` or
+                its source is not a directory.
+        """
+        source = self._get_config_value("input.visual", "source")
+        if source is None:
+            raise ValueError("num_workers > 1 requires an input.visual node")
+        if isinstance(source, int) or not Path(source).is_dir():
+            raise ValueError(
+                f"num_workers > 1 requires the input.visual source to be a "
+                f"directory, got: {source}"
+            )
+
+    def _get_csv_file_path(self) -> Optional[Path]:
+        """Returns the configured ``file_path`` of ``output.csv_writer``, or
+        ``None`` if the pipeline does not contain it.
+        """
+        file_path = self._get_config_value("output.csv_writer", "file_path")
+        return None if file_path is None else Path(file_path)
+
+    def _get_config_value(self, node_str: str, key: str) -> Any:
+        """Returns the value of the config ``key`` of ``node_str`` after the
+        changes from the pipeline file and the CLI, or ``None`` if the
+        pipeline does not contain the node.
+        """
+        for name, config_updates_yml in self.node_loader.node_list:
+            if name != node_str:
+                continue
+            value = self.node_loader.config_loader.get(node_str)[key]
+            cli_updates = self.node_loader.config_updates_cli or {}
+            for updates in (config_updates_yml, cli_updates.get(node_str)):
+                if updates and key in updates:
+                    value = updates[key]
+            return value
+        return None
+
+    def _get_shard_config_updates(self, shard_index: int) -> str:
+        """Adds the shard selection and a per-shard CSV file to the
+        configuration changes passed from the CLI.
+        """
+        config_updates = copy.deepcopy(self.node_loader.config_updates_cli) or {}
+        config_updates.setdefault("input.visual", {}).update(
+            {"num_shards": self.num_workers, "shard_index": shard_index}
+        )
+        if self.csv_file_path is not None:
+            config_updates.setdefault("output.csv_writer", {})["file_path"] = str(
+                self.csv_file_path.with_name(
+                    f"{self.csv_file_path.stem}_shard{shard_index}"
+                    f"{self.csv_file_path.suffix}"
+                )
+            )
+        return str(config_updates)
+
+    def _get_shard_runner_kwargs(self, shard_index: int) -> Dict[str, Any]:
+        """Gives every shard its own ``profile_path`` file so that the workers
+        do not overwrite each other's statistics.
+        """
+        runner_kwargs = dict(self.runner_kwargs)
+        profile_path = runner_kwargs.get("profile_path")
+        if profile_path is not None:
+            profile_path = Path(profile_path)
+            runner_kwargs["profile_path"] = profile_path.with_name(
+                f"{profile_path.stem}_shard{shard_index}{profile_path.suffix}"
+            )
+        return runner_kwargs
+
+    @staticmethod
+    def _merge_csv_files(shard_paths: List[Path], output_path: Path) -> None:
+        """Concatenates the CSV files of the shards in order, keeping the
+        header of the first one, and deletes them.
+        """
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w", newline="") as outfile:
+            writer = csv.writer(outfile)
+            has_header = False
+            for path in shard_paths:
+                if not path.is_file():
+                    continue
+                with open(path, newline="") as infile:
+                    reader = csv.reader(infile)
+                    header = next(reader, None)
+                    if header is not None and not has_header:
+                        writer.writerow(header)
+                        has_header = True
+                    writer.writerows(reader)
+                path.unlink()
+
+
+def _run_shard(
+    pipeline_path: Path,
+    config_updates_cli: str,
+    custom_nodes_parent_subdir: str,
+    num_iter: Optional[int],
+    runner_kwargs: Dict[str, Any],
+) -> str:
+    """Runs the pipeline on one shard in a worker process.
+
+    Returns:
+        (str): Path to the CSV file written by ``output.csv_writer``, or an
+        empty string if the pipeline does not contain it.
+    """
+    runner = Runner(
+        pipeline_path=pipeline_path,
+        config_updates_cli=config_updates_cli,
+        custom_nodes_parent_subdir=custom_nodes_parent_subdir,
+        num_iter=num_iter,
+        **runner_kwargs,
+    )
+    runner.run()
+    for node in runner.pipeline.nodes:
+        if node.node_name == "output.csv_writer":
+            return str(node._file_path_datetime)  # pylint: disable=protected-access
+    return ""
@@ -0,0 +1,394 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Per-node latency, throughput and memory instrumentation for pipelines.
+"""
+
+import json
+import logging
+import os
+import sys
+import tracemalloc
+from array import array
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+
+NS_PER_MS = 1e6
+NS_PER_SEC = 1e9
+BYTES_PER_MB = 1024 * 1024
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+class NodeProfiler:
+    """Collects the latency of every node call in a pipeline.
+
+    Latencies are measured with :func:`time.perf_counter_ns` and stored as
+    64-bit integers, one compact array per node, so the overhead per call is
+    two clock reads and an append. Nodes are reported in the order they were
+    first called, under their position in the pipeline and name, e.g.,
+    ``2:model.yolo``, once the pipeline is registered with
+    :py:meth:`add_pipeline`, so that several instances of a node type are
+    reported separately. Otherwise they are reported under their name.
+
+    Args:
+        output_path (:obj:`pathlib.Path` | :obj:`str` | :obj:`None`): If
+            provided, :py:meth:`report` also writes the summary to this JSON
+            file.
+    """
+
+    def __init__(self, output_path: Optional[Union[Path, str]] = None) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.output_path = None if output_path is None else Path(output_path)
+        self._latencies: Dict[str, "array[int]"] = {}
+        # reported name of every registered node, by node identity
+        self._names: Dict[int, str] = {}
+
+    def add_pipeline(self, nodes: List[AbstractNode]) -> None:
+        """Reports the nodes of a pipeline under their position in it. Nodes
+        shared by several pipelines, e.g., the models of multiple streams,
+        keep the name of their first pipeline.
+
+        Args:
+            nodes (List[AbstractNode]): The nodes of the pipeline, in order.
+        """
+        for idx, node in enumerate(nodes):
+            self._names.setdefault(id(node), f"{idx}:{node.node_name}")
+
+    def get_name(self, node: AbstractNode) -> str:
+        """Returns the name the statistics of ``node`` are reported under."""
+        return self._names.get(id(node), node.node_name)
+
+    def run(self, node: AbstractNode, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Runs ``node`` with ``inputs`` and records how long it took.
+
+        Args:
+            node (AbstractNode): The node to run.
+            inputs (Dict[str, Any]): Inputs for the node.
+
+        Returns:
+            (Dict[str, Any]): Outputs of the node.
+        """
+        start = perf_counter_ns()
+        outputs = node.run(inputs)
+        self.record(self.get_name(node), perf_counter_ns() - start)
+        return outputs
+
+    def run_batch(
+        self, node: AbstractNode, inputs_batch: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Runs ``node`` on a batch of frames and records the time taken,
+        spread evenly across the frames so that latencies remain per frame.
+
+        Args:
+            node (AbstractNode): The node to run.
+            inputs_batch (List[Dict[str, Any]]): Inputs for the node, one per
+                frame.
+
+        Returns:
+            (List[Dict[str, Any]]): Outputs of the node, one per frame.
+        """
+        start = perf_counter_ns()
+        outputs = node.run_batch(inputs_batch)
+        elapsed_ns = perf_counter_ns() - start
+        name = self.get_name(node)
+        for _ in inputs_batch:
+            self.record(name, elapsed_ns // len(inputs_batch))
+        return outputs
+
+    def record(self, name: str, elapsed_ns: int) -> None:
+        """Records a single call of node ``name`` which took ``elapsed_ns``
+        nanoseconds.
+        """
+        latencies = self._latencies.get(name)
+        if latencies is None:
+            latencies = self._latencies.setdefault(name, array("q"))
+        latencies.append(elapsed_ns)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Computes per-node statistics.
+
+        Returns:
+            (Dict[str, Dict[str, float]]): For each node, the number of
+            ``calls``, ``total_s`` time spent, ``mean_ms``, ``p50_ms``,
+            ``p95_ms`` and ``p99_ms`` latencies, the ``throughput_fps`` the
+            node could sustain on its own, and its ``budget_share`` in percent
+            of the total time spent in all nodes.
+        """
+        samples = {
+            name: np.frombuffer(latencies, dtype=np.int64)
+            for name, latencies in self._latencies.items()
+            if latencies
+        }
+        totals = {name: int(values.sum()) for name, values in samples.items()}
+        grand_total = sum(totals.values())
+        stats = {}
+        for name, values in samples.items():
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            total = totals[name]
+            stats[name] = {
+                "calls": int(values.size),
+                "total_s": total / NS_PER_SEC,
+                "mean_ms": total / values.size / NS_PER_MS,
+                "p50_ms": p50 / NS_PER_MS,
+                "p95_ms": p95 / NS_PER_MS,
+                "p99_ms": p99 / NS_PER_MS,
+                "throughput_fps": values.size * NS_PER_SEC / total if total else 0.0,
+                "budget_share": 100 * total / grand_total if grand_total else 0.0,
+            }
+        return stats
+
+    def report(self) -> None:
+        """Logs the per-node summary as a table and writes it to
+        ``output_path`` if one was provided.
+        """
+        stats = self.summary()
+        if not stats:
+            self.logger.info("No node calls were profiled.")
+            return
+        name_width = max(len("Node"), *(len(name) for name in stats))
+        header = (
+            f"{'Node':<{name_width}} {'Calls':>8} {'Total (s)':>10} "
+            f"{'Mean (ms)':>10} {'p50 (ms)':>10} {'p95 (ms)':>10} "
+            f"{'p99 (ms)':>10} {'FPS':>9} {'Share (%)':>10}"
+        )
+        lines = [header, "-" * len(header)]
+        for name, node_stats in stats.items():
+            lines.append(
+                f"{name:<{name_width}} {node_stats['calls']:>8} "
+                f"{node_stats['total_s']:>10.2f} {node_stats['mean_ms']:>10.2f} "
+                f"{node_stats['p50_ms']:>10.2f} {node_stats['p95_ms']:>10.2f} "
+                f"{node_stats['p99_ms']:>10.2f} "
+                f"{node_stats['throughput_fps']:>9.2f} "
+                f"{node_stats['budget_share']:>10.1f}"
+            )
+        table = "\n".join(lines)
+        self.logger.info(f"Per-node latency summary:\n{table}")
+
+        if self.output_path is not None:
+            self.output_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.output_path, "w") as outfile:
+                json.dump(stats, outfile, indent=4)
+            self.logger.info(f"Per-node latency summary saved to {self.output_path}")
+
+
+class MemoryProfiler(NodeProfiler):
+    """Collects the memory used by every node call in addition to its
+    latency, to find the nodes responsible for running out of memory.
+
+    For every call, the profiler records:
+
+    - the change in memory allocated by Python, traced with
+      :mod:`tracemalloc`, and the peak allocation above the start of the
+      call;
+    - the change in resident set size (RSS) of the process, which also
+      covers native allocations, e.g., by TensorFlow and PyTorch. Only
+      available on Linux;
+    - the size of every value the node writes into the data pool.
+
+    Allocations are traced for the whole process, so when nodes run
+    concurrently, e.g., in pipelined execution, the deltas of a call include
+    the allocations of the other threads. Tracing slows down allocations,
+    which inflates the latencies as well.
+
+    Args:
+        output_path (:obj:`pathlib.Path` | :obj:`str` | :obj:`None`): If
+            provided, :py:meth:`report` also writes the summary to this JSON
+            file.
+    """
+
+    def __init__(self, output_path: Optional[Union[Path, str]] = None) -> None:
+        super().__init__(output_path)
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        # Python allocation delta, Python peak and RSS delta of every call
+        self._memory: Dict[str, Tuple["array[int]", ...]] = {}
+        self._output_sizes: Dict[str, Dict[str, "array[int]"]] = {}
+        self.has_rss = _get_rss() is not None
+
+    def run(self, node: AbstractNode, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Runs ``node`` with ``inputs`` and records how long it took, how
+        much memory it allocated and the size of its outputs.
+        """
+        start = self._start_call()
+        outputs = super().run(node, inputs)
+        self._end_call(self.get_name(node), start, [outputs])
+        return outputs
+
+    def run_batch(
+        self, node: AbstractNode, inputs_batch: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Runs ``node`` on a batch of frames. The memory deltas are recorded
+        once for the whole batch, and the output sizes once per frame.
+        """
+        start = self._start_call()
+        outputs_batch = super().run_batch(node, inputs_batch)
+        self._end_call(self.get_name(node), start, outputs_batch)
+        return outputs_batch
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Computes per-node statistics.
+
+        Returns:
+            (Dict[str, Dict[str, Any]]): The latency statistics of
+            :py:meth:`NodeProfiler.summary` and, for each node, the mean and
+            maximum change in Python allocations, ``py_delta_mean_mb`` and
+            ``py_delta_max_mb``, the maximum Python peak ``py_peak_max_mb``,
+            the mean, maximum and total change in RSS, ``rss_delta_mean_mb``,
+            ``rss_delta_max_mb`` and ``rss_delta_total_mb``, or ``None`` if
+            the RSS is not available, and the mean and maximum size of every
+            key it writes, ``outputs``.
+        """
+        stats: Dict[str, Dict[str, Any]] = super().summary()
+        for name, node_stats in stats.items():
+            if name not in self._memory:
+                continue
+            py_delta, py_peak, rss_delta = (
+                np.frombuffer(values, dtype=np.int64) / BYTES_PER_MB
+                for values in self._memory[name]
+            )
+            node_stats.update(
+                {
+                    "py_delta_mean_mb": float(py_delta.mean()),
+                    "py_delta_max_mb": float(py_delta.max()),
+                    "py_peak_max_mb": float(py_peak.max()),
+                    "rss_delta_mean_mb": None,
+                    "rss_delta_max_mb": None,
+                    "rss_delta_total_mb": None,
+                    "outputs": {},
+                }
+            )
+            if self.has_rss:
+                node_stats["rss_delta_mean_mb"] = float(rss_delta.mean())
+                node_stats["rss_delta_max_mb"] = float(rss_delta.max())
+                node_stats["rss_delta_total_mb"] = float(rss_delta.sum())
+            for key, sizes in self._output_sizes[name].items():
+                values = np.frombuffer(sizes, dtype=np.int64) / BYTES_PER_MB
+                node_stats["outputs"][key] = {
+                    "mean_mb": float(values.mean()),
+                    "max_mb": float(values.max()),
+                }
+        return stats
+
+    def report(self) -> None:
+        """Logs the per-node latency and memory summaries as tables and
+        writes them to ``output_path`` if one was provided. Stops tracing
+        Python allocations if this profiler started it.
+        """
+        super().report()
+        stats = self.summary()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        stats = {name: values for name, values in stats.items() if "outputs" in values}
+        if not stats:
+            return
+
+        def _format(value: Optional[float], width: int) -> str:
+            return f"{'n/a':>{width}}" if value is None else f"{value:>{width}.2f}"
+
+        name_width = max(len("Node"), *(len(name) for name in stats))
+        header = (
+            f"{'Node':<{name_width}} {'Py mean':>9} {'Py max':>9} "
+            f"{'Py peak':>9} {'RSS mean':>9} {'RSS max':>9} {'RSS total':>10} "
+            f"{'Outputs':>9}"
+        )
+        lines = [header, "-" * len(header)]
+        for name, node_stats in stats.items():
+            outputs_mb = sum(size["max_mb"] for size in node_stats["outputs"].values())
+            lines.append(
+                f"{name:<{name_width}} {node_stats['py_delta_mean_mb']:>9.2f} "
+                f"{node_stats['py_delta_max_mb']:>9.2f} "
+                f"{node_stats['py_peak_max_mb']:>9.2f} "
+                f"{_format(node_stats['rss_delta_mean_mb'], 9)} "
+                f"{_format(node_stats['rss_delta_max_mb'], 9)} "
+                f"{_format(node_stats['rss_delta_total_mb'], 10)} "
+                f"{outputs_mb:>9.2f}"
+            )
+            for key, size in sorted(
+                node_stats["outputs"].items(), key=lambda item: -item[1]["max_mb"]
+            ):
+                lines.append(
+                    f"    {key}: mean {size['mean_mb']:.2f} MB, "
+                    f"max {size['max_mb']:.2f} MB"
+                )
+        table = "\n".join(lines)
+        self.logger.info(
+            "Per-node memory summary (MB), Py: Python allocations, "
+            f"RSS: resident set size, Outputs: largest data pool values:\n{table}"
+        )
+
+    @staticmethod
+    def _start_call() -> Tuple[int, Optional[int]]:
+        """Returns the traced Python allocations and the RSS before a call."""
+        if hasattr(tracemalloc, "reset_peak"):
+            # Otherwise the peak is the highest since tracing started
+            tracemalloc.reset_peak()
+        return tracemalloc.get_traced_memory()[0], _get_rss()
+
+    def _end_call(
+        self,
+        name: str,
+        start: Tuple[int, Optional[int]],
+        outputs_batch: List[Dict[str, Any]],
+    ) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        rss = _get_rss()
+        start_current, start_rss = start
+        memory = self._memory.get(name)
+        if memory is None:
+            memory = self._memory.setdefault(name, (array("q"), array("q"), array("q")))
+            self._output_sizes.setdefault(name, {})
+        memory[0].append(current - start_current)
+        memory[1].append(max(peak - start_current, 0))
+        memory[2].append(0 if rss is None or start_rss is None else rss - start_rss)
+        output_sizes = self._output_sizes[name]
+        for outputs in outputs_batch:
+            for key, value in outputs.items():
+                sizes = output_sizes.get(key)
+                if sizes is None:
+                    sizes = output_sizes.setdefault(key, array("q"))
+                sizes.append(_sizeof(value))
+
+
+def _get_rss() -> Optional[int]:
+    """Returns the resident set size of the process in bytes, or ``None`` if
+    it is not available on this platform.
+    """
+    try:
+        with open("/proc/self/statm") as infile:
+            return int(infile.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _sizeof(value: Any) -> int:
+    """Returns the size of ``value`` in bytes, including the items of lists,
+    tuples and dictionaries.
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_sizeof(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            _sizeof(key) + _sizeof(item) for key, item in value.items()
+        )
+    return sys.getsizeof(value)
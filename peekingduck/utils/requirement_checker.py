@@ -15,7 +15,7 @@
 """Python package requirements checker."""
 
 import collections
-import importlib
+import importlib.abc
 import logging
 import subprocess
 import sys
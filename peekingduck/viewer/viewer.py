@@ -16,7 +16,7 @@
 Implement PeekingDuck Viewer
 """
 
-from typing import List
+from typing import List, Optional
 from contextlib import redirect_stderr
 from pathlib import Path
 import logging
@@ -28,12 +28,13 @@ import tkinter as tk
 from tkinter import filedialog
 from tkinter.messagebox import askyesno, showerror
 import threading
-import copy
 import cv2
 import numpy as np
 from PIL import Image, ImageTk
 from peekingduck.declarative_loader import DeclarativeLoader
+from peekingduck.pipeline.data_pool import get_node_inputs
 from peekingduck.pipeline.pipeline import Pipeline
+from peekingduck.utils.profiler import NodeProfiler
 from peekingduck.viewer.playlist import PlayList
 from peekingduck.viewer.viewer_gui import create_window
 from peekingduck.viewer.viewer_utils import (
@@ -73,17 +74,22 @@ def parse_streams(io_stream: StringIO) -> str:
 class Viewer:  # pylint: disable=too-many-instance-attributes, too-many-public-methods
     """Implement PeekingDuck Viewer class"""
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         pipeline_path: Path,
         config_updates_cli: str,
         custom_nodes_parent_subdir: str,
         num_iter: int = 0,
+        profile: bool = False,
+        profile_path: Optional[Path] = None,
     ) -> None:
         self.logger = logging.getLogger(__name__)
         self.config_updates_cli = config_updates_cli
         self.custom_nodes_parent_path = custom_nodes_parent_subdir
         self.num_iter = num_iter
+        self.profile = profile or profile_path is not None
+        self.profile_path = profile_path
+        self.profiler: Optional[NodeProfiler] = None
         # init PlayList object
         self.home_path = Path.home()
         self.playlist = PlayList(self.home_path)
@@ -512,6 +518,8 @@ class Viewer:  # pylint: disable=too-many-instance-attributes, too-many-public-m
         for node in self._pipeline.nodes:
             if node.name.endswith("input.visual"):
                 node.release_resources()  # clean up nodes with threads
+        if self.profiler is not None:
+            self.profiler.report()
         self.is_pipeline_running = False
         self._enable_slider()
         self.set_viewer_state_to_stop()
@@ -532,23 +540,14 @@ class Viewer:  # pylint: disable=too-many-instance-attributes, too-many-public-m
                         self._pipeline.terminate = True
                         if "pipeline_end" not in node.inputs:
                             continue
-                    if "all" in node.inputs:
-                        inputs = copy.deepcopy(self._pipeline.data)
-                    else:
-                        inputs = {
-                            key: self._pipeline.data[key]
-                            for key in node.inputs
-                            if key in self._pipeline.data
-                        }
-                    if hasattr(node, "optional_inputs"):
-                        # Nodes won't receive inputs with optional key if not found upstream
-                        for key in node.optional_inputs:
-                            if key in self._pipeline.data:
-                                inputs[key] = self._pipeline.data[key]
                     if node.name.endswith("output.screen"):
                         pass  # disable duplicate video from output.screen
                     else:
-                        outputs = node.run(inputs)
+                        inputs = get_node_inputs(node, self._pipeline.data)
+                        if self.profiler is None:
+                            outputs = node.run(inputs)
+                        else:
+                            outputs = self.profiler.run(node, inputs)
                         self._pipeline.data.update(outputs)
                     # check for FPS on first iteration
                     if self._frame_idx == 0 and node.name.endswith("input.visual"):
@@ -604,6 +603,10 @@ class Viewer:  # pylint: disable=too-many-instance-attributes, too-many-public-m
                     pkd_viewer=True,
                 )
                 self._pipeline: Pipeline = self._node_loader.get_pipeline()
+                if self.profile:
+                    # fresh statistics for every pipeline run from the viewer
+                    self.profiler = NodeProfiler(self.profile_path)
+                    self.profiler.add_pipeline(self._pipeline.nodes)
             except Exception:  # pylint: disable=broad-except
                 err_runtime = True
                 exc_msg = traceback.format_exc()
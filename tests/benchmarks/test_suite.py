@@ -0,0 +1,173 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import cv2
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from peekingduck.benchmarks.__main__ import main
+from peekingduck.benchmarks.suite import REFERENCE_PIPELINES, BenchmarkSuite
+from peekingduck.benchmarks.synthetic import SyntheticModel, SyntheticScene
+
+WIDTH, HEIGHT = 160, 120
+NUM_FRAMES = 4
+STAT_KEYS = {
+    "calls",
+    "total_s",
+    "mean_ms",
+    "p50_ms",
+    "p95_ms",
+    "p99_ms",
+    "throughput_fps",
+    "budget_share",
+}
+# draw.legend sizes its box from the height of an empty text, which is 0
+# with some OpenCV versions
+HAS_TEXT_HEIGHT = cv2.getTextSize("", cv2.FONT_HERSHEY_SIMPLEX, 1, 1)[0][1] > 0
+
+
+def run_cli(output_path, args):
+    return CliRunner().invoke(
+        main,
+        [
+            "--output",
+            str(output_path),
+            "--num_frames",
+            str(NUM_FRAMES),
+            "--width",
+            str(WIDTH),
+            "--height",
+            str(HEIGHT),
+            "--repeats",
+            "1",
+        ]
+        + args,
+    )
+
+
+@pytest.fixture
+def scene():
+    return SyntheticScene(WIDTH, HEIGHT, num_objects=3)
+
+
+class TestSynthetic:
+    def test_scene_is_deterministic(self, scene):
+        other = SyntheticScene(WIDTH, HEIGHT, num_objects=3)
+
+        assert scene.frame(0).shape == (HEIGHT, WIDTH, 3)
+        np.testing.assert_array_equal(scene.frame(5), other.frame(5))
+        for idx in range(0, 200, 7):
+            bboxes = scene.bboxes(idx)
+            assert bboxes.shape == (3, 4)
+            assert ((bboxes >= 0) & (bboxes <= 1)).all()
+            assert (bboxes[:, 2:] > bboxes[:, :2]).all()
+
+    @pytest.mark.parametrize("task", ["detection", "pose", "crowd", "segmentation"])
+    def test_synthetic_model_outputs(self, scene, task):
+        node = SyntheticModel(scene, task)
+        outputs = node.run({"img": scene.frame(0)})
+
+        assert sorted(outputs) == sorted(node.outputs)
+        if task == "pose":
+            assert outputs["keypoints"].shape == (3, 17, 2)
+        elif task == "crowd":
+            assert outputs["density_map"].sum() == pytest.approx(3, rel=0.05)
+        elif task == "segmentation":
+            assert outputs["masks"].shape == (3, HEIGHT, WIDTH)
+
+
+class TestBenchmarkSuite:
+    def test_run(self):
+        suite = BenchmarkSuite(
+            num_frames=NUM_FRAMES,
+            width=WIDTH,
+            height=HEIGHT,
+            repeats=2,
+            pipelines=["privacy_protection", "pose_estimation"],
+        )
+        results = suite.run()
+
+        assert results["metadata"]["frame_size"] == [WIDTH, HEIGHT]
+        assert list(results["pipelines"]) == ["privacy_protection", "pose_estimation"]
+        pipeline = results["pipelines"]["privacy_protection"]
+        assert pipeline["fps"] > 0
+        assert pipeline["nodes"]["4:draw.blur_bbox"]["calls"] == NUM_FRAMES
+        assert results["nodes"]["input.visual[video]"]["calls"] == NUM_FRAMES
+        assert results["nodes"]["input.visual[images]"]["calls"] == NUM_FRAMES
+        assert results["nodes"]["draw.poses"]["calls"] == 2
+        # output.media_writer is shared by both pipelines but timed once
+        assert results["nodes"]["output.media_writer"]["calls"] == 2
+
+    def test_unavailable_model_is_reported(self):
+        suite = BenchmarkSuite(
+            num_frames=NUM_FRAMES,
+            width=WIDTH,
+            height=HEIGHT,
+            pipelines=["privacy_protection"],
+            models=["model.does_not_exist"],
+        )
+        results = suite.run()
+
+        assert "error" in results["nodes"]["model.does_not_exist"]
+
+    def test_invalid_pipeline(self):
+        with pytest.raises(ValueError, match="Unknown pipelines"):
+            BenchmarkSuite(pipelines=["does_not_exist"])
+
+    def test_cli_writes_json(self, tmp_path):
+        output_path = tmp_path / "results" / "benchmark.json"
+        result = run_cli(output_path, ["--pipeline", "group_detection"])
+
+        assert result.exit_code == 0, result.output
+        with open(output_path) as infile:
+            results = json.load(infile)
+        assert list(results["pipelines"]) == ["group_detection"]
+        assert results["nodes"]["dabble.group_nearby_objs"]["calls"] == 1
+
+    @pytest.mark.skipif(not HAS_TEXT_HEIGHT, reason="draw.legend cannot size its box")
+    def test_cli_runs_reference_pipeline(self, tmp_path):
+        output_path = tmp_path / "benchmark.json"
+        result = run_cli(output_path, ["--pipeline", "object_detection"])
+
+        assert result.exit_code == 0, result.output
+        with open(output_path) as infile:
+            results = json.load(infile)
+        assert set(results) == {"metadata", "nodes", "pipelines"}
+        pipeline = results["pipelines"]["object_detection"]
+        assert set(pipeline) == {"source", "num_frames", "total_s", "fps", "nodes"}
+        _, specs = REFERENCE_PIPELINES["object_detection"]
+        names = ["input.visual"] + [spec.name for spec in specs]
+        assert list(pipeline["nodes"]) == [
+            f"{idx}:{name}" for idx, name in enumerate(names)
+        ]
+        for stats in pipeline["nodes"].values():
+            assert set(stats) == STAT_KEYS
+        for name in ["input.visual[video]"] + names[1:]:
+            assert set(results["nodes"][name]) == STAT_KEYS
+
+    def test_cli_exits_with_error_on_failure(self, tmp_path):
+        output_path = tmp_path / "benchmark.json"
+        result = run_cli(
+            output_path,
+            ["--pipeline", "group_detection", "--model", "model.does_not_exist"],
+        )
+
+        assert result.exit_code == 1
+        with open(output_path) as infile:
+            results = json.load(infile)
+        assert "error" in results["nodes"]["model.does_not_exist"]
+        assert "fps" in results["pipelines"]["group_detection"]
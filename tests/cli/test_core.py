@@ -256,6 +256,25 @@ class TestCliCore:
             assert_msg_in_logs(f"Run pipeline for {n} iterations", captured.records)
             assert result.exit_code == 0
 
+    @pytest.mark.parametrize(
+        "args, options",
+        [
+            (["--pipelined"], "--pipelined"),
+            (
+                ["--batch_size", "4", "--cache_dir", "cache"],
+                "--batch_size, --cache_dir",
+            ),
+            (["--stream", "0", "--num_workers", "2"], "--num_workers, --stream"),
+            (["--cache_size", "64"], "--cache_size"),
+        ],
+    )
+    def test_run_viewer_unsupported_options(self, args, options):
+        setup()
+        result = CliRunner().invoke(cli, ["run", "--viewer"] + args)
+
+        assert result.exit_code == 2
+        assert f"--viewer cannot be combined with {options}" in result.output
+
     @mock.patch("peekingduck.commands.core.Runner", MockRunner)
     def test_verify_install(self):
         """Checks that verify install runs the basic object detection
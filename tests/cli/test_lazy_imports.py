@@ -0,0 +1,95 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Guards the startup cost of the CLI and of nodes which do not need a deep
+learning framework.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PKD_ROOT_DIR = Path(__file__).resolve().parents[2]
+HEAVY_MODULES = ["PIL", "tensorflow", "tkinter", "torch"]
+# Generous upper bound, importing TensorFlow or PyTorch alone takes longer
+CLI_IMPORT_BUDGET_S = 1.5
+
+
+def import_module(module):
+    """Imports ``module`` in a fresh interpreter.
+
+    Returns:
+        (Tuple[float, List[str]]): The cumulative import time of ``module`` in
+        seconds, measured with ``-X importtime``, and the heavy modules which
+        were loaded along with it.
+    """
+    code = (
+        f"import sys; import {module}; "
+        f"print('loaded:' + ','.join(m for m in {HEAVY_MODULES!r} "
+        "if m in sys.modules))"
+    )
+    env = dict(os.environ, PYTHONPATH=str(PKD_ROOT_DIR))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        cwd=PKD_ROOT_DIR,
+        env=env,
+        text=True,
+    )
+    cumulative_us = 0
+    for line in proc.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            cumulative_us = int(fields[1])
+    loaded = proc.stdout.split("loaded:")[-1].strip()
+    return cumulative_us / 1e6, loaded.split(",") if loaded else []
+
+
+class TestLazyImports:
+    def test_cli_import_is_light(self):
+        import_time, loaded = import_module("peekingduck.cli")
+
+        assert loaded == []
+        assert 0 < import_time < CLI_IMPORT_BUDGET_S
+
+    @pytest.mark.parametrize(
+        "module",
+        [
+            "peekingduck.pipeline.nodes.input.visual",
+            "peekingduck.pipeline.nodes.draw.bbox",
+            "peekingduck.pipeline.nodes.dabble.tracking",
+            "peekingduck.pipeline.nodes.output.media_writer",
+        ],
+    )
+    def test_opencv_nodes_do_not_import_frameworks(self, module):
+        _, loaded = import_module(module)
+
+        assert loaded == []
+
+    @pytest.mark.parametrize(
+        "module, expected",
+        [
+            ("peekingduck.pipeline.nodes.model.mtcnn", ["tensorflow"]),
+            ("peekingduck.pipeline.nodes.model.yolox", ["torch"]),
+        ],
+    )
+    def test_model_nodes_import_own_framework(self, module, expected):
+        _, loaded = import_module(module)
+
+        assert [name for name in loaded if name in ("tensorflow", "torch")] == expected
@@ -16,6 +16,7 @@ import gc
 import os
 import shutil
 import tempfile
+import threading
 from contextlib import contextmanager
 from pathlib import Path
 
@@ -25,6 +26,9 @@ import pytest
 import tensorflow.keras.backend as K
 import yaml
 
+from peekingduck.pipeline.data_pool import get_node_inputs
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+
 HUMAN_IMAGES = ["t1.jpg", "t2.jpg", "t4.jpg"]
 NO_HUMAN_IMAGES = ["black.jpg", "t3.jpg"]
 
@@ -267,3 +271,79 @@ def assert_msg_in_logs(msg: str, msg_logs) -> None:
             res = True
             break
     assert res
+
+
+def run_node(node, data):
+    """Runs ``node`` on the inputs it requires from the data pool ``data``,
+    like the runner does.
+    """
+    return node.run(get_node_inputs(node, data))
+
+
+class SourceNode(AbstractNode):
+    """Stub input node which outputs ``num_frames`` frames and then ends the
+    pipeline.
+
+    Args:
+        num_frames (int): Number of frames before the pipeline ends.
+        make_outputs (Callable[[int], Dict[str, Any]]): Returns the outputs of
+            the ``idx``-th frame, counting from 1. Defaults to a ``count`` of
+            ``idx``.
+        end_outputs (Dict[str, Any]): Outputs of the frame which ends the
+            pipeline, in addition to ``pipeline_end``.
+    """
+
+    def __init__(self, num_frames, make_outputs=None, end_outputs=None):
+        self.make_outputs = make_outputs or (lambda idx: {"count": idx})
+        super().__init__(
+            {"input": ["none"], "output": [*self.make_outputs(1), "pipeline_end"]},
+            node_path="input.source",
+        )
+        self.num_frames = num_frames
+        self.end_outputs = end_outputs or {}
+        self.count = 0
+
+    def run(self, inputs):
+        if self.count >= self.num_frames:
+            return {**self.end_outputs, "pipeline_end": True}
+        self.count += 1
+        return {**self.make_outputs(self.count), "pipeline_end": False}
+
+
+def counting_source(num_frames, key="count"):
+    """Returns a ``SourceNode`` which outputs the frame number, counting from
+    1, as ``key``, including on the frame which ends the pipeline.
+    """
+    return SourceNode(num_frames, lambda idx: {key: idx}, {key: num_frames + 1})
+
+
+class SinkNode(AbstractNode):
+    """Stub output node which records the inputs of every call in
+    ``received`` and the threads it ran in in ``threads``.
+
+    Args:
+        inputs (List[str]): Inputs of the node.
+        stop_at (Optional[int]): If provided, the node ends the pipeline once
+            its ``count`` input reaches this value.
+        node_path (str): Node path, for nodes which are treated differently
+            by type.
+    """
+
+    def __init__(self, inputs, stop_at=None, node_path="output.sink"):
+        super().__init__(
+            {
+                "input": inputs,
+                "output": ["none"] if stop_at is None else ["pipeline_end"],
+            },
+            node_path=node_path,
+        )
+        self.stop_at = stop_at
+        self.received = []
+        self.threads = set()
+
+    def run(self, inputs):
+        self.received.append(dict(inputs))
+        self.threads.add(threading.get_ident())
+        if self.stop_at is None:
+            return {}
+        return {"pipeline_end": inputs["count"] == self.stop_at}
@@ -17,13 +17,15 @@ import random
 import string
 import sys
 import textwrap
+import threading
 from pathlib import Path
 from unittest import mock
 
 import pytest
 import yaml
 
-from peekingduck.declarative_loader import DeclarativeLoader
+from peekingduck.declarative_loader import DeclarativeLoader, NodeList
+from peekingduck.pipeline.nodes.base import WeightsDownloader
 
 PKD_NODE_TYPE = "input"
 PKD_NODE_NAME = "pkd_node_name"
@@ -188,6 +190,126 @@ class TestDeclarativeLoader:
                 for idx, output in enumerate(node):
                     assert output == ground_truth[node_num][idx]
 
+    def test_instantiate_model_nodes_serially(self, declarativeloader):
+        declarativeloader.node_list = NodeList(
+            ["input.visual", "model.yolo", "model.hrnet", "draw.poses"]
+        )
+        init_order = []
+        init_threads = set()
+
+        def init_node(path_to_node, node_name, config_loader, config_updates):
+            init_order.append(node_name)
+            init_threads.add(threading.current_thread())
+            return node_name
+
+        with mock.patch(
+            "peekingduck.declarative_loader.DeclarativeLoader._init_node",
+            wraps=init_node,
+        ):
+            instantiated_nodes = declarativeloader._instantiate_nodes()
+
+        assert instantiated_nodes == [
+            "input.visual",
+            "model.yolo",
+            "model.hrnet",
+            "draw.poses",
+        ]
+        assert init_order == ["input.visual", "draw.poses", "model.yolo", "model.hrnet"]
+        assert init_threads == {threading.main_thread()}
+
+    def test_download_model_weights_concurrently(self, declarativeloader):
+        declarativeloader.node_list = NodeList(
+            ["input.visual", "model.yolo", "model.hrnet", "model.hrnet"]
+        )
+        # Both weights have to be downloading at the same time to pass
+        barrier = threading.Barrier(2, timeout=5)
+        downloaded = []
+
+        def get_weights_config(node_str, config_updates):
+            return {"model_subdir": node_str}
+
+        def download_weights(downloader):
+            barrier.wait()
+            downloaded.append(downloader.config["model_subdir"])
+
+        def init_node(path_to_node, node_name, config_loader, config_updates):
+            if node_name.startswith("model."):
+                assert len(downloaded) == 2
+            return node_name
+
+        with mock.patch(
+            "peekingduck.declarative_loader.DeclarativeLoader._get_weights_config",
+            wraps=get_weights_config,
+        ), mock.patch.object(
+            WeightsDownloader,
+            "weights_path",
+            new=property(lambda downloader: Path(downloader.config["model_subdir"])),
+        ), mock.patch.object(
+            WeightsDownloader,
+            "download_weights",
+            autospec=True,
+            side_effect=download_weights,
+        ), mock.patch(
+            "peekingduck.declarative_loader.DeclarativeLoader._init_node",
+            wraps=init_node,
+        ):
+            declarativeloader._instantiate_nodes()
+
+        assert sorted(downloaded) == ["model.hrnet", "model.yolo"]
+
+    def test_instantiate_nodes_reraises_init_error(self, declarativeloader):
+        declarativeloader.node_list = NodeList(["model.yolo", "model.hrnet"])
+
+        def init_node(path_to_node, node_name, config_loader, config_updates):
+            raise ValueError(f"{node_name} failed")
+
+        with mock.patch(
+            "peekingduck.declarative_loader.DeclarativeLoader._init_node",
+            wraps=init_node,
+        ):
+            with pytest.raises(ValueError, match="model.yolo failed"):
+                declarativeloader._instantiate_nodes()
+
+    def test_instantiate_nodes_validates_other_nodes_first(self, declarativeloader):
+        declarativeloader.node_list = NodeList(
+            ["input.visual", "model.yolo", "model.hrnet", "draw.poses"]
+        )
+        init_order = []
+
+        def init_node(path_to_node, node_name, config_loader, config_updates):
+            init_order.append(node_name)
+            if node_name == "draw.poses":
+                raise ValueError(f"{node_name} failed")
+            return node_name
+
+        with mock.patch(
+            "peekingduck.declarative_loader.DeclarativeLoader._init_node",
+            wraps=init_node,
+        ):
+            with pytest.raises(ValueError, match="draw.poses failed"):
+                declarativeloader._instantiate_nodes()
+
+        assert init_order == ["input.visual", "draw.poses"]
+
+    def test_instantiate_nodes_ignores_download_error(self, declarativeloader):
+        declarativeloader.node_list = NodeList(["model.yolo", "model.hrnet"])
+
+        def get_weights_config(node_str, config_updates):
+            raise FileNotFoundError("weights_parent_dir does not exist")
+
+        def init_node(path_to_node, node_name, config_loader, config_updates):
+            raise ValueError(f"{node_name} failed")
+
+        with mock.patch(
+            "peekingduck.declarative_loader.DeclarativeLoader._get_weights_config",
+            wraps=get_weights_config,
+        ), mock.patch(
+            "peekingduck.declarative_loader.DeclarativeLoader._init_node",
+            wraps=init_node,
+        ):
+            with pytest.raises(ValueError, match="model.yolo failed"):
+                declarativeloader._instantiate_nodes()
+
     def test_init_node_pkd(self, declarativeloader):
         path_to_node = ""
         node_name = PKD_NODE
@@ -23,6 +23,7 @@ import yaml
 
 from peekingduck.pipeline.nodes.base import (
     PEEKINGDUCK_WEIGHTS_SUBDIR,
+    WeightsDownloader,
     WeightsDownloaderMixin,
 )
 from tests.conftest import PKD_DIR, do_nothing
@@ -89,6 +90,16 @@ class TestWeightsDownloaderMixin:
             / weights_model.config["model_format"]
         )
 
+    def test_weights_downloader_weights_path(self, weights_model):
+        parent_dir = Path.cwd().resolve().parent
+        weights_model.config["weights_parent_dir"] = parent_dir
+        downloader = WeightsDownloader(weights_model.config)
+
+        assert (
+            downloader.weights_path
+            == weights_model._find_paths() / weights_model.model_filename
+        )
+
     def test_custom_parent_dir(self, weights_model):
         """Checks that _find_paths() gives the correct path when
         `weights_parents_dir` is a valid custom path.
@@ -0,0 +1,150 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from peekingduck.pipeline.nodes.input.utils import file_scanner
+from peekingduck.pipeline.nodes.input.utils.file_scanner import (
+    FileScanner,
+    PeekableIterator,
+)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for path in ["c.jpg", "a.png", "b.jpg", "x/b.jpg", "x/y/a.jpg", "w/a.png"]:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).touch()
+    return tmp_path
+
+
+def _relative(paths, root):
+    return [str(path.relative_to(root).as_posix()) for path in paths]
+
+
+class TestFileScanner:
+    def test_lists_top_level_files_in_sorted_order(self, tree):
+        scanner = FileScanner(tree)
+
+        assert _relative(scanner, tree) == ["a.png", "b.jpg", "c.jpg"]
+        assert scanner.num_files == 3
+
+    def test_recursive(self, tree):
+        scanner = FileScanner(tree, recursive=True)
+
+        assert _relative(scanner, tree) == [
+            "a.png",
+            "b.jpg",
+            "c.jpg",
+            "w/a.png",
+            "x/b.jpg",
+            "x/y/a.jpg",
+        ]
+        assert scanner.num_files is None
+
+    def test_pattern(self, tree):
+        scanner = FileScanner(tree, recursive=True, pattern="*.jpg")
+
+        assert _relative(scanner, tree) == ["b.jpg", "c.jpg", "x/b.jpg", "x/y/a.jpg"]
+
+    def test_subdirectories_are_listed_when_reached(self, tree):
+        paths = iter(FileScanner(tree, recursive=True))
+        next(paths)
+        (tree / "x" / "late.jpg").touch()
+
+        assert "x/late.jpg" in _relative(paths, tree)
+
+    def test_large_flat_directory_is_yielded_in_sorted_chunks(self, tmp_path):
+        names = [f"{i:03d}.jpg" for i in range(100)]
+        for name in reversed(names):
+            (tmp_path / name).touch()
+        scanner = FileScanner(tmp_path, chunk_size=16)
+        paths = _relative(scanner, tmp_path)
+
+        assert sorted(paths) == names
+        for start in range(0, len(paths), 16):
+            chunk = paths[start : start + 16]
+            assert chunk == sorted(chunk)
+        assert scanner.num_files is None
+        assert FileScanner(tmp_path, chunk_size=100).num_files == 100
+        assert _relative(FileScanner(tmp_path, chunk_size=100), tmp_path) == names
+
+    def test_large_flat_directory_is_read_one_chunk_at_a_time(self, tmp_path):
+        for i in range(100):
+            (tmp_path / f"{i:03d}.jpg").touch()
+        num_read = []
+        scandir = os.scandir
+
+        def counting_scandir(directory):
+            entries = scandir(directory)
+            num_read.append(0)
+
+            class Entries:
+                def __enter__(self):
+                    return self
+
+                def __exit__(self, *exc_info):
+                    entries.close()
+
+                def __iter__(self):
+                    for entry in entries:
+                        num_read[-1] += 1
+                        yield entry
+
+            return Entries()
+
+        with mock.patch.object(file_scanner.os, "scandir", counting_scandir):
+            next(iter(FileScanner(tmp_path, recursive=True, chunk_size=16)))
+
+        assert num_read == [16]
+
+    def test_recursive_terminates_on_symlink_loop(self, tree):
+        try:
+            os.symlink(tree, tree / "x" / "loop", target_is_directory=True)
+        except (NotImplementedError, OSError):
+            pytest.skip("symbolic links are not supported")
+
+        assert _relative(FileScanner(tree, recursive=True), tree) == [
+            "a.png",
+            "b.jpg",
+            "c.jpg",
+            "w/a.png",
+            "x/b.jpg",
+            "x/y/a.jpg",
+        ]
+
+    def test_invalid_chunk_size(self, tree):
+        with pytest.raises(ValueError) as excinfo:
+            FileScanner(tree, chunk_size=0)
+        assert "must be a positive integer" in str(excinfo.value)
+
+
+class TestPeekableIterator:
+    def test_upcoming_does_not_consume(self):
+        items = PeekableIterator(iter(range(5)))
+        upcoming = items.upcoming()
+
+        assert [next(upcoming), next(upcoming)] == [0, 1]
+        assert list(items) == [0, 1, 2, 3, 4]
+
+    def test_bool(self):
+        items = PeekableIterator([1])
+        assert items
+        assert next(items) == 1
+        assert not items
+        assert list(PeekableIterator(Path(".").glob("does_not_exist*"))) == []
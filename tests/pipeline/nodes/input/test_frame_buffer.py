@@ -0,0 +1,117 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+import numpy as np
+import pytest
+
+from peekingduck.pipeline.nodes.input.utils.frame_buffer import FrameBuffer
+from peekingduck.pipeline.nodes.input.utils.read import VideoThread
+
+
+def _drain(buffer):
+    frames = []
+    while True:
+        frame = buffer.get()
+        if frame is None:
+            return frames
+        frames.append(frame)
+
+
+class TestFrameBuffer:
+    def test_unbounded_keeps_all_frames(self):
+        buffer = FrameBuffer()
+        for i in range(100):
+            buffer.put(i)
+
+        assert buffer.high_water_mark == 100
+        assert _drain(buffer) == list(range(100))
+        assert buffer.num_dropped == 0
+
+    @pytest.mark.parametrize(
+        "policy, expected",
+        [
+            ("drop_oldest", [2, 3, 4]),
+            ("drop_newest", [0, 1, 2]),
+            ("latest", [4]),
+        ],
+    )
+    def test_drop_policies(self, policy, expected):
+        buffer = FrameBuffer(3, policy)
+        for i in range(5):
+            buffer.put(i)
+
+        assert _drain(buffer) == expected
+        assert buffer.num_dropped == 5 - len(expected)
+        assert buffer.high_water_mark == len(expected)
+
+    def test_block_waits_for_consumer(self):
+        buffer = FrameBuffer(2, "block")
+        buffer.put(0)
+        buffer.put(1)
+        producer = threading.Thread(target=buffer.put, args=(2,))
+        producer.start()
+        producer.join(timeout=0.2)
+        assert producer.is_alive()
+
+        assert buffer.get() == 0
+        producer.join(timeout=5)
+        assert not producer.is_alive()
+        assert _drain(buffer) == [1, 2]
+        assert buffer.num_dropped == 0
+
+    def test_close_releases_blocked_producer(self):
+        buffer = FrameBuffer(1, "block")
+        buffer.put(0)
+        producer = threading.Thread(target=buffer.put, args=(1,))
+        producer.start()
+        buffer.close()
+        producer.join(timeout=5)
+
+        assert not producer.is_alive()
+        assert _drain(buffer) == [0]
+
+    def test_invalid_config(self):
+        with pytest.raises(ValueError, match="buffer_size -1: must be"):
+            FrameBuffer(-1)
+        with pytest.raises(ValueError, match="drop_policy skip: must be one of"):
+            FrameBuffer(1, "skip")
+
+
+@pytest.mark.usefixtures("tmp_dir")
+class TestVideoThreadBuffer:
+    def test_bounded_block_buffer_reads_every_frame(self, create_input_video):
+        video = create_input_video("video.avi", fps=10, size=(60, 80, 3), num_frames=20)
+        reader = VideoThread("video.avi", False, True, 2, "block")
+        frames = []
+        while True:
+            success, frame = reader.read_frame()
+            if not success:
+                break
+            # frames are repeated while the reading thread catches up
+            if not frames or frame is not frames[-1]:
+                frames.append(frame)
+        reader.shutdown()
+
+        assert np.array_equal(frames, video)
+        assert reader.num_dropped == 0
+        assert reader.high_water_mark <= 2
+
+    def test_shutdown_with_full_buffer(self, create_input_video):
+        create_input_video("video.avi", fps=10, size=(60, 80, 3), num_frames=20)
+        reader = VideoThread("video.avi", False, True, 1, "block")
+        reader.shutdown()
+
+        assert not reader.thread.is_alive()
@@ -0,0 +1,107 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import struct
+
+import cv2
+import numpy as np
+import pytest
+
+from peekingduck.pipeline.nodes.input.utils.read import (
+    VideoNoThread,
+    get_reduced_imread_flags,
+    read_image_size,
+)
+
+
+def _smooth_image(height, width):
+    """Gradient image, which looks the same when decoded at a reduced size"""
+    rows = np.linspace(0, 255, height, dtype=np.float32)[:, np.newaxis]
+    cols = np.linspace(0, 255, width, dtype=np.float32)[np.newaxis]
+    img = np.stack([rows + 0 * cols, 0 * rows + cols, (rows + cols) / 2], axis=-1)
+    return img.astype(np.uint8)
+
+
+def _write_rotated_jpeg(path, img):
+    """Writes `img` as a JPEG image with EXIF orientation 6, i.e., to be
+    rotated 90 degrees clockwise when displayed"""
+    _, encoded = cv2.imencode(".jpg", img)
+    entry = struct.pack(">HHIHH", 0x0112, 3, 1, 6, 0)
+    exif = b"Exif\x00\x00MM\x00*\x00\x00\x00\x08\x00\x01" + entry + b"\x00" * 4
+    app1 = b"\xff\xe1" + struct.pack(">H", len(exif) + 2) + exif
+    with open(path, "wb") as outfile:
+        outfile.write(encoded[:2].tobytes() + app1 + encoded[2:].tobytes())
+
+
+@pytest.mark.usefixtures("tmp_dir")
+class TestReducedDecoding:
+    @pytest.mark.parametrize("filename", ["image.jpg", "image.png"])
+    def test_read_image_size(self, filename):
+        cv2.imwrite(filename, _smooth_image(48, 64))
+
+        assert read_image_size(filename) == (64, 48)
+
+    def test_read_image_size_unsupported(self):
+        with open("image.gif", "wb") as outfile:
+            outfile.write(b"GIF89a")
+
+        assert read_image_size("image.gif") is None
+
+    @pytest.mark.parametrize(
+        "target_size, flags",
+        [
+            ((100, 75), cv2.IMREAD_REDUCED_COLOR_8 | cv2.IMREAD_IGNORE_ORIENTATION),
+            ((200, 150), cv2.IMREAD_REDUCED_COLOR_4 | cv2.IMREAD_IGNORE_ORIENTATION),
+            ((300, 150), cv2.IMREAD_REDUCED_COLOR_2 | cv2.IMREAD_IGNORE_ORIENTATION),
+            ((500, 150), cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION),
+        ],
+    )
+    def test_reduced_imread_flags(self, target_size, flags):
+        cv2.imwrite("image.jpg", _smooth_image(600, 800))
+
+        assert get_reduced_imread_flags("image.jpg", target_size) == flags
+
+    def test_reader_decodes_at_reduced_size(self):
+        img = _smooth_image(600, 800)
+        cv2.imwrite("image.jpg", img)
+        reader = VideoNoThread("image.jpg", False, target_size=(200, 150))
+        success, frame = reader.read_frame()
+
+        assert success
+        assert frame.shape == (150, 200, 3)
+        expected = cv2.resize(img, (200, 150), interpolation=cv2.INTER_AREA)
+        assert np.abs(frame.astype(int) - expected).mean() < 3
+
+    def test_reduced_size_ignores_exif_orientation(self):
+        img = _smooth_image(400, 800)
+        _write_rotated_jpeg("image.jpg", img)
+        full_reader = VideoNoThread("image.jpg", False)
+        reduced_reader = VideoNoThread("image.jpg", False, target_size=(200, 100))
+        _, full_frame = full_reader.read_frame()
+        _, reduced_frame = reduced_reader.read_frame()
+
+        assert read_image_size("image.jpg") == (800, 400)
+        assert full_frame.shape == (400, 800, 3)
+        assert reduced_frame.shape == (100, 200, 3)
+        expected = cv2.resize(full_frame, (200, 100), interpolation=cv2.INTER_AREA)
+        assert np.abs(reduced_frame.astype(int) - expected).mean() < 3
+
+    def test_image_reader_grab_and_set(self):
+        cv2.imwrite("image.jpg", _smooth_image(600, 800))
+        reader = VideoNoThread("image.jpg", False, target_size=(200, 150))
+
+        assert not reader.stream.set(cv2.CAP_PROP_POS_FRAMES, 1)
+        assert reader.stream.grab()
+        assert not reader.stream.grab()
+        assert reader.read_frame() == (False, None)
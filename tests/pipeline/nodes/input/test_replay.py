@@ -0,0 +1,107 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+from peekingduck.pipeline.nodes.input.replay import Node
+from peekingduck.pipeline.utils.recording import RecordingWriter
+from peekingduck.runner import Runner
+
+NUM_FRAMES = 3
+
+
+def create_replay(source, keys=None):
+    return Node(
+        {
+            "input": ["none"],
+            "output": ["pipeline_end"],
+            "keys": keys or [],
+            "source": str(source),
+        }
+    )
+
+
+def write_recording(directory, num_frames=NUM_FRAMES):
+    writer = RecordingWriter(directory, chunk_size=2)
+    for idx in range(num_frames):
+        writer.write(
+            {
+                "img": np.full((4, 4, 3), idx, dtype=np.uint8),
+                "bboxes": np.array([[0.0, 0.0, 0.5, 0.5]]) + idx,
+            }
+        )
+    writer.flush()
+    return directory
+
+
+class BboxCounter(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["bboxes"], "output": ["count"]}, node_path="dabble.counter"
+        )
+        self.totals = []
+
+    def run(self, inputs):
+        self.totals.append(float(inputs["bboxes"].sum()))
+        return {"count": len(inputs["bboxes"])}
+
+
+@pytest.mark.usefixtures("tmp_dir")
+class TestReplay:
+    def test_outputs_recorded_keys(self):
+        replay = create_replay(write_recording(Path("recording")))
+
+        assert replay.outputs == ["img", "bboxes", "pipeline_end"]
+        for idx in range(NUM_FRAMES):
+            outputs = replay.run({})
+            assert not outputs["pipeline_end"]
+            np.testing.assert_array_equal(outputs["img"], np.full((4, 4, 3), idx))
+        assert replay.run({}) == {"pipeline_end": True}
+
+    def test_keys_subset(self):
+        replay = create_replay(write_recording(Path("recording")), keys=["bboxes"])
+
+        assert replay.outputs == ["bboxes", "pipeline_end"]
+        assert set(replay.run({})) == {"bboxes", "pipeline_end"}
+
+    def test_unrecorded_keys(self):
+        with pytest.raises(ValueError) as excinfo:
+            create_replay(write_recording(Path("recording")), keys=["masks"])
+        assert "['masks'] were not recorded" in str(excinfo.value)
+
+    def test_no_recording(self):
+        with pytest.raises(FileNotFoundError):
+            create_replay(Path("missing"))
+
+    def test_replays_latest_recording(self):
+        old = write_recording(Path("recordings") / "old", num_frames=1)
+        write_recording(Path("recordings") / "new", num_frames=2)
+        os.utime(old, (0, 0))
+        replay = create_replay(Path("recordings"))
+
+        assert replay.reader.directory == Path("recordings") / "new"
+
+    def test_runs_downstream_nodes(self):
+        counter = BboxCounter()
+        runner = Runner(
+            nodes=[create_replay(write_recording(Path("recording"))), counter]
+        )
+        runner.run()
+
+        assert counter.totals == [1.0, 5.0, 9.0]
@@ -13,6 +13,8 @@
 # limitations under the License.
 
 from contextlib import contextmanager
+from pathlib import Path
+import time
 
 import numpy as np
 import pytest
@@ -29,24 +31,56 @@ def not_raises(exception):
         raise pytest.fail(f"DID RAISE EXCEPTION: {exception}")
 
 
-def create_reader(source=None):
+def create_reader(  # pylint: disable=too-many-arguments
+    source=None,
+    num_shards=1,
+    shard_index=0,
+    prefetch=0,
+    frame_stride=1,
+    start_time=0,
+    end_time=None,
+    frame_indices=None,
+    recursive=False,
+    file_pattern=None,
+    resize=None,
+):
     media_reader = Node(
         {
             "input": "source",
             "output": "img",
-            "resize": {"do_resizing": False, "width": 1280, "height": 720},
+            "resize": resize or {"do_resizing": False, "width": 1280, "height": 720},
+            "end_time": end_time,
+            "file_pattern": file_pattern,
             "filename": "video.mp4",
+            "frame_indices": frame_indices,
+            "frame_stride": frame_stride,
             "frames_log_freq": 100,
             "mirror_image": False,
+            "num_shards": num_shards,
             "pipeline_end": False,
+            "prefetch": prefetch,
+            "recursive": recursive,
             "saved_video_fps": 0,
+            "shard_index": shard_index,
             "threading": False,
             "source": source if source else ".",
+            "start_time": start_time,
         }
     )
     return media_reader
 
 
+def _read_all(reader):
+    """Helper function to read every frame until the end of the pipeline"""
+    outputs = []
+    while True:
+        output = reader.run({})
+        if output["pipeline_end"]:
+            break
+        outputs.append(output)
+    return outputs
+
+
 def _get_video_file(reader, num_frames):
     """Helper function to get an entire videofile"""
     video = []
@@ -84,6 +118,17 @@ class TestMediaReader:
         assert np.array_equal(output1["img"], image1)
         assert output1["filename"] == filename
 
+    def test_reader_stamps_capture_time(self, create_input_image):
+        create_input_image("image1.png", (900, 800, 3))
+        reader = create_reader()
+        before = time.perf_counter()
+        output1 = reader.run({})
+        output2 = reader.run({})
+
+        assert before <= output1["capture_time"] <= time.perf_counter()
+        assert output2["pipeline_end"]
+        assert output2["capture_time"] is None
+
     def test_reader_reads_multi_images(self, create_input_image):
         image1 = create_input_image("image1.png", (900, 800, 3))
         image2 = create_input_image("image2.png", (900, 800, 3))
@@ -176,3 +221,160 @@ class TestMediaReader:
         assert f"Completed processing file: {test_filenames[0]} (1 / 5)" in msg_set
         assert f"Completed processing file: {test_filenames[2]} (3 / 5)" in msg_set
         assert f"Completed processing file: {test_filenames[4]} (5 / 5)" in msg_set
+
+    @pytest.mark.parametrize(
+        "shard_index, expected_filenames",
+        [
+            (0, ["image0.png", "image1.png"]),
+            (1, ["image2.png", "image3.png", "image4.png"]),
+        ],
+    )
+    def test_reader_reads_directory_shard(
+        self, create_input_image, shard_index, expected_filenames
+    ):
+        for i in range(5):
+            create_input_image(f"image{i}.png", (90, 80, 3))
+        reader = create_reader(num_shards=2, shard_index=shard_index)
+        filenames = []
+        while True:
+            output = reader.run({})
+            if output["pipeline_end"]:
+                break
+            filenames.append(output["filename"])
+
+        assert filenames == expected_filenames
+
+    def test_reader_invalid_shard_index(self):
+        with pytest.raises(ValueError, match="shard_index 2: must be in"):
+            create_reader(num_shards=2, shard_index=2)
+
+    def test_reader_prefetch_matches_sequential_reads(
+        self, create_input_image, create_input_video
+    ):
+        size = (120, 160, 3)
+        for i in range(5):
+            create_input_image(f"image{i}.jpg", size)
+        create_input_video("video.avi", fps=5, size=size, num_frames=4)
+        with open("notes.txt", "w") as outfile:
+            outfile.write("not a media file")
+
+        expected = _read_all(create_reader())
+        reader = create_reader(prefetch=2)
+        outputs = _read_all(reader)
+        reader.release_resources()
+
+        assert len(outputs) == len(expected) == 9
+        for output, expected_output in zip(outputs, expected):
+            assert output["filename"] == expected_output["filename"]
+            assert np.array_equal(output["img"], expected_output["img"])
+
+    def test_reader_prefetch_opens_files_ahead(self, create_input_image):
+        for i in range(4):
+            create_input_image(f"image{i}.png", (90, 80, 3))
+        reader = create_reader(prefetch=2)
+        reader.run({})
+
+        assert list(reader._prefetcher._futures) == ["image1.png", "image2.png"]
+        reader.release_resources()
+        assert not reader._prefetcher._futures
+
+    def test_reader_invalid_prefetch(self):
+        with pytest.raises(ValueError, match="prefetch -1: must be non-negative"):
+            create_reader(prefetch=-1)
+
+    def test_reader_numbers_frames_across_files(
+        self, create_input_image, create_input_video
+    ):
+        size = (60, 80, 3)
+        create_input_image("image1.png", size)
+        create_input_video("video.avi", fps=5, size=size, num_frames=3)
+        create_input_image("image2.png", size)
+        outputs = _read_all(create_reader())
+
+        assert [output["frame_seq"] for output in outputs] == [1, 2, 3, 4, 5]
+
+    @pytest.mark.parametrize(
+        "selection, expected_indices",
+        [
+            ({"frame_stride": 7}, list(range(0, 60, 7))),
+            ({"start_time": 2.0, "end_time": 4.0}, list(range(20, 40))),
+            ({"start_time": 1.0, "frame_stride": 20}, [10, 30, 50]),
+            # the gap between 3 and 40 is skipped by seeking
+            ({"frame_indices": [59, 3, 40, 3, 70]}, [3, 40, 59]),
+            ({"frame_indices": [3, 40, 59], "end_time": 5.0}, [3, 40]),
+        ],
+    )
+    def test_reader_reads_selected_frames(
+        self, create_input_video, selection, expected_indices
+    ):
+        video = create_input_video("video.avi", fps=10, size=(60, 80, 3), num_frames=60)
+        reader = create_reader(source="video.avi", **selection)
+        outputs = _read_all(reader)
+
+        assert reader.total_frame_count == len(expected_indices)
+        assert np.array_equal(
+            [output["img"] for output in outputs],
+            [video[idx] for idx in expected_indices],
+        )
+
+    def test_reader_prefetch_reads_selected_frames(self, create_input_video):
+        size = (60, 80, 3)
+        video1 = create_input_video("video1.avi", fps=10, size=size, num_frames=20)
+        video2 = create_input_video("video2.avi", fps=10, size=size, num_frames=20)
+        reader = create_reader(prefetch=1, start_time=1.5)
+        outputs = _read_all(reader)
+        reader.release_resources()
+
+        assert np.array_equal(
+            [output["img"] for output in outputs], video1[15:] + video2[15:]
+        )
+
+    @pytest.mark.parametrize(
+        "selection, match",
+        [
+            ({"frame_stride": 0}, "frame_stride 0: must be a positive integer"),
+            ({"start_time": -1}, "start_time -1: must be non-negative"),
+            ({"start_time": 2, "end_time": 1}, "end_time 1: must be larger than"),
+            ({"frame_indices": [1, -1]}, "frame_indices must be non-negative"),
+        ],
+    )
+    def test_reader_invalid_frame_selection(self, selection, match):
+        with pytest.raises(ValueError, match=match):
+            create_reader(**selection)
+
+    def test_reader_reads_directory_recursively(self, create_input_image):
+        size = (30, 40, 3)
+        for path in ["b.png", "sub/b.png", "sub/a.png", "a.png", "sub/deep/c.png"]:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            create_input_image(path, size)
+        Path("empty").mkdir()
+
+        outputs = _read_all(create_reader(recursive=True))
+        assert [output["filename"] for output in outputs] == [
+            "a.png",
+            "b.png",
+            "a.png",
+            "b.png",
+            "c.png",
+        ]
+        # subdirectories are skipped by default
+        assert len(_read_all(create_reader())) == 2
+
+    def test_reader_filters_directory_by_pattern(self, create_input_image):
+        size = (30, 40, 3)
+        for name in ["img1.jpg", "img2.png", "img3.jpg"]:
+            create_input_image(name, size)
+        reader = create_reader(file_pattern="*.jpg")
+        outputs = _read_all(reader)
+
+        assert [output["filename"] for output in outputs] == ["img1.jpg", "img3.jpg"]
+
+    def test_reader_resizes_images(self, create_input_image, create_input_video):
+        create_input_image("image.jpg", (640, 800, 3))
+        create_input_image("image.png", (100, 120, 3))
+        create_input_video("video.avi", fps=5, size=(60, 80, 3), num_frames=2)
+        reader = create_reader(resize={"do_resizing": True, "width": 100, "height": 80})
+        outputs = _read_all(reader)
+
+        assert len(outputs) == 4
+        assert all(output["img"].shape == (80, 100, 3) for output in outputs)
@@ -85,6 +85,21 @@ class TestEfficientDet:
         npt.assert_equal(output["bbox_labels"], expected["bbox_labels"])
         npt.assert_allclose(output["bbox_scores"], expected["bbox_scores"], atol=1e-2)
 
+    def test_run_batch(self, human_image, no_human_image, efficientdet_type):
+        images = [cv2.imread(human_image), cv2.imread(no_human_image)]
+        efficientdet = Node(efficientdet_type)
+        outputs = efficientdet.run_batch([{"img": img} for img in images])
+
+        assert len(outputs) == len(images)
+        for img, output in zip(images, outputs):
+            expected = efficientdet.run({"img": img})
+            assert output.keys() == expected.keys()
+            npt.assert_allclose(output["bboxes"], expected["bboxes"], atol=1e-3)
+            npt.assert_equal(output["bbox_labels"], expected["bbox_labels"])
+            npt.assert_allclose(
+                output["bbox_scores"], expected["bbox_scores"], atol=1e-2
+            )
+
     def test_efficientdet_preprocess(self, create_image, efficientdet_config):
         test_img1 = create_image((720, 1280, 3))
         test_img2 = create_image((640, 480, 3))
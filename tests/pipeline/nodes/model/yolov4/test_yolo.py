@@ -88,6 +88,21 @@ class TestYolo:
         npt.assert_equal(output["bbox_labels"], expected["bbox_labels"])
         npt.assert_allclose(output["bbox_scores"], expected["bbox_scores"], atol=1e-2)
 
+    def test_run_batch(self, human_image, no_human_image, yolo_type):
+        images = [cv2.imread(human_image), cv2.imread(no_human_image)]
+        yolo = Node(yolo_type)
+        outputs = yolo.run_batch([{"img": img} for img in images])
+
+        assert len(outputs) == len(images)
+        for img, output in zip(images, outputs):
+            expected = yolo.run({"img": img})
+            assert output.keys() == expected.keys()
+            npt.assert_allclose(output["bboxes"], expected["bboxes"], atol=1e-3)
+            npt.assert_equal(output["bbox_labels"], expected["bbox_labels"])
+            npt.assert_allclose(
+                output["bbox_scores"], expected["bbox_scores"], atol=1e-2
+            )
+
     def test_get_detect_ids(self, yolo_type):
         yolo = Node(yolo_type)
         assert yolo.model.detect_ids == [0]
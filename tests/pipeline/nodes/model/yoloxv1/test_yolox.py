@@ -22,6 +22,8 @@ import pytest
 import torch
 import yaml
 
+from peekingduck.pipeline.frame_transport import RemoteNode
+from peekingduck.pipeline.inference_cache import CachedNode, InferenceCache
 from peekingduck.pipeline.nodes.base import WeightsDownloaderMixin
 from peekingduck.pipeline.nodes.model.yolox import Node
 from tests.conftest import PKD_DIR, get_groundtruth
@@ -107,6 +109,37 @@ class TestYOLOX:
         npt.assert_equal(output["bbox_labels"], expected["bbox_labels"])
         npt.assert_allclose(output["bbox_scores"], expected["bbox_scores"], atol=1e-2)
 
+    def test_run_batch(self, human_image, no_human_image, yolox_config_cpu):
+        images = [cv2.imread(human_image), cv2.imread(no_human_image)]
+        yolox = Node(yolox_config_cpu)
+        outputs = yolox.run_batch([{"img": img} for img in images])
+
+        assert len(outputs) == len(images)
+        for img, output in zip(images, outputs):
+            expected = yolox.run({"img": img})
+            assert output.keys() == expected.keys()
+            npt.assert_allclose(output["bboxes"], expected["bboxes"], atol=1e-3)
+            npt.assert_equal(output["bbox_labels"], expected["bbox_labels"])
+            npt.assert_allclose(
+                output["bbox_scores"], expected["bbox_scores"], atol=1e-2
+            )
+
+    @pytest.mark.parametrize("background", [False, True])
+    def test_warm_up(self, human_image, yolox_config, background):
+        yolox_config["warmup_iterations"] = 1
+        yolox_config["warmup_background"] = background
+        human_img = cv2.imread(human_image)
+        with mock.patch("torch.cuda.is_available", return_value=False):
+            yolox = Node(yolox_config)
+            with mock.patch.object(
+                yolox.model, "predict", wraps=yolox.model.predict
+            ) as predict:
+                output = yolox.run({"img": human_img})
+
+        # the warm-up is not repeated on the first frame
+        predict.assert_called_once()
+        assert len(output["bboxes"]) > 0
+
     @pytest.mark.skipif(not torch.cuda.is_available(), reason="requires GPU")
     def test_detect_human_bboxes_gpu(self, human_image, yolox_matrix_config):
         human_img = cv2.imread(human_image)
@@ -129,6 +162,37 @@ class TestYOLOX:
         yolox = Node(yolox_config)
         assert yolox.model.detect_ids == [0]
 
+    def test_run_in_worker_process(self, human_image, yolox_config):
+        human_img = cv2.imread(human_image)
+        yolox_config["detect"] = ["person"]
+        yolox = Node(yolox_config)
+        remote_yolox = RemoteNode.from_node(yolox)
+        try:
+            output = remote_yolox.run({"img": human_img})
+        finally:
+            remote_yolox.release_resources()
+        expected = yolox.run({"img": human_img})
+
+        assert remote_yolox.node_name == "model.yolox"
+        assert remote_yolox.config["detect"] == [0]
+        npt.assert_allclose(output["bboxes"], expected["bboxes"], atol=1e-3)
+        npt.assert_equal(output["bbox_labels"], expected["bbox_labels"])
+
+    @pytest.mark.usefixtures("tmp_dir")
+    def test_cached_outputs(self, human_image, yolox_config):
+        human_img = cv2.imread(human_image)
+        yolox_config["detect"] = ["person"]
+        yolox = Node(yolox_config)
+        cached_yolox = CachedNode(yolox, InferenceCache(Path("cache")))
+        with mock.patch.object(yolox, "run", wraps=yolox.run) as run:
+            output = cached_yolox.run({"img": human_img})
+            cached_output = cached_yolox.run({"img": human_img.copy()})
+
+        run.assert_called_once()
+        assert cached_yolox.config["detect"] == [0]
+        npt.assert_equal(cached_output["bboxes"], output["bboxes"])
+        npt.assert_equal(cached_output["bbox_labels"], output["bbox_labels"])
+
     def test_invalid_config_detect_ids(self, yolox_config):
         yolox_config["detect"] = 1
         with pytest.raises(TypeError):
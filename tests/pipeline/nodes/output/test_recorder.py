@@ -0,0 +1,115 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from peekingduck.pipeline.nodes.output.recorder import Node
+from peekingduck.pipeline.utils.recording import RecordingReader
+
+NUM_FRAMES = 5
+
+
+def create_recorder(**updates):
+    config = {
+        "input": ["all", "pipeline_end"],
+        "output": ["none"],
+        "chunk_size": 2,
+        "compress": False,
+        "exclude": [],
+        "img_format": "png",
+        "keys": [],
+        "output_dir": str(Path.cwd() / "recordings"),
+    }
+    config.update(updates)
+    return Node(config)
+
+
+def frame(idx):
+    img = np.full((8, 12, 3), idx, dtype=np.uint8)
+    return {
+        "img": img,
+        "bboxes": np.array([[0.1, 0.2, 0.3, 0.4]]) * idx,
+        "bbox_labels": ["person"] * idx,
+        "count": idx,
+        "pipeline_end": False,
+    }
+
+
+def record(recorder, num_frames=NUM_FRAMES):
+    for idx in range(num_frames):
+        recorder.run(frame(idx))
+    directory = recorder.writer.directory
+    recorder.run({"pipeline_end": True})
+    return directory
+
+
+@pytest.mark.usefixtures("tmp_dir")
+class TestRecorder:
+    def test_writes_chunks_and_index(self):
+        directory = record(create_recorder())
+        index = json.loads((directory / "index.json").read_text())
+
+        assert directory.parent == Path.cwd() / "recordings"
+        assert directory.name.startswith("recording_")
+        assert index["num_frames"] == NUM_FRAMES
+        assert [chunk["num_frames"] for chunk in index["chunks"]] == [2, 2, 1]
+        assert index["keys"] == ["img", "bboxes", "bbox_labels", "count"]
+
+    @pytest.mark.parametrize("img_format", ["png", "raw"])
+    def test_round_trip(self, img_format):
+        directory = record(create_recorder(img_format=img_format))
+        frames = list(RecordingReader(directory))
+
+        assert len(frames) == NUM_FRAMES
+        for idx, data in enumerate(frames):
+            expected = frame(idx)
+            np.testing.assert_array_equal(data["img"], expected["img"])
+            np.testing.assert_array_equal(data["bboxes"], expected["bboxes"])
+            assert data["bbox_labels"] == expected["bbox_labels"]
+            assert data["count"] == idx
+            assert "pipeline_end" not in data
+
+    def test_keys_and_exclude(self):
+        directory = record(create_recorder(keys=["img", "count"], exclude=["img"]))
+        reader = RecordingReader(directory)
+
+        assert reader.keys == ["count"]
+        assert [data["count"] for data in reader] == list(range(NUM_FRAMES))
+
+    def test_values_are_copied_when_recorded(self):
+        recorder = create_recorder(img_format="raw")
+        data = frame(1)
+        recorder.run(data)
+        directory = recorder.writer.directory
+        data["img"][:] = 0
+        data["bboxes"][:] = 0
+        data["bbox_labels"].append("car")
+        recorder.release_resources()
+        (recorded,) = RecordingReader(directory)
+
+        np.testing.assert_array_equal(recorded["img"], frame(1)["img"])
+        np.testing.assert_array_equal(recorded["bboxes"], frame(1)["bboxes"])
+        assert recorded["bbox_labels"] == ["person"]
+
+    def test_invalid_config(self):
+        with pytest.raises(ValueError) as excinfo:
+            create_recorder(img_format="bmp")
+        assert "img_format must be one of" in str(excinfo.value)
+        with pytest.raises(ValueError) as excinfo:
+            create_recorder(chunk_size=0)
+        assert "chunk_size must be a positive integer" in str(excinfo.value)
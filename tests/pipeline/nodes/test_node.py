@@ -12,8 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
 from typing import Any, Dict, Union
 
+import numpy as np
 import pytest
 
 from peekingduck.pipeline.nodes.abstract_node import AbstractNode
@@ -67,6 +69,24 @@ class ObjDetNodeYolo(AbstractNode):
         return {}
 
 
+class WarmUpNode(AbstractNode):
+    def __init__(self, config, release=None):
+        super().__init__(
+            {"input": ["img", "bboxes"], "output": ["count"], **config},
+            node_path="model.warm_up",
+        )
+        self.release = release
+        self.received = []
+        self.warm_up(32, 16)
+
+    def run(self, inputs: Dict):
+        self.wait_for_warm_up()
+        if self.release is not None:
+            self.release.wait(timeout=5)
+        self.received.append(inputs)
+        return {"count": len(self.received)}
+
+
 @pytest.fixture
 def c_node():
     return ConcreteNode({"input": ["img"], "output": ["int"]})
@@ -316,3 +336,39 @@ class TestNode:
         efficientdet_node = ObjDetNodeEfficientDet(config=node_config)
         ground_truth = [1, 2, 3, 10, 12, 13, 14, 15, 20, 21]
         assert efficientdet_node.config["detect"] == ground_truth
+
+
+class TestWarmUp:
+    def test_disabled_by_default(self):
+        node = WarmUpNode({})
+
+        assert node.received == []
+
+    def test_runs_on_dummy_frame(self):
+        node = WarmUpNode({"warmup_iterations": 2})
+
+        assert len(node.received) == 2
+        assert node.received[0]["img"].shape == (16, 32, 3)
+        assert node.received[0]["img"].dtype == np.uint8
+        assert node.received[0]["bboxes"].shape == (1, 4)
+
+    def test_background_warm_up_finishes_before_first_frame(self):
+        release = threading.Event()
+        node = WarmUpNode(
+            {"warmup_iterations": 1, "warmup_background": True}, release=release
+        )
+        assert node.received == []
+        release.set()
+        outputs = node.run({"img": None, "bboxes": None})
+
+        assert outputs == {"count": 2}
+        assert node.received[0]["img"] is not None
+
+    def test_failed_warm_up_is_logged(self, caplog):
+        class FailingNode(WarmUpNode):
+            def run(self, inputs):
+                raise RuntimeError("no weights")
+
+        FailingNode({"warmup_iterations": 1})
+
+        assert "Warm-up of model.warm_up failed" in caplog.text
@@ -0,0 +1,153 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from peekingduck.pipeline.batched_executor import BatchedExecutor
+from peekingduck.pipeline.data_pool import get_node_inputs
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+from peekingduck.pipeline.pipeline import Pipeline
+from peekingduck.runner import Runner
+from tests.conftest import SinkNode, counting_source
+
+NUM_FRAMES = 10
+
+
+def run_node_batch(node, batch):
+    return node.run_batch([get_node_inputs(node, data) for data in batch])
+
+
+class BatchSquareNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["count"], "output": ["square"]}, node_path="model.square"
+        )
+        self.batch_sizes = []
+
+    def run(self, inputs):
+        return {"square": inputs["count"] ** 2}
+
+    def run_batch(self, inputs_batch):
+        self.batch_sizes.append(len(inputs_batch))
+        return [{"square": inputs["count"] ** 2} for inputs in inputs_batch]
+
+
+class EndWatcherNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["pipeline_end", "square"], "output": ["num_ends"]},
+            node_path="dabble.end_watcher",
+        )
+        self.num_ends = 0
+
+    def run(self, inputs):
+        self.num_ends += int(inputs["pipeline_end"])
+        return {"num_ends": self.num_ends}
+
+
+class TestBatchedExecutor:
+    def test_default_run_batch_calls_run_in_order(self):
+        sink = SinkNode(["count", "square"], stop_at=2)
+        outputs = sink.run_batch(
+            [{"count": count, "square": count**2} for count in range(1, 4)]
+        )
+
+        # stops after the frame which ends the pipeline
+        assert outputs == [{"pipeline_end": False}, {"pipeline_end": True}]
+        assert sink.received == [{"count": 1, "square": 1}, {"count": 2, "square": 4}]
+
+    def test_batches_frames(self):
+        square = BatchSquareNode()
+        sink = SinkNode(["count", "square"])
+        pipeline = Pipeline([counting_source(NUM_FRAMES), square, sink])
+        executor = BatchedExecutor(pipeline, run_node_batch, batch_size=4)
+        executor.run()
+
+        assert sink.received == [
+            {"count": i, "square": i * i} for i in range(1, NUM_FRAMES + 1)
+        ]
+        # the last batch is cut short by the frame which ends the pipeline
+        assert square.batch_sizes == [4, 4, 2]
+        assert executor.num_frames == NUM_FRAMES
+        assert pipeline.terminate
+
+    def test_matches_sequential_runner(self):
+        sequential_sink = SinkNode(["count", "square"])
+        sequential = Runner(
+            nodes=[
+                counting_source(NUM_FRAMES),
+                BatchSquareNode(),
+                sequential_sink,
+                EndWatcherNode(),
+            ]
+        )
+        sequential.run()
+
+        batched_sink = SinkNode(["count", "square"])
+        batched = Runner(
+            nodes=[
+                counting_source(NUM_FRAMES),
+                BatchSquareNode(),
+                batched_sink,
+                EndWatcherNode(),
+            ],
+            batch_size=3,
+        )
+        batched.run()
+
+        assert batched_sink.received == sequential_sink.received
+        assert batched.pipeline.data == sequential.pipeline.data
+        assert batched.pipeline.data["num_ends"] == 1
+
+    def test_num_iter(self):
+        sink = SinkNode(["count", "square"])
+        pipeline = Pipeline([counting_source(NUM_FRAMES), BatchSquareNode(), sink])
+        BatchedExecutor(pipeline, run_node_batch, batch_size=4, num_iter=6).run()
+
+        assert [inputs["count"] for inputs in sink.received] == [1, 2, 3, 4, 5, 6]
+
+    def test_downstream_pipeline_end_discards_later_frames(self):
+        sink = SinkNode(["count", "square"], stop_at=6)
+        watcher = EndWatcherNode()
+        pipeline = Pipeline(
+            [counting_source(NUM_FRAMES), BatchSquareNode(), sink, watcher]
+        )
+        BatchedExecutor(pipeline, run_node_batch, batch_size=4).run()
+
+        assert [inputs["count"] for inputs in sink.received] == [1, 2, 3, 4, 5, 6]
+        assert watcher.num_ends == 1
+        assert pipeline.data["count"] == 6
+
+    def test_invalid_batch_size(self):
+        pipeline = Pipeline(
+            [
+                counting_source(NUM_FRAMES),
+                BatchSquareNode(),
+                SinkNode(["count", "square"]),
+            ]
+        )
+        with pytest.raises(ValueError, match="batch_size must be a positive integer"):
+            BatchedExecutor(pipeline, run_node_batch, batch_size=0)
+
+    def test_cannot_combine_with_pipelined(self):
+        with pytest.raises(SystemExit):
+            Runner(
+                nodes=[
+                    counting_source(NUM_FRAMES),
+                    BatchSquareNode(),
+                    SinkNode(["count", "square"]),
+                ],
+                pipelined=True,
+                batch_size=2,
+            )
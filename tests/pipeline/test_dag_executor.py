@@ -0,0 +1,119 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+import pytest
+
+from peekingduck.pipeline.dag_executor import DagExecutor, build_dependency_graph
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+from peekingduck.pipeline.pipeline import Pipeline
+from peekingduck.runner import Runner
+from tests.conftest import SinkNode, counting_source, run_node
+
+NUM_FRAMES = 5
+
+
+class FuncNode(AbstractNode):
+    def __init__(self, name, inputs, outputs, func, barrier=None):
+        super().__init__(
+            {"input": inputs, "output": outputs}, node_path=f"model.{name}"
+        )
+        self.func = func
+        self.barrier = barrier
+        self.threads = set()
+
+    def run(self, inputs):
+        self.threads.add(threading.current_thread())
+        if self.barrier is not None:
+            self.barrier.wait()
+        return {self.outputs[0]: self.func(inputs)}
+
+
+def create_branch_nodes(barrier=None):
+    return [
+        counting_source(NUM_FRAMES, "img"),
+        FuncNode("double", ["img"], ["double"], lambda x: x["img"] * 2, barrier),
+        FuncNode("square", ["img"], ["square"], lambda x: x["img"] ** 2, barrier),
+        FuncNode("total", ["double", "square"], ["total"], lambda x: sum(x.values())),
+        SinkNode(["img", "total"]),
+    ]
+
+
+class TestDagExecutor:
+    def test_build_dependency_graph(self):
+        nodes = create_branch_nodes() + [SinkNode(["all"])]
+
+        assert build_dependency_graph(nodes) == [
+            set(),
+            {0},
+            {0},
+            {0, 1, 2},
+            {0, 3},
+            {0, 1, 2, 3, 4},
+        ]
+
+    def test_overwritten_key_waits_for_readers(self):
+        nodes = [
+            counting_source(NUM_FRAMES, "img"),
+            FuncNode("reader", ["img"], ["copy"], lambda x: x["img"]),
+            FuncNode("writer", ["img"], ["img"], lambda x: -x["img"]),
+        ]
+
+        assert build_dependency_graph(nodes)[2] == {0, 1}
+
+    def test_independent_nodes_run_concurrently(self):
+        # The frame can only complete if both branches run at the same time
+        barrier = threading.Barrier(2, timeout=5)
+        nodes = create_branch_nodes(barrier)
+        pipeline = Pipeline(nodes)
+        DagExecutor(pipeline, run_node).run()
+
+        assert nodes[4].received == [
+            {"img": i, "total": 2 * i + i * i} for i in range(1, NUM_FRAMES + 1)
+        ]
+        assert threading.main_thread() not in nodes[1].threads
+        assert pipeline.terminate
+
+    def test_matches_sequential_runner(self):
+        sequential = Runner(nodes=create_branch_nodes())
+        sequential.run()
+        parallel = Runner(nodes=create_branch_nodes(), parallel_branches=True)
+        parallel.run()
+
+        assert parallel.pipeline.nodes[4].received == (
+            sequential.pipeline.nodes[4].received
+        )
+        assert parallel.pipeline.data == sequential.pipeline.data
+
+    def test_num_iter(self):
+        nodes = create_branch_nodes()
+        DagExecutor(Pipeline(nodes), run_node, num_iter=2).run()
+
+        assert [inputs["img"] for inputs in nodes[4].received] == [1, 2]
+
+    def test_node_exception_is_reraised(self):
+        def fail(inputs):
+            raise RuntimeError("node failed")
+
+        nodes = [
+            counting_source(NUM_FRAMES, "img"),
+            FuncNode("fail", ["img"], ["fail"], fail),
+        ]
+        with pytest.raises(RuntimeError, match="node failed"):
+            DagExecutor(Pipeline(nodes), run_node).run()
+
+    def test_cannot_combine_with_pipelined(self):
+        with pytest.raises(SystemExit):
+            Runner(nodes=create_branch_nodes(), parallel_branches=True, pipelined=True)
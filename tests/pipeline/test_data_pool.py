@@ -0,0 +1,119 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from peekingduck.pipeline.data_pool import (
+    get_key_release_schedule,
+    get_node_inputs,
+    read_only_view,
+)
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+
+
+class MockedNode(AbstractNode):
+    def __init__(self, config):
+        super().__init__(config, node_path="dabble.mocked")
+
+    def run(self, inputs):
+        return {}
+
+
+def create_node(inputs, outputs):
+    return MockedNode({"input": inputs, "output": outputs})
+
+
+@pytest.fixture
+def data_pool():
+    return {
+        "img": np.zeros((4, 6, 3), dtype=np.uint8),
+        "bboxes": np.array([[0.1, 0.2, 0.3, 0.4]]),
+        "count": 1,
+        "obj_attrs": {"ids": [1]},
+    }
+
+
+class TestDataPool:
+    def test_read_only_view_does_not_copy(self, data_pool):
+        view = read_only_view(data_pool)
+
+        assert list(view.keys()) == list(data_pool.keys())
+        assert np.shares_memory(view["img"], data_pool["img"])
+        assert view["obj_attrs"] is data_pool["obj_attrs"]
+        assert view["count"] == 1
+
+    def test_read_only_view_cannot_be_modified(self, data_pool):
+        view = read_only_view(data_pool)
+
+        with pytest.raises(TypeError):
+            view["count"] = 2
+        with pytest.raises(ValueError):
+            view["img"][0, 0, 0] = 255
+        # the data pool itself remains writeable
+        data_pool["img"][0, 0, 0] = 255
+        assert view["img"][0, 0, 0] == 255
+        assert data_pool["img"].flags.writeable
+
+    def test_all_inputs(self, data_pool):
+        node = MockedNode({"input": ["all"], "output": ["none"]})
+        inputs = get_node_inputs(node, data_pool)
+
+        assert set(inputs.keys()) == set(data_pool.keys())
+        assert not inputs["img"].flags.writeable
+
+    def test_selected_and_optional_inputs(self, data_pool):
+        node = MockedNode({"input": ["img"], "output": ["none"]})
+        node.optional_inputs = ["count", "missing"]
+        inputs = get_node_inputs(node, data_pool)
+
+        assert inputs == {"img": data_pool["img"], "count": 1}
+        assert inputs["img"] is data_pool["img"]
+
+    def test_release_schedule_after_last_use(self):
+        nodes = [
+            create_node(["none"], ["img", "filename", "pipeline_end"]),
+            create_node(["img"], ["masks", "bboxes"]),
+            create_node(["img", "masks"], ["img"]),
+            create_node(["bboxes"], ["count"]),
+        ]
+
+        assert get_key_release_schedule(nodes) == [
+            ["filename"],
+            [],
+            ["img", "masks"],
+            ["bboxes", "count"],
+        ]
+
+    def test_release_schedule_keeps_values_carried_across_iterations(self):
+        nodes = [
+            create_node(["none"], ["img", "pipeline_end"]),
+            create_node(["count"], ["masks"]),
+            create_node(["img"], ["count"]),
+            create_node(["img", "pipeline_end"], ["none"]),
+        ]
+
+        # count is read before it is written, img by a pipeline_end node
+        assert get_key_release_schedule(nodes) == [[], ["masks"], [], []]
+
+    def test_release_schedule_all_input(self):
+        nodes = [
+            create_node(["none"], ["img", "pipeline_end"]),
+            create_node(["img"], ["masks"]),
+            create_node(["all"], ["none"]),
+            create_node(["img"], ["bboxes"]),
+        ]
+
+        # bboxes reach the "all" node from the previous iteration
+        assert get_key_release_schedule(nodes) == [[], [], ["masks"], ["img"]]
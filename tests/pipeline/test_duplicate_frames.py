@@ -0,0 +1,126 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from peekingduck.pipeline.duplicate_frames import DuplicateFrameFilter
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+from peekingduck.runner import Runner
+from tests.conftest import SourceNode, run_node
+
+# Sequence number of each frame read, repeated frames keep their number
+FRAME_SEQS = [1, 1, 2, 3, 3, 3, 4]
+
+
+def create_source(frame_seqs):
+    """Source whose frames have the sequence numbers ``frame_seqs``."""
+    return SourceNode(
+        len(frame_seqs),
+        lambda idx: {"count": idx, "frame_seq": frame_seqs[idx - 1]},
+        {"frame_seq": None},
+    )
+
+
+class ModelNode(AbstractNode):
+    is_stateless = True
+
+    def __init__(self, node_path="model.counter"):
+        super().__init__(
+            {"input": ["count"], "output": ["result"]}, node_path=node_path
+        )
+        self.received = []
+
+    def run(self, inputs):
+        self.received.append(inputs["count"])
+        return {"result": inputs["count"]}
+
+
+class DabbleNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["result"], "output": ["results"]}, node_path="dabble.collect"
+        )
+        self.results = []
+
+    def run(self, inputs):
+        self.results.append(inputs["result"])
+        return {"results": list(self.results)}
+
+
+class TestDuplicateFrameFilter:
+    def test_runner_reuses_outputs_on_repeated_frames(self):
+        model = ModelNode()
+        dabble = DabbleNode()
+        runner = Runner(
+            nodes=[create_source(FRAME_SEQS), model, dabble], skip_duplicate_frames=True
+        )
+        runner.run()
+
+        # the first frame of every sequence number is processed
+        assert model.received == [1, 3, 4, 7]
+        # downstream nodes run on every frame with the reused outputs
+        assert dabble.results == [1, 1, 3, 4, 4, 4, 7]
+        assert runner.duplicate_filter.num_frames == len(FRAME_SEQS)
+        assert runner.duplicate_filter.num_duplicates == 3
+
+    def test_runner_runs_every_frame_by_default(self):
+        model = ModelNode()
+        Runner(nodes=[create_source(FRAME_SEQS), model]).run()
+
+        assert model.received == list(range(1, len(FRAME_SEQS) + 1))
+
+    def test_stateful_nodes_run_on_every_frame(self):
+        model = ModelNode()
+        model.is_stateless = False
+        dabble = ModelNode("dabble.counter")
+        duplicate_filter = DuplicateFrameFilter(
+            [create_source(FRAME_SEQS), model, dabble]
+        )
+
+        assert duplicate_filter.models == set()
+
+    def test_frames_without_sequence_numbers_are_processed(self):
+        model = ModelNode()
+        duplicate_filter = DuplicateFrameFilter([model])
+        for count in range(3):
+            duplicate_filter.run(model, {"count": count}, run_node)
+
+        assert model.received == [0, 1, 2]
+        assert duplicate_filter.num_frames == 0
+
+    def test_reused_outputs_are_copies(self):
+        model = ModelNode()
+        duplicate_filter = DuplicateFrameFilter([model])
+        received = []
+        for count in range(3):
+            outputs = duplicate_filter.run(
+                model,
+                {"count": count, "frame_seq": 1},
+                run_node,
+            )
+            received.append(dict(outputs))
+            # later nodes overwrite or add keys
+            outputs["result"] = "changed"
+            outputs["extra"] = count
+
+        assert model.received == [0]
+        assert received == [{"result": 0}] * 3
+
+    def test_cannot_combine_with_pipelined(self):
+        with pytest.raises(SystemExit):
+            Runner(
+                nodes=[create_source(FRAME_SEQS), ModelNode()],
+                skip_duplicate_frames=True,
+                pipelined=True,
+            )
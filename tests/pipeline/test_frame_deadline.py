@@ -0,0 +1,134 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import pytest
+
+from peekingduck.pipeline.frame_deadline import FrameDeadline
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+from peekingduck.runner import Runner
+from tests.conftest import SinkNode, SourceNode
+
+DEADLINE = 0.5
+# Age of each frame when it is read, in seconds
+FRAME_AGES = [0.0, 1.0, 0.0, 2.0, 0.0]
+
+
+def create_source(ages):
+    """Source whose frames are ``ages`` seconds old when they are read."""
+    return SourceNode(
+        len(ages),
+        lambda idx: {"count": idx, "capture_time": time.perf_counter() - ages[idx - 1]},
+        {"capture_time": None},
+    )
+
+
+class ModelNode(AbstractNode):
+    def __init__(self, delay=0.0):
+        super().__init__(
+            {"input": ["count"], "output": ["result"]}, node_path="model.slow"
+        )
+        self.delay = delay
+        self.received = []
+
+    def run(self, inputs):
+        self.received.append(inputs["count"])
+        time.sleep(self.delay)
+        return {"result": inputs["count"]}
+
+
+class DabbleNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["count"], "output": ["double"]}, node_path="dabble.double"
+        )
+
+    def run(self, inputs):
+        return {"double": inputs["count"] * 2}
+
+
+class TestFrameDeadline:
+    def test_runner_drops_stale_frames(self):
+        model = ModelNode()
+        runner = Runner(nodes=[create_source(FRAME_AGES), model], deadline=DEADLINE)
+        runner.run()
+
+        assert model.received == [1, 3, 5]
+        assert runner.frame_deadline.num_frames == len(FRAME_AGES)
+        assert runner.frame_deadline.num_dropped == 2
+        assert runner.frame_deadline.num_late == 0
+
+    def test_output_nodes_on_dropped_frames(self):
+        media_writer = SinkNode(
+            ["count", "pipeline_end"], node_path="output.media_writer"
+        )
+        draw = SinkNode(["count", "result"], node_path="draw.result")
+        csv_writer = SinkNode(["all"], node_path="output.csv_writer")
+        runner = Runner(
+            nodes=[
+                create_source(FRAME_AGES),
+                ModelNode(),
+                draw,
+                csv_writer,
+                media_writer,
+            ],
+            deadline=DEADLINE,
+        )
+        runner.run()
+
+        # the frame is still recorded without the model outputs
+        recorded = [
+            inputs["count"]
+            for inputs in media_writer.received
+            if not inputs["pipeline_end"]
+        ]
+        assert recorded == [1, 2, 3, 4, 5]
+        # nodes which need the model outputs knowingly miss dropped frames and
+        # never see the outputs of an earlier frame
+        assert [(inputs["count"], inputs["result"]) for inputs in draw.received] == [
+            (1, 1),
+            (3, 3),
+            (5, 5),
+        ]
+        assert [inputs["count"] for inputs in csv_writer.received] == [1, 3, 5]
+        runs_on_dropped = [True, False, False, False, True]
+        assert runner.frame_deadline.runs_on_dropped == runs_on_dropped
+        assert runner.frame_deadline.dropped_keys == {"result"}
+
+    def test_late_frames_are_counted(self):
+        model = ModelNode(delay=0.06)
+        runner = Runner(nodes=[create_source([0.0, 0.0]), model], deadline=0.05)
+        runner.run()
+
+        assert model.received == [1, 2]
+        assert runner.frame_deadline.num_late == 2
+
+    def test_checks_before_first_model_node(self):
+        nodes = [create_source(FRAME_AGES), DabbleNode(), ModelNode(), ModelNode()]
+        assert FrameDeadline(nodes, DEADLINE).check_idx == 2
+        # without model nodes, frames are checked right after being read
+        assert FrameDeadline(nodes[:2], DEADLINE).check_idx == 1
+
+    def test_invalid_deadline(self):
+        with pytest.raises(ValueError, match="deadline must be positive"):
+            FrameDeadline([create_source(FRAME_AGES)], 0)
+
+    def test_cannot_combine_with_pipelined(self):
+        with pytest.raises(SystemExit):
+            Runner(
+                nodes=[create_source(FRAME_AGES), ModelNode()],
+                deadline=DEADLINE,
+                pipelined=True,
+            )
@@ -0,0 +1,264 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+import sys
+import textwrap
+import weakref
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from peekingduck.declarative_loader import DeclarativeLoader
+from peekingduck.pipeline.frame_transport import (
+    ArrayRef,
+    RemoteNode,
+    SharedFrameRing,
+)
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+from peekingduck.runner import Runner
+from tests.conftest import SinkNode, SourceNode
+
+IMG_SHAPE = (480, 640, 3)
+NUM_FRAMES = 3
+
+
+def create_source():
+    return SourceNode(
+        NUM_FRAMES, lambda idx: {"img": np.full(IMG_SHAPE, idx, np.uint8)}
+    )
+
+
+class InvertNode(AbstractNode):
+    is_stateless = True
+
+    def __init__(self, config=None):
+        super().__init__(
+            config or {"input": ["img"], "output": ["inverted", "pid"]},
+            node_path="model.invert",
+        )
+
+    def run(self, inputs):
+        if inputs["img"][0, 0, 0] == 0:
+            raise ValueError("blank frame")
+        return {"inverted": 255 - inputs["img"], "pid": os.getpid()}
+
+
+class BatchInvertNode(InvertNode):
+    def run_batch(self, inputs_batch):
+        return [
+            {"inverted": 255 - inputs["img"], "pid": len(inputs_batch)}
+            for inputs in inputs_batch
+        ]
+
+
+class DetectorNode(AbstractNode):
+    """Converts the class names in ``detect`` to ids like ``model.yolox``."""
+
+    is_stateless = True
+
+    def __init__(self, config=None):
+        super().__init__(
+            config
+            or {"input": ["img"], "output": ["bbox_labels"], "detect": ["person"]},
+            node_path="model.yolox",
+        )
+
+    def run(self, inputs):
+        return {"bbox_labels": np.array(self.config["detect"])}
+
+
+@pytest.fixture
+def remote_node():
+    node = RemoteNode.from_node(InvertNode())
+    yield node
+    node.release_resources()
+
+
+class TestSharedFrameRing:
+    def test_pack_and_unpack(self):
+        ring = SharedFrameRing(num_slots=2, slot_size=2 * np.prod(IMG_SHAPE))
+        other = SharedFrameRing(num_slots=2, slot_size=ring.slot_size, name=ring.name)
+        img = np.random.default_rng(0).integers(0, 255, IMG_SHAPE, dtype=np.uint8)
+        bboxes = np.array([[0.1, 0.2, 0.3, 0.4]])
+        values = {"img": img, "mask": img[..., 0] > 100, "bboxes": bboxes, "a": 1}
+
+        packed = ring.pack(values)
+        unpacked = other.unpack(packed)
+
+        assert isinstance(packed["img"], ArrayRef)
+        assert packed["img"].slot == 0
+        assert isinstance(packed["mask"], ArrayRef)
+        # small arrays are pickled as usual
+        assert packed["bboxes"] is bboxes
+        np.testing.assert_array_equal(unpacked["img"], img)
+        np.testing.assert_array_equal(unpacked["mask"], values["mask"])
+        assert unpacked["a"] == 1
+        assert ring.pack(values)["img"].slot == 1
+        assert ring.pack(values)["img"].slot == 0
+        other.close()
+        ring.close()
+
+    def test_arrays_larger_than_slot_are_not_shared(self):
+        ring = SharedFrameRing(num_slots=1, slot_size=1024)
+        img = np.zeros(IMG_SHAPE, np.uint8)
+
+        assert ring.pack({"img": img})["img"] is img
+        ring.close()
+
+
+class TestRemoteNode:
+    def test_runs_in_worker_process(self, remote_node):
+        img = np.full(IMG_SHAPE, 5, np.uint8)
+        outputs = remote_node.run({"img": img})
+
+        np.testing.assert_array_equal(outputs["inverted"], 255 - img)
+        assert outputs["pid"] != os.getpid()
+        assert remote_node.node_name == "model.invert"
+        assert remote_node.inputs == ["img"]
+        assert remote_node.is_stateless
+
+    def test_worker_exception_is_reraised(self, remote_node):
+        with pytest.raises(RuntimeError, match="blank frame"):
+            remote_node.run({"img": np.zeros(IMG_SHAPE, np.uint8)})
+        # the worker keeps serving after a failed call
+        assert remote_node.run({"img": np.ones(IMG_SHAPE, np.uint8)})["pid"]
+
+    def test_object_detector_config(self):
+        remote_node = RemoteNode.from_node(DetectorNode())
+        outputs = remote_node.run({"img": np.ones(IMG_SHAPE, np.uint8)})
+        remote_node.release_resources()
+
+        assert remote_node.config["detect"] == [0]
+        np.testing.assert_array_equal(outputs["bbox_labels"], [0])
+
+    def test_worker_is_stopped_if_proxy_init_fails(self):
+        node = InvertNode()
+        release_resources = mock.patch.object(
+            RemoteNode,
+            "release_resources",
+            autospec=True,
+            side_effect=RemoteNode.release_resources,
+        )
+        with release_resources as mock_release, mock.patch.object(
+            AbstractNode, "__init__", side_effect=KeyError("detect_ids")
+        ):
+            with pytest.raises(KeyError, match="detect_ids"):
+                RemoteNode.from_node(node)
+
+        mock_release.assert_called_once()
+        assert not mock_release.call_args[0][0]._process.is_alive()
+
+    def test_run_batch_is_forwarded_in_chunks(self):
+        remote_node = RemoteNode.from_node(BatchInvertNode(), num_slots=2)
+        imgs = [np.full(IMG_SHAPE, count, np.uint8) for count in range(1, 6)]
+        outputs = remote_node.run_batch([{"img": img} for img in imgs])
+        remote_node.release_resources()
+
+        inverted = [out["inverted"][0, 0, 0] for out in outputs]
+        assert inverted == [254, 253, 252, 251, 250]
+        # the worker receives batches of at most num_slots frames
+        assert [out["pid"] for out in outputs] == [2, 2, 2, 2, 1]
+
+    @pytest.mark.usefixtures("tmp_dir")
+    def test_loader_only_builds_model_nodes_in_worker(self):
+        module_dir = Path("loader_nodes") / "model"
+        module_dir.mkdir(parents=True)
+        (module_dir.parent / "__init__.py").touch()
+        (module_dir / "__init__.py").touch()
+        (module_dir / "invert.py").write_text(
+            textwrap.dedent(
+                """\
+                import os
+                from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+
+                class Node(AbstractNode):
+                    def __init__(self, config):
+                        super().__init__(config, node_path=__name__)
+
+                    def run(self, inputs):
+                        return {"inverted": 255 - inputs["img"], "pid": os.getpid()}
+                """
+            )
+        )
+        config = {"input": ["img"], "output": ["inverted", "pid"]}
+        loader = DeclarativeLoader.__new__(DeclarativeLoader)
+        loader.logger = logging.getLogger(__name__)
+        loader.config_updates_cli = None
+        loader.pkd_viewer = False
+        loader.model_processes = True
+        loader.model_process_slots = 2
+        config_loader = mock.Mock(get=mock.Mock(return_value=config))
+        sys.path.insert(0, str(Path.cwd()))
+        try:
+            with mock.patch(
+                "peekingduck.declarative_loader.importlib.import_module"
+            ) as import_module:
+                node = loader._init_node(
+                    "loader_nodes.", "model.invert", config_loader, None
+                )
+            outputs = node.run({"img": np.ones(IMG_SHAPE, np.uint8)})
+            node.release_resources()
+        finally:
+            sys.path.remove(str(Path.cwd()))
+
+        import_module.assert_not_called()
+        assert "loader_nodes.model.invert" not in sys.modules
+        assert type(node) is RemoteNode
+        assert node.node_name == "model.invert"
+        assert node.config["pkd_viewer"] is False
+        assert outputs["pid"] != os.getpid()
+
+    def test_runner_model_processes(self):
+        sink = SinkNode(["inverted", "pid"])
+        runner = Runner(
+            nodes=[create_source(), InvertNode(), sink], model_processes=True
+        )
+        runner.run()
+
+        assert len(sink.received) == NUM_FRAMES
+        for count, inputs in enumerate(sink.received, 1):
+            assert inputs["inverted"][0, 0, 0] == 255 - count
+            assert inputs["pid"] != os.getpid()
+        assert not runner.remote_nodes[0]._process.is_alive()
+
+    def test_runner_model_processes_batched(self):
+        sink = SinkNode(["inverted", "pid"])
+        runner = Runner(
+            nodes=[create_source(), BatchInvertNode(), sink],
+            model_processes=True,
+            batch_size=NUM_FRAMES,
+        )
+        runner.run()
+
+        assert runner.remote_nodes[0]._num_slots == NUM_FRAMES
+        # the frames of a batch reach the worker together
+        assert [inputs["pid"] for inputs in sink.received] == [NUM_FRAMES] * NUM_FRAMES
+
+    def test_runner_drops_parent_model_nodes(self):
+        model = InvertNode()
+        model_ref = weakref.ref(model)
+        runner = Runner(
+            nodes=[create_source(), model, SinkNode(["inverted", "pid"])],
+            model_processes=True,
+        )
+        del model
+        runner.run()
+
+        assert type(runner.pipeline.nodes[1]) is RemoteNode
+        assert runner.remote_nodes == [runner.pipeline.nodes[1]]
+        assert model_ref() is None
@@ -0,0 +1,179 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from peekingduck.pipeline.inference_cache import CachedNode, InferenceCache
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+from peekingduck.runner import Runner
+from tests.conftest import SinkNode, SourceNode
+
+# Images read by the source node, the second and fourth are identical
+IMAGE_VALUES = [1, 2, 3, 2]
+
+
+class ModelNode(AbstractNode):
+    is_stateless = True
+
+    def __init__(self, score_threshold=0.5, is_stateless=True, **config):
+        super().__init__(
+            {
+                "input": ["img"],
+                "output": ["bboxes"],
+                "score_threshold": score_threshold,
+                **config,
+            },
+            node_path="model.detector",
+        )
+        self.is_stateless = is_stateless
+        self.num_calls = 0
+
+    def run(self, inputs):
+        self.num_calls += 1
+        return {"bboxes": np.array([[0.0, 0.0, 1.0, 1.0]]) * inputs["img"].mean()}
+
+
+class DetectorNode(AbstractNode):
+    """Converts the class names in ``detect`` to ids like ``model.yolox``."""
+
+    is_stateless = True
+
+    def __init__(self):
+        super().__init__(
+            {"input": ["img"], "output": ["bbox_labels"], "detect": ["person"]},
+            node_path="model.yolox",
+        )
+        self.num_calls = 0
+
+    def run(self, inputs):
+        self.num_calls += 1
+        return {"bbox_labels": np.array(self.config["detect"])}
+
+
+def run_pipeline(cache_dir, model, **kwargs):
+    """Returns the runner and the bbox scale received for every image, which
+    is the value of the image.
+    """
+    source = SourceNode(
+        len(IMAGE_VALUES),
+        lambda idx: {"img": np.full((4, 4, 3), IMAGE_VALUES[idx - 1], np.uint8)},
+    )
+    sink = SinkNode(["bboxes"])
+    runner = Runner(nodes=[source, model, sink], cache_dir=cache_dir, **kwargs)
+    runner.run()
+    return runner, [inputs["bboxes"][0, 2] for inputs in sink.received]
+
+
+@pytest.mark.usefixtures("tmp_dir")
+class TestInferenceCache:
+    def test_skips_repeated_frames(self):
+        model = ModelNode()
+        runner, scales = run_pipeline(Path("cache"), model)
+
+        assert model.num_calls == 3
+        assert scales == IMAGE_VALUES
+        assert runner.inference_cache.stats == {"model.detector": [1, 3]}
+
+    def test_reuses_cache_across_runs(self):
+        run_pipeline(Path("cache"), ModelNode())
+        model = ModelNode()
+        _, scales = run_pipeline(Path("cache"), model)
+
+        assert model.num_calls == 0
+        assert scales == IMAGE_VALUES
+
+    def test_config_change_invalidates(self):
+        run_pipeline(Path("cache"), ModelNode(score_threshold=0.5))
+        model = ModelNode(score_threshold=0.7)
+        run_pipeline(Path("cache"), model)
+
+        assert model.num_calls == 3
+
+    def test_runtime_config_does_not_invalidate(self):
+        cache = InferenceCache(Path("cache"))
+        node = CachedNode(ModelNode(weights_parent_dir=None, pkd_viewer=False), cache)
+        moved_node = CachedNode(
+            ModelNode(weights_parent_dir="/moved/weights", pkd_viewer=True), cache
+        )
+        img = np.zeros((4, 4, 3), dtype=np.uint8)
+
+        assert node._key({"img": img}) == moved_node._key({"img": img})
+
+    def test_stateful_models_are_not_cached(self):
+        model = ModelNode(is_stateless=False)
+        runner, _ = run_pipeline(Path("cache"), model)
+
+        assert model.num_calls == len(IMAGE_VALUES)
+        assert runner.inference_cache.stats == {}
+
+    def test_batched_execution(self):
+        model = ModelNode()
+        _, scales = run_pipeline(Path("cache"), model, batch_size=4)
+
+        assert model.num_calls == 4
+        assert scales == IMAGE_VALUES
+        model = ModelNode()
+        run_pipeline(Path("cache"), model, batch_size=4)
+
+        assert model.num_calls == 0
+
+    def test_evicts_least_recently_used(self):
+        cache = InferenceCache(Path("cache"), max_size=1)
+        value = {"data": np.zeros(400 * 1024, dtype=np.uint8)}
+        cache.put("a", value)
+        cache.put("b", value)
+        assert cache.get("a", "node") is not None
+        cache.put("c", value)
+
+        assert cache.get("b", "node") is None
+        assert cache.get("a", "node") is not None
+        assert cache.size <= cache.max_bytes
+        assert sorted(path.stem for path in Path("cache").iterdir()) == ["a", "c"]
+        assert InferenceCache(Path("cache"), max_size=1).size == cache.size
+
+    def test_discards_unreadable_entries(self):
+        cache = InferenceCache(Path("cache"))
+        cache.put("a", {"count": 1})
+        Path("cache", "a.pkl").write_bytes(b"corrupt")
+
+        assert cache.get("a", "node") is None
+        assert not Path("cache", "a.pkl").exists()
+
+    def test_cached_node_keys(self):
+        node = CachedNode(ModelNode(), InferenceCache(Path("cache")))
+        img = np.zeros((4, 4, 3), dtype=np.uint8)
+
+        assert node._key({"img": img}) == node._key({"img": img.copy()})
+        assert node._key({"img": img}) != node._key({"img": img[..., 0]})
+        assert node._key({"img": img}) != node._key({"img": img.astype(float)})
+        assert node.config["score_threshold"] == 0.5
+
+    def test_object_detector_config(self):
+        detector = DetectorNode()
+        node = CachedNode(detector, InferenceCache(Path("cache")))
+        img = np.zeros((4, 4, 3), dtype=np.uint8)
+        outputs = [node.run({"img": img}) for _ in range(2)]
+
+        assert node.config["detect"] == [0]
+        assert node.inputs == ["img"]
+        assert detector.num_calls == 1
+        np.testing.assert_array_equal(outputs[1]["bbox_labels"], [0])
+
+    def test_invalid_max_size(self):
+        with pytest.raises(ValueError) as excinfo:
+            InferenceCache(Path("cache"), max_size=0)
+        assert "max_size must be a positive integer" in str(excinfo.value)
@@ -0,0 +1,159 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from peekingduck.pipeline.keyframe_scheduler import KeyframeScheduler
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+from peekingduck.runner import Runner
+from tests.conftest import SinkNode, SourceNode, run_node
+
+IMG_HEIGHT, IMG_WIDTH = 120, 160
+BOX_SIZE = 30
+NUM_FRAMES = 7
+STEP = 2
+
+
+def create_frame(idx, seed=0):
+    img = np.zeros((IMG_HEIGHT, IMG_WIDTH, 3), dtype=np.uint8)
+    texture = np.random.default_rng(seed).integers(
+        0, 255, (BOX_SIZE, BOX_SIZE, 3), dtype=np.uint8
+    )
+    left = 20 + idx * STEP
+    img[40 : 40 + BOX_SIZE, left : left + BOX_SIZE] = texture
+    return img
+
+
+def true_bbox(idx):
+    left = 20 + idx * STEP
+    return np.array(
+        [
+            left / IMG_WIDTH,
+            40 / IMG_HEIGHT,
+            (left + BOX_SIZE) / IMG_WIDTH,
+            (40 + BOX_SIZE) / IMG_HEIGHT,
+        ]
+    )
+
+
+class DetectorNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {
+                "input": ["img"],
+                "output": ["bboxes", "bbox_labels", "bbox_scores"],
+            },
+            node_path="model.detector",
+        )
+        self.num_calls = 0
+        self.frame_idx = 0
+
+    def run(self, inputs):
+        self.num_calls += 1
+        return {
+            "bboxes": true_bbox(self.frame_idx)[np.newaxis].astype(np.float32),
+            "bbox_labels": np.array(["person"]),
+            "bbox_scores": np.array([0.9]),
+        }
+
+
+class DetectorSinkNode(SinkNode):
+    """Lets the detector report the position of the box on the next frame."""
+
+    def __init__(self, detector):
+        super().__init__(["frame_idx", "bboxes", "bbox_labels"])
+        self.detector = detector
+
+    def run(self, inputs):
+        self.detector.frame_idx = inputs["frame_idx"] + 1
+        return super().run(inputs)
+
+
+def create_nodes(frames):
+    detector = DetectorNode()
+    source = SourceNode(
+        len(frames), lambda idx: {"img": frames[idx - 1], "frame_idx": idx - 1}
+    )
+    return [source, detector, DetectorSinkNode(detector)]
+
+
+class TestKeyframeScheduler:
+    def test_runs_detector_on_keyframes_only(self):
+        nodes = create_nodes([create_frame(i) for i in range(NUM_FRAMES)])
+        runner = Runner(nodes=nodes, keyframe_interval=3)
+        runner.run()
+
+        assert nodes[1].num_calls == 3
+        assert runner.keyframe_scheduler.num_keyframes == 3
+        assert runner.keyframe_scheduler.num_frames == NUM_FRAMES
+        received = nodes[2].received
+        assert len(received) == NUM_FRAMES
+        for inputs in received:
+            assert inputs["bbox_labels"].tolist() == ["person"]
+            np.testing.assert_allclose(
+                inputs["bboxes"][0], true_bbox(inputs["frame_idx"]), atol=0.02
+            )
+
+    def test_motion_triggers_keyframe(self):
+        frames = [create_frame(i) for i in range(NUM_FRAMES)]
+        frames[2] = np.full_like(frames[2], 255)
+        frames[3:] = [create_frame(i, seed=1) for i in range(3, NUM_FRAMES)]
+        nodes = create_nodes(frames)
+        scheduler = KeyframeScheduler(nodes, keyframe_interval=10, motion_threshold=0.2)
+        decisions = []
+        for frame in frames:
+            scheduler.start_frame()
+            data = {"img": frame}
+            scheduler.run(nodes[1], data, run_node)
+            decisions.append(scheduler._is_keyframe)
+
+        # the white frame and the frame right after it differ from the keyframe
+        assert decisions == [True, False, True, True, False, False, False]
+
+    def test_lost_tracker_triggers_keyframe(self):
+        frames = [create_frame(i) for i in range(3)]
+        nodes = create_nodes(frames)
+        scheduler = KeyframeScheduler(nodes, keyframe_interval=10)
+        blank = np.zeros_like(frames[0])
+        decisions = []
+        outputs = []
+        for frame in [frames[0], blank, frames[2]]:
+            scheduler.start_frame()
+            outputs.append(scheduler.run(nodes[1], {"img": frame}, run_node))
+            decisions.append(scheduler._is_keyframe)
+
+        assert decisions == [True, False, True]
+        assert len(outputs[1]["bboxes"]) == len(outputs[1]["bbox_scores"]) == 0
+
+    def test_other_nodes_always_run(self):
+        nodes = create_nodes([create_frame(i) for i in range(NUM_FRAMES)])
+        scheduler = KeyframeScheduler(nodes, keyframe_interval=3)
+
+        assert scheduler.detectors == {id(nodes[1])}
+
+    @pytest.mark.parametrize(
+        "keyframe_interval, motion_threshold", [(0, 0.0), (2, -0.1), (2, 1.5)]
+    )
+    def test_invalid_config(self, keyframe_interval, motion_threshold):
+        with pytest.raises(ValueError):
+            KeyframeScheduler([], keyframe_interval, motion_threshold)
+
+    def test_cannot_combine_with_pipelined(self):
+        with pytest.raises(SystemExit):
+            Runner(
+                nodes=create_nodes([create_frame(0)]),
+                keyframe_interval=2,
+                pipelined=True,
+            )
@@ -0,0 +1,160 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+
+import pytest
+
+from peekingduck.pipeline.multi_stream import fan_out
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+from peekingduck.pipeline.nodes.input.visual import Node as VisualNode
+from peekingduck.pipeline.pipeline import Pipeline
+from peekingduck.runner import Runner
+
+IMG_SIZE = (24, 32, 3)
+
+
+class SharedModelNode(AbstractNode):
+    is_stateless = True
+
+    def __init__(self, config=None, **kwargs):
+        super().__init__(
+            config or {"input": ["img"], "output": ["height"]},
+            node_path="model.shared",
+            **kwargs,
+        )
+        self.batch_sizes = []
+
+    def run(self, inputs):
+        return {"height": inputs["img"].shape[0]}
+
+    def run_batch(self, inputs_batch):
+        self.batch_sizes.append(len(inputs_batch))
+        return [self.run(inputs) for inputs in inputs_batch]
+
+
+class CounterNode(AbstractNode):
+    def __init__(self, config=None, **kwargs):
+        super().__init__(
+            config or {"input": ["filename"], "output": ["count"]},
+            node_path="dabble.counter",
+            **kwargs,
+        )
+        self.filenames = []
+
+    def run(self, inputs):
+        self.filenames.append(inputs["filename"])
+        return {"count": len(self.filenames)}
+
+
+def create_visual_node(source):
+    return VisualNode(
+        {
+            "input": ["none"],
+            "output": ["img", "filename", "pipeline_end", "saved_video_fps"],
+            "resize": {"do_resizing": False, "width": 1280, "height": 720},
+            "end_time": None,
+            "file_pattern": None,
+            "filename": "video.mp4",
+            "frame_indices": None,
+            "frame_stride": 1,
+            "frames_log_freq": 100,
+            "mirror_image": False,
+            "num_shards": 1,
+            "prefetch": 0,
+            "recursive": False,
+            "saved_video_fps": 10,
+            "shard_index": 0,
+            "threading": False,
+            "buffering": False,
+            "source": source,
+            "start_time": 0,
+        }
+    )
+
+
+@pytest.fixture
+def stream_dirs(create_input_image):
+    dirs = []
+    for stream, num_images in (("stream_a", 3), ("stream_b", 2)):
+        Path(stream).mkdir()
+        for i in range(num_images):
+            create_input_image(f"{stream}/{stream}_{i}.png", IMG_SIZE)
+        dirs.append(stream)
+    return dirs
+
+
+@pytest.mark.usefixtures("tmp_dir")
+class TestMultiStream:
+    def test_fan_out_shares_stateless_nodes(self, stream_dirs):
+        model = SharedModelNode()
+        counter = CounterNode()
+        pipeline = Pipeline([create_visual_node("."), model, counter])
+        streams = fan_out(pipeline, stream_dirs)
+
+        assert len(streams) == 2
+        assert streams[0].nodes[1] is streams[1].nodes[1] is model
+        # the first stream reuses the nodes of the pipeline
+        assert streams[0].nodes[2] is counter
+        assert streams[1].nodes[2] is not counter
+        assert streams[0].nodes[0].source == "stream_a"
+        assert streams[1].nodes[0].source == "stream_b"
+        assert streams[1].nodes[0].filename == "video_stream1.mp4"
+
+    def test_fan_out_requires_visual_input(self):
+        pipeline = Pipeline(
+            [
+                SharedModelNode({"input": ["none"], "output": ["img", "filename"]}),
+                CounterNode(),
+            ]
+        )
+        with pytest.raises(ValueError, match="start with input.visual"):
+            fan_out(pipeline, ["."])
+
+    def test_runner_keeps_per_stream_state(self, stream_dirs):
+        model = SharedModelNode()
+        runner = Runner(
+            nodes=[create_visual_node("."), model, CounterNode()],
+            streams=stream_dirs,
+        )
+        runner.run()
+
+        counters = [stream.nodes[2] for stream in runner.streams]
+        assert counters[0].filenames == [f"stream_a_{i}.png" for i in range(3)]
+        assert counters[1].filenames == [f"stream_b_{i}.png" for i in range(2)]
+        # both streams are inferred together until the shorter one ends
+        assert model.batch_sizes == [2, 2, 1]
+        assert all(stream.terminate for stream in runner.streams)
+
+    def test_runner_num_iter(self, stream_dirs):
+        runner = Runner(
+            nodes=[create_visual_node("."), SharedModelNode(), CounterNode()],
+            streams=stream_dirs,
+            num_iter=1,
+        )
+        runner.run()
+
+        assert [stream.data["count"] for stream in runner.streams] == [1, 1]
+
+    def test_runner_release_keys(self, stream_dirs):
+        runner = Runner(
+            nodes=[create_visual_node("."), SharedModelNode(), CounterNode()],
+            streams=stream_dirs,
+            release_keys=True,
+        )
+        runner.run()
+
+        counters = [stream.nodes[2] for stream in runner.streams]
+        assert counters[0].filenames == [f"stream_a_{i}.png" for i in range(3)]
+        assert all("img" not in stream.data for stream in runner.streams)
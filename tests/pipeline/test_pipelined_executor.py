@@ -0,0 +1,142 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+import pytest
+
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+from peekingduck.pipeline.pipeline import Pipeline
+from peekingduck.pipeline.pipelined_executor import PipelinedExecutor
+from peekingduck.runner import Runner
+from tests.conftest import SinkNode, counting_source, run_node
+
+NUM_FRAMES = 20
+
+
+class SquareNode(AbstractNode):
+    def __init__(self, delay=0.0):
+        super().__init__(
+            {"input": ["count"], "output": ["square"]}, node_path="dabble.square"
+        )
+        self.delay = delay
+
+    def run(self, inputs):
+        time.sleep(self.delay)
+        return {"square": inputs["count"] ** 2}
+
+
+class EndWatcherNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["pipeline_end"], "output": ["num_ends"]},
+            node_path="dabble.end_watcher",
+        )
+        self.num_ends = 0
+
+    def run(self, inputs):
+        self.num_ends += int(inputs["pipeline_end"])
+        return {"num_ends": self.num_ends}
+
+
+class FaultyNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["count"], "output": ["square"]}, node_path="dabble.faulty"
+        )
+
+    def run(self, inputs):
+        if inputs["count"] == 3:
+            raise RuntimeError("faulty node")
+        return {"square": inputs["count"] ** 2}
+
+
+class TestPipelinedExecutor:
+    def test_preserves_frame_order(self):
+        sink = SinkNode(["count", "square"])
+        pipeline = Pipeline(
+            [counting_source(NUM_FRAMES), SquareNode(delay=0.001), sink]
+        )
+        PipelinedExecutor(pipeline, run_node).run()
+
+        assert sink.received == [
+            {"count": i, "square": i * i} for i in range(1, NUM_FRAMES + 1)
+        ]
+        assert pipeline.terminate
+        # the last node runs in the calling thread
+        assert sink.threads == {threading.get_ident()}
+
+    def test_matches_sequential_runner(self):
+        sequential_sink = SinkNode(["count", "square"])
+        sequential = Runner(
+            nodes=[
+                counting_source(NUM_FRAMES),
+                SquareNode(),
+                sequential_sink,
+                EndWatcherNode(),
+            ]
+        )
+        sequential.run()
+
+        pipelined_sink = SinkNode(["count", "square"])
+        pipelined = Runner(
+            nodes=[
+                counting_source(NUM_FRAMES),
+                SquareNode(),
+                pipelined_sink,
+                EndWatcherNode(),
+            ],
+            pipelined=True,
+        )
+        pipelined.run()
+
+        assert pipelined_sink.received == sequential_sink.received
+        assert pipelined.pipeline.data == sequential.pipeline.data
+        assert pipelined.pipeline.data["num_ends"] == 1
+
+    def test_num_iter(self):
+        sink = SinkNode(["count", "square"])
+        pipeline = Pipeline([counting_source(NUM_FRAMES), SquareNode(), sink])
+        PipelinedExecutor(pipeline, run_node, num_iter=5).run()
+
+        assert [inputs["count"] for inputs in sink.received] == [1, 2, 3, 4, 5]
+
+    def test_downstream_pipeline_end_stops_source(self):
+        sink = SinkNode(["count", "square"], stop_at=4)
+        watcher = EndWatcherNode()
+        source = counting_source(1000)
+        pipeline = Pipeline([source, SquareNode(), sink, watcher])
+        PipelinedExecutor(pipeline, run_node, queue_size=1).run()
+
+        assert [inputs["count"] for inputs in sink.received] == [1, 2, 3, 4]
+        assert watcher.num_ends == 1
+        assert source.count < 1000
+
+    def test_node_exception_is_reraised(self):
+        sink = SinkNode(["count", "square"])
+        pipeline = Pipeline([counting_source(1000), FaultyNode(), sink])
+        with pytest.raises(RuntimeError, match="faulty node"):
+            PipelinedExecutor(pipeline, run_node, queue_size=1).run()
+
+        # frames before the faulty one may or may not reach the sink before
+        # the error stops the pipeline, but never the ones after it
+        assert [inputs["count"] for inputs in sink.received] in ([], [1], [1, 2])
+
+    def test_invalid_queue_size(self):
+        pipeline = Pipeline(
+            [counting_source(NUM_FRAMES), SquareNode(), SinkNode(["count", "square"])]
+        )
+        with pytest.raises(ValueError, match="queue_size must be a positive integer"):
+            PipelinedExecutor(pipeline, run_node, queue_size=0)
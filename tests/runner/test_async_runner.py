@@ -0,0 +1,121 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from peekingduck.async_runner import END_OF_STREAM, AsyncRunner
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+from tests.conftest import SourceNode
+
+NUM_FRAMES = 3
+
+
+def run_async(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+async def collect(runner):
+    return [data async for data in runner.results()]
+
+
+def create_source(num_frames=NUM_FRAMES):
+    return SourceNode(num_frames, lambda idx: {"img": np.full((2, 2), idx)})
+
+
+class SumNode(AbstractNode):
+    def __init__(self, barrier=None):
+        super().__init__({"input": ["img"], "output": ["total"]}, node_path="model.sum")
+        self.barrier = barrier
+        self.threads = set()
+
+    def run(self, inputs):
+        self.threads.add(threading.current_thread())
+        if self.barrier is not None:
+            self.barrier.wait()
+        return {"total": int(inputs["img"].sum())}
+
+
+class EndNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["total", "pipeline_end"], "output": ["none"]},
+            node_path="output.end",
+        )
+        self.ended = False
+
+    def run(self, inputs):
+        self.ended = self.ended or inputs["pipeline_end"]
+        return {}
+
+
+class TestAsyncRunner:
+    def test_yields_results_of_source_node(self):
+        sum_node = SumNode()
+        runner = AsyncRunner(nodes=[create_source(), sum_node])
+        results = run_async(collect(runner))
+
+        assert [data["total"] for data in results] == [4, 8, 12]
+        assert threading.main_thread() not in sum_node.threads
+        assert runner.pipeline.terminate
+
+    def test_reads_frames_from_queue(self):
+        end_node = EndNode()
+
+        async def main():
+            queue = asyncio.Queue()
+            runner = AsyncRunner(nodes=[SumNode(), end_node], frame_queue=queue)
+            task = asyncio.ensure_future(collect(runner))
+            await queue.put(np.ones((2, 2)))
+            await queue.put({"img": np.ones((3, 3)), "frame_id": 7})
+            await queue.put(END_OF_STREAM)
+            return await task
+
+        results = run_async(main())
+
+        assert [data["total"] for data in results] == [4, 9]
+        assert results[1]["frame_id"] == 7
+        assert end_node.ended
+
+    def test_pipelines_share_event_loop(self):
+        # Both pipelines can only finish if their nodes run at the same time
+        barrier = threading.Barrier(2, timeout=5)
+        runners = [
+            AsyncRunner(nodes=[create_source(1), SumNode(barrier)]) for _ in range(2)
+        ]
+
+        async def main():
+            return await asyncio.gather(*(collect(runner) for runner in runners))
+
+        results = run_async(main())
+
+        assert [len(frames) for frames in results] == [1, 1]
+
+    def test_run_and_num_iter(self):
+        source = create_source()
+        runner = AsyncRunner(nodes=[source, SumNode()], num_iter=2)
+        run_async(runner.run())
+
+        assert source.count == 2
+
+    def test_frame_queue_requires_nodes(self):
+        with pytest.raises(SystemExit):
+            AsyncRunner(frame_queue=asyncio.Queue())
@@ -50,6 +50,33 @@ class MockedNode(AbstractNode):
         return output
 
 
+class FrameNode(AbstractNode):
+    def __init__(self, inputs, outputs, func):
+        super().__init__(
+            {"input": inputs, "output": outputs}, node_path="dabble.frame_node"
+        )
+        self.func = func
+        self.received = []
+
+    def run(self, inputs):
+        self.received.append(dict(inputs))
+        return self.func(inputs)
+
+
+def create_frame_nodes(num_frames=3):
+    counter = iter(range(1, num_frames + 2))
+
+    def read(_):
+        count = next(counter)
+        return {"img": count, "masks": [count] * 4, "pipeline_end": count > num_frames}
+
+    return [
+        FrameNode(["none"], ["img", "masks", "pipeline_end"], read),
+        FrameNode(["img", "masks"], ["area"], lambda x: {"area": sum(x["masks"])}),
+        FrameNode(["area"], ["total"], lambda x: {"total": x["area"] * 2}),
+    ]
+
+
 def create_node_config(config_dir, node_name):
     config_text = {"root": None, "input": ["none"], "output": ["pipeline_end"]}
     with open(config_dir / f"{node_name}.yml", "w") as fp:
@@ -218,6 +245,22 @@ class TestRunner:
         assert runner_with_nodes.pipeline.data == correct_data
         assert runner_with_nodes.pipeline.get_pipeline_results() == correct_data
 
+    def test_run_release_keys(self):
+        sequential = Runner(nodes=create_frame_nodes())
+        sequential.run()
+        releasing = Runner(nodes=create_frame_nodes(), release_keys=True)
+        releasing.run()
+
+        for node, expected in zip(releasing.pipeline.nodes, sequential.pipeline.nodes):
+            assert node.received == expected.received
+        assert releasing.release_schedule == [[], ["img", "masks"], ["area", "total"]]
+        assert "area" not in releasing.pipeline.data
+        assert "total" not in releasing.pipeline.data
+
+    def test_run_release_keys_with_pipelined(self):
+        with pytest.raises(SystemExit):
+            Runner(nodes=create_frame_nodes(), release_keys=True, pipelined=True)
+
     def test_pipeline_not_deleted_after_run(self, runner_with_nodes):
         assert isinstance(runner_with_nodes.pipeline, object) == True
 
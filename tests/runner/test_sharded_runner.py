@@ -0,0 +1,141 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ast
+import csv
+from pathlib import Path
+
+import pytest
+import yaml
+
+from peekingduck.sharded_runner import ShardedRunner
+
+NUM_IMAGES = 5
+PIPELINE_PATH = Path("pipeline_config.yml")
+
+
+@pytest.fixture
+def image_dir(create_input_image):
+    Path("images").mkdir()
+    for i in range(NUM_IMAGES):
+        create_input_image(f"images/image{i}.png", (24, 32, 3))
+    return Path("images")
+
+
+def create_pipeline_yaml(source):
+    nodes = {
+        "nodes": [
+            {"input.visual": {"source": str(Path(source).resolve())}},
+            {
+                "output.csv_writer": {
+                    "stats_to_track": ["filename"],
+                    "file_path": str(Path("output/stats.csv").resolve()),
+                    "logging_interval": 0,
+                }
+            },
+        ]
+    }
+    with open(PIPELINE_PATH, "w") as outfile:
+        yaml.dump(nodes, outfile, default_flow_style=False)
+
+
+@pytest.mark.usefixtures("tmp_dir")
+class TestShardedRunner:
+    def test_shard_config_updates(self, image_dir):
+        create_pipeline_yaml(image_dir)
+        runner = ShardedRunner(
+            PIPELINE_PATH, "{'input.visual': {'mirror_image': True}}", "src", 3
+        )
+        config_updates = ast.literal_eval(runner._get_shard_config_updates(2))
+
+        assert config_updates["input.visual"] == {
+            "mirror_image": True,
+            "num_shards": 3,
+            "shard_index": 2,
+        }
+        assert config_updates["output.csv_writer"]["file_path"].endswith(
+            "stats_shard2.csv"
+        )
+
+    def test_shard_runner_kwargs(self, image_dir):
+        create_pipeline_yaml(image_dir)
+        runner = ShardedRunner(
+            PIPELINE_PATH,
+            "None",
+            "src",
+            3,
+            batch_size=4,
+            profile_path=Path("output/profile.json"),
+        )
+        runner_kwargs = runner._get_shard_runner_kwargs(1)
+
+        assert runner_kwargs == {
+            "batch_size": 4,
+            "profile_path": Path("output/profile_shard1.json"),
+        }
+        assert runner.runner_kwargs["profile_path"] == Path("output/profile.json")
+
+    def test_streams_not_supported(self, image_dir):
+        create_pipeline_yaml(image_dir)
+        with pytest.raises(
+            ValueError, match="cannot be combined with nodes or streams"
+        ):
+            ShardedRunner(PIPELINE_PATH, "None", "src", 2, streams=[0, 1])
+
+    def test_merge_csv_files(self):
+        shard_paths = []
+        for i in range(3):
+            path = Path(f"shard{i}.csv")
+            with open(path, "w", newline="") as outfile:
+                writer = csv.writer(outfile)
+                writer.writerow(["Time", "filename"])
+                writer.writerow([f"t{i}", f"image{i}.png"])
+            shard_paths.append(path)
+        ShardedRunner._merge_csv_files(shard_paths, Path("merged.csv"))
+
+        with open("merged.csv", newline="") as infile:
+            rows = list(csv.reader(infile))
+        assert rows == [["Time", "filename"]] + [
+            [f"t{i}", f"image{i}.png"] for i in range(3)
+        ]
+        assert not any(path.exists() for path in shard_paths)
+
+    def test_run_merges_outputs_in_order(self, image_dir):
+        Path("output").mkdir()
+        create_pipeline_yaml(image_dir)
+        ShardedRunner(PIPELINE_PATH.resolve(), "None", "src", 2).run()
+
+        output_files = list(Path("output").iterdir())
+        assert len(output_files) == 1
+        assert output_files[0].name.startswith("stats_")
+        with open(output_files[0], newline="") as infile:
+            rows = list(csv.DictReader(infile))
+        assert [row["filename"] for row in rows] == [
+            f"image{i}.png" for i in range(NUM_IMAGES)
+        ]
+
+    def test_invalid_num_workers(self, image_dir):
+        create_pipeline_yaml(image_dir)
+        with pytest.raises(ValueError, match="num_workers must be a positive"):
+            ShardedRunner(PIPELINE_PATH, "None", "src", 0)
+
+    def test_non_directory_source(self, image_dir):
+        create_pipeline_yaml(image_dir / "image0.png")
+        with pytest.raises(ValueError, match="source to be a directory"):
+            ShardedRunner(PIPELINE_PATH, "None", "src", 2)
+
+    def test_webcam_source_from_cli(self, image_dir):
+        create_pipeline_yaml(image_dir)
+        with pytest.raises(ValueError, match="source to be a directory, got: 0"):
+            ShardedRunner(PIPELINE_PATH, "{'input.visual': {'source': 0}}", "src", 2)
@@ -0,0 +1,221 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from peekingduck.pipeline.nodes.abstract_node import AbstractNode
+from peekingduck.runner import Runner
+from peekingduck.utils.profiler import MemoryProfiler, NodeProfiler
+from tests.conftest import counting_source
+
+NUM_FRAMES = 5
+STAT_KEYS = {
+    "calls",
+    "total_s",
+    "mean_ms",
+    "p50_ms",
+    "p95_ms",
+    "p99_ms",
+    "throughput_fps",
+    "budget_share",
+}
+MEMORY_STAT_KEYS = {
+    "py_delta_mean_mb",
+    "py_delta_max_mb",
+    "py_peak_max_mb",
+    "rss_delta_mean_mb",
+    "rss_delta_max_mb",
+    "rss_delta_total_mb",
+    "outputs",
+}
+
+
+class DoubleNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["count"], "output": ["double"]}, node_path="dabble.double"
+        )
+
+    def run(self, inputs):
+        return {"double": inputs["count"] * 2}
+
+
+class AllocatorNode(AbstractNode):
+    """Keeps 1 MB per call and writes a 2 MB array into the data pool."""
+
+    def __init__(self):
+        super().__init__(
+            {"input": ["count"], "output": ["mask", "labels"]},
+            node_path="model.allocator",
+        )
+        self.kept = []
+
+    def run(self, inputs):
+        self.kept.append(bytearray(1024 * 1024))
+        return {
+            "mask": np.zeros(2 * 1024 * 1024, dtype=np.uint8),
+            "labels": ["person"] * inputs["count"],
+        }
+
+
+class TestNodeProfiler:
+    def test_summary_statistics(self):
+        profiler = NodeProfiler()
+        for elapsed_ms in range(1, 101):
+            profiler.record("model.slow", elapsed_ms * 1_000_000)
+        profiler.record("draw.fast", 50_000_000)
+
+        stats = profiler.summary()
+
+        assert list(stats.keys()) == ["model.slow", "draw.fast"]
+        slow = stats["model.slow"]
+        assert set(slow.keys()) == STAT_KEYS
+        assert slow["calls"] == 100
+        assert slow["total_s"] == pytest.approx(5.05)
+        assert slow["mean_ms"] == pytest.approx(50.5)
+        assert slow["p50_ms"] == pytest.approx(50.5)
+        assert slow["p95_ms"] == pytest.approx(95.05)
+        assert slow["p99_ms"] == pytest.approx(99.01)
+        assert slow["throughput_fps"] == pytest.approx(100 / 5.05)
+        assert slow["budget_share"] + stats["draw.fast"]["budget_share"] == (
+            pytest.approx(100.0)
+        )
+
+    def test_add_pipeline(self):
+        profiler = NodeProfiler()
+        nodes = [counting_source(NUM_FRAMES), DoubleNode(), DoubleNode()]
+        profiler.add_pipeline(nodes)
+        for node in nodes[1:]:
+            profiler.run(node, {"count": 1})
+
+        assert list(profiler.summary().keys()) == ["1:dabble.double", "2:dabble.double"]
+        assert profiler.get_name(DoubleNode()) == "dabble.double"
+
+    def test_report_without_calls(self, caplog):
+        NodeProfiler().report()
+
+        assert "No node calls were profiled" in caplog.text
+
+    def test_report_saves_json(self, tmp_path, caplog):
+        output_path = tmp_path / "profile" / "latency.json"
+        profiler = NodeProfiler(output_path)
+        profiler.record("dabble.double", 1_000_000)
+        with caplog.at_level("INFO"):
+            profiler.report()
+
+        assert "dabble.double" in caplog.text
+        with open(output_path) as infile:
+            assert json.load(infile) == profiler.summary()
+
+
+class TestMemoryProfiler:
+    def test_summary_statistics(self):
+        profiler = MemoryProfiler()
+        node = AllocatorNode()
+        for count in range(1, 4):
+            profiler.run(node, {"count": count})
+        stats = profiler.summary()
+        profiler.report()
+
+        allocator = stats["model.allocator"]
+        assert set(allocator.keys()) == STAT_KEYS | MEMORY_STAT_KEYS
+        assert allocator["calls"] == 3
+        # the kept bytearray and the returned mask
+        assert allocator["py_delta_mean_mb"] == pytest.approx(3.0, abs=0.1)
+        assert allocator["py_peak_max_mb"] >= allocator["py_delta_max_mb"]
+        assert allocator["outputs"]["mask"] == {"mean_mb": 2.0, "max_mb": 2.0}
+        labels = allocator["outputs"]["labels"]
+        assert labels["max_mb"] > labels["mean_mb"] > 0
+        assert not tracemalloc.is_tracing()
+
+    def test_report_saves_json(self, tmp_path, caplog):
+        output_path = tmp_path / "memory.json"
+        profiler = MemoryProfiler(output_path)
+        profiler.run(AllocatorNode(), {"count": 1})
+        with caplog.at_level("INFO"):
+            profiler.report()
+
+        assert "Per-node memory summary" in caplog.text
+        assert "mask: mean 2.00 MB, max 2.00 MB" in caplog.text
+        with open(output_path) as infile:
+            saved = json.load(infile)
+        assert set(saved["model.allocator"].keys()) == STAT_KEYS | MEMORY_STAT_KEYS
+
+    def test_keeps_existing_tracing(self):
+        tracemalloc.start()
+        try:
+            profiler = MemoryProfiler()
+            profiler.run(AllocatorNode(), {"count": 1})
+            profiler.report()
+            assert tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
+
+
+class TestRunnerProfiling:
+    @pytest.mark.parametrize("pipelined", [False, True])
+    def test_runner_profiles_every_node(self, tmp_path, pipelined):
+        output_path = tmp_path / "latency.json"
+        runner = Runner(
+            nodes=[counting_source(NUM_FRAMES), DoubleNode()],
+            pipelined=pipelined,
+            profile_path=output_path,
+        )
+        runner.run()
+
+        stats = runner.profiler.summary()
+        # the input node also runs on the frame which ends the pipeline
+        assert stats["0:input.source"]["calls"] == NUM_FRAMES + 1
+        assert stats["1:dabble.double"]["calls"] == NUM_FRAMES
+        with open(output_path) as infile:
+            assert set(json.load(infile).keys()) == {
+                "0:input.source",
+                "1:dabble.double",
+            }
+
+    def test_runner_profiles_node_instances_separately(self):
+        runner = Runner(
+            nodes=[counting_source(NUM_FRAMES), DoubleNode(), DoubleNode()],
+            profile=True,
+        )
+        runner.run()
+
+        stats = runner.profiler.summary()
+        assert list(stats.keys()) == [
+            "0:input.source",
+            "1:dabble.double",
+            "2:dabble.double",
+        ]
+        assert stats["1:dabble.double"]["calls"] == NUM_FRAMES
+        assert stats["2:dabble.double"]["calls"] == NUM_FRAMES
+
+    def test_runner_without_profiling(self):
+        runner = Runner(nodes=[counting_source(NUM_FRAMES), DoubleNode()])
+        runner.run()
+
+        assert runner.profiler is None
+
+    def test_runner_profiles_memory(self):
+        runner = Runner(
+            nodes=[counting_source(NUM_FRAMES), DoubleNode()], profile_memory=True
+        )
+        runner.run()
+
+        assert isinstance(runner.profiler, MemoryProfiler)
+        stats = runner.profiler.summary()
+        assert stats["1:dabble.double"]["outputs"]["double"]["max_mb"] > 0